@@ -1,7 +1,8 @@
 ﻿import os
+import sys
 
-# Create directory
-os.makedirs('src/reviews', exist_ok=True)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'frontend'))
+from codemod import Step, run_script
 
 # 1. reviews.service.ts
 service_content = """import { Injectable } from '@nestjs/common';
@@ -36,8 +37,6 @@ export class ReviewsService {
   }
 }
 """
-with open('src/reviews/reviews.service.ts', 'w', encoding='utf-8') as f:
-    f.write(service_content)
 
 # 2. reviews.controller.ts
 controller_content = """import { Controller, Get, Post, Body, Param, ParseIntPipe } from '@nestjs/common';
@@ -64,8 +63,6 @@ export class ReviewsController {
   }
 }
 """
-with open('src/reviews/reviews.controller.ts', 'w', encoding='utf-8') as f:
-    f.write(controller_content)
 
 # 3. reviews.module.ts
 module_content = """import { Module } from '@nestjs/common';
@@ -79,21 +76,27 @@ import { PrismaService } from '../prisma.service';
 })
 export class ReviewsModule {}
 """
-with open('src/reviews/reviews.module.ts', 'w', encoding='utf-8') as f:
-    f.write(module_content)
 
 # 4. Register in app.module.ts
 app_module_path = 'src/app.module.ts'
-with open(app_module_path, 'r', encoding='utf-8') as f:
-    content = f.read()
-
-if 'ReviewsModule' not in content:
-    content = content.replace("import { BookingsModule } from './bookings/bookings.module';", 
-                              "import { BookingsModule } from './bookings/bookings.module';\nimport { ReviewsModule } from './reviews/reviews.module';")
-    content = content.replace("imports: [PoisModule, FavoritesModule, BookingsModule],",
-                              "imports: [PoisModule, FavoritesModule, BookingsModule, ReviewsModule],")
-    
-    with open(app_module_path, 'w', encoding='utf-8') as f:
-        f.write(content)
-
-print("Reviews module created and registered.")
+
+def register_module(content):
+    if 'ReviewsModule' not in content:
+        content = content.replace("import { BookingsModule } from './bookings/bookings.module';", 
+                                  "import { BookingsModule } from './bookings/bookings.module';\nimport { ReviewsModule } from './reviews/reviews.module';")
+        content = content.replace("imports: [PoisModule, FavoritesModule, BookingsModule],",
+                                  "imports: [PoisModule, FavoritesModule, BookingsModule, ReviewsModule],")
+    return content
+
+PROVIDES = {app_module_path: ['ReviewsModule']}
+
+STEPS = [
+    Step('write-service', 'src/reviews/reviews.service.ts', lambda _: service_content),
+    Step('write-controller', 'src/reviews/reviews.controller.ts', lambda _: controller_content),
+    Step('write-module', 'src/reviews/reviews.module.ts', lambda _: module_content),
+    Step('register-module', app_module_path, register_module),
+]
+
+if __name__ == '__main__':
+    run_script(__file__, STEPS)
+    print("Reviews module created and registered.")
@@ -0,0 +1,233 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import time
+
+import numpy as np
+
+from coord_transform import gcj02_to_wgs84
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DB = os.path.join(BACKEND_DIR, 'prisma', 'dev.db')
+DEFAULT_OUT = os.path.join(BACKEND_DIR, '..', 'frontend', 'public', 'clusters')
+
+# Cluster radius in screen pixels and the tile extent it is measured against,
+# the same defaults supercluster uses
+RADIUS = 60
+EXTENT = 512
+MIN_ZOOM = 3
+MAX_ZOOM = 17
+
+
+def _mercator(lng, lat):
+    """WGS-84 degrees to Web Mercator in [0, 1], y growing southwards."""
+    x = lng / 360.0 + 0.5
+    s = np.sin(lat * np.pi / 180.0)
+    y = 0.5 - 0.25 * np.log((1 + s) / (1 - s)) / np.pi
+    return x, np.clip(y, 0.0, 1.0)
+
+
+def _unmercator(x, y):
+    lng = (x - 0.5) * 360.0
+    lat = 360.0 * np.arctan(np.exp((180.0 - y * 360.0) * np.pi / 180.0)) / np.pi - 90.0
+    return lng, lat
+
+
+class GridIndex:
+    """Points bucketed into square cells of the query radius, so a radius query reads 3x3 cells."""
+
+    def __init__(self, x, y, radius):
+        self.x = x
+        self.y = y
+        self.radius = radius
+        self.cells = {}
+        for i, key in enumerate(zip((x // radius).astype(np.int64).tolist(), (y // radius).astype(np.int64).tolist())):
+            self.cells.setdefault(key, []).append(i)
+
+    def within(self, i):
+        cx, cy = int(self.x[i] // self.radius), int(self.y[i] // self.radius)
+        found = []
+        r2 = self.radius * self.radius
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for j in self.cells.get((cx + dx, cy + dy), ()):
+                    if (self.x[j] - self.x[i]) ** 2 + (self.y[j] - self.y[i]) ** 2 <= r2:
+                        found.append(j)
+        return found
+
+
+def build_levels(x, y, min_zoom=MIN_ZOOM, max_zoom=MAX_ZOOM, radius=RADIUS, extent=EXTENT):
+    """Greedy supercluster-style pyramid, built bottom up.
+
+    Level max_zoom + 1 holds the spots themselves. Each level above merges
+    every item of the level below with its unclaimed neighbours within
+    radius pixels, placing the cluster at their count-weighted centroid.
+    Returns {zoom: (x, y, count, children)} where children lists indices
+    into the level below.
+    """
+    levels = {max_zoom + 1: (x, y, np.ones(len(x), dtype=np.int64), [[i] for i in range(len(x))])}
+    for zoom in range(max_zoom, min_zoom - 1, -1):
+        px, py, counts, _ = levels[zoom + 1]
+        index = GridIndex(px, py, radius / (extent * 2 ** zoom))
+        claimed = np.zeros(len(px), dtype=bool)
+        nx, ny, ncount, children = [], [], [], []
+        for i in range(len(px)):
+            if claimed[i]:
+                continue
+            members = [j for j in index.within(i) if not claimed[j]]
+            claimed[members] = True
+            weights = counts[members]
+            total = int(weights.sum())
+            nx.append(float((px[members] * weights).sum() / total))
+            ny.append(float((py[members] * weights).sum() / total))
+            ncount.append(total)
+            children.append(members)
+        levels[zoom] = (np.array(nx), np.array(ny), np.array(ncount, dtype=np.int64), children)
+    return levels
+
+
+def annotate(levels, min_zoom, max_zoom):
+    """Per level, the zoom at which each item first splits, and the spot behind each single-spot item."""
+    n = len(levels[max_zoom + 1][0])
+    expansion = {max_zoom + 1: [max_zoom + 1] * n}
+    leaf = {max_zoom + 1: list(range(n))}
+    for zoom in range(max_zoom, min_zoom - 1, -1):
+        children = levels[zoom][3]
+        expansion[zoom] = [zoom + 1 if len(c) > 1 else expansion[zoom + 1][c[0]] for c in children]
+        leaf[zoom] = [leaf[zoom + 1][c[0]] if len(c) == 1 else None for c in children]
+    return expansion, leaf
+
+
+def render_tile(zoom, level, expansion, leaf, spots, precision=6):
+    """Spots as [lng, lat, id, name, tag]; clusters as [lng, lat, count, expansionZoom]."""
+    x, y, counts, _ = level
+    lng, lat = _unmercator(x, y)
+    features = []
+    for i in range(len(x)):
+        position = [round(float(lng[i]), precision), round(float(lat[i]), precision)]
+        if counts[i] == 1:
+            spot = spots[leaf[i]]
+            features.append(position + [spot['id'], spot['name'], spot['tag']])
+        else:
+            features.append(position + [int(counts[i]), expansion[i]])
+    return {'z': zoom, 'features': features}
+
+
+def city_key(city, ids):
+    """Directory name for a city: its City id, or a hash of the name for spots whose city has no row."""
+    if city in ids:
+        return str(ids[city])
+    return hashlib.sha1(city.encode('utf-8')).hexdigest()[:10]
+
+
+def load_spots(source):
+    """Active, unexpired spots with coordinates, plus City name -> id."""
+    now = int(time.time() * 1000)
+    # backup.json dates are ISO strings in UTC, which compare correctly as text
+    now_iso = time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime())
+    if source.endswith('.json'):
+        with open(source, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        rows = []
+        for item in data.get('spots') or []:
+            location = item.get('location') or {}
+            expiry = item.get('expiryDate')
+            rows.append({'id': item['id'], 'name': item.get('name'), 'city': item.get('city'),
+                         'lng': item.get('lng', location.get('lng')), 'lat': item.get('lat', location.get('lat')),
+                         'tags': item.get('tags') or [],
+                         'active': item.get('isActive', True) and (not expiry or expiry > now_iso)})
+        cities = {c['name']: c['id'] for c in data.get('cities') or []}
+    else:
+        conn = sqlite3.connect(f'file:{source}?mode=ro', uri=True)
+        conn.row_factory = sqlite3.Row
+        rows = [{'id': r['id'], 'name': r['name'], 'city': r['city'], 'lng': r['lng'], 'lat': r['lat'],
+                 'tags': json.loads(r['tags'] or '[]'),
+                 'active': r['isActive'] and (r['expiryDate'] is None or r['expiryDate'] > now)}
+                for r in conn.execute('SELECT id, name, city, lng, lat, tags, isActive, expiryDate FROM Spot')]
+        cities = {r['name']: r['id'] for r in conn.execute('SELECT id, name FROM City')}
+        conn.close()
+    spots = [r for r in rows if r['active'] and r['lng'] is not None and r['lat'] is not None and r['city']]
+    return spots, cities
+
+
+def build(spots, cities, output, min_zoom=MIN_ZOOM, max_zoom=MAX_ZOOM, radius=RADIUS):
+    by_city = {}
+    for spot in spots:
+        by_city.setdefault(spot['city'], []).append(spot)
+    # Rebuild from scratch so cities that lost every spot disappear
+    if os.path.isdir(output):
+        if os.listdir(output) and not os.path.exists(os.path.join(output, 'index.json')):
+            raise ValueError(f"{output} is not empty and holds no previous build; refusing to replace it")
+        shutil.rmtree(output)
+    os.makedirs(output)
+    index = {'minZoom': min_zoom, 'maxZoom': max_zoom, 'radius': radius, 'cities': {}}
+    total_bytes = 0
+    for city, members in sorted(by_city.items()):
+        # Stored coordinates are GCJ-02; the map draws WGS-84 with the browser's own conversion
+        lng, lat = gcj02_to_wgs84([s['lng'] for s in members], [s['lat'] for s in members])
+        x, y = _mercator(lng, lat)
+        levels = build_levels(x, y, min_zoom, max_zoom, radius)
+        expansion, leaf = annotate(levels, min_zoom, max_zoom)
+        leaves = []
+        for spot in members:
+            tags = spot['tags'] if isinstance(spot['tags'], list) else []
+            leaves.append({'id': spot['id'], 'name': spot['name'], 'tag': tags[0] if tags else 'spot'})
+        key = city_key(city, cities)
+        directory = os.path.join(output, key)
+        os.makedirs(directory)
+        sizes = []
+        for zoom in range(min_zoom, max_zoom + 2):
+            tile = render_tile(zoom, levels[zoom], expansion[zoom], leaf[zoom], leaves)
+            text = json.dumps(tile, ensure_ascii=False, separators=(',', ':'))
+            with open(os.path.join(directory, f'{zoom}.json'), 'w', encoding='utf-8') as f:
+                f.write(text)
+            sizes.append(len(text.encode('utf-8')))
+        total_bytes += sum(sizes)
+        index['cities'][city] = {
+            'key': key, 'count': len(members),
+            'bbox': [round(float(lng.min()), 6), round(float(lat.min()), 6),
+                     round(float(lng.max()), 6), round(float(lat.max()), 6)],
+            'markers': {str(z): len(levels[z][0]) for z in range(min_zoom, max_zoom + 2)},
+        }
+    with open(os.path.join(output, 'index.json'), 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, separators=(',', ':'))
+    return index, total_bytes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Precompute per-city, per-zoom marker cluster tiles.')
+    parser.add_argument('source', nargs='?', default=DEFAULT_DB, help='SQLite database or backup.json')
+    parser.add_argument('-o', '--output', default=DEFAULT_OUT, help='tile directory (replaced on each build)')
+    parser.add_argument('--min-zoom', type=int, default=MIN_ZOOM)
+    parser.add_argument('--max-zoom', type=int, default=MAX_ZOOM, help='above this every spot is its own marker')
+    parser.add_argument('--radius', type=float, default=RADIUS, help='cluster radius in pixels')
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.source):
+        print(f"Error: {args.source} does not exist")
+        return 1
+    if not 0 <= args.min_zoom <= args.max_zoom <= 22:
+        print("Error: zooms must satisfy 0 <= min-zoom <= max-zoom <= 22")
+        return 1
+    started = time.perf_counter()
+    spots, cities = load_spots(args.source)
+    try:
+        index, size = build(spots, cities, args.output, args.min_zoom, args.max_zoom, args.radius)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    for city, info in index['cities'].items():
+        markers = info['markers']
+        print(f"  {city} ({info['key']}): {info['count']} spots, "
+              f"{markers[str(args.min_zoom)]} markers at z{args.min_zoom}, {markers[str(args.max_zoom)]} at z{args.max_zoom}")
+    print(f"Wrote {len(index['cities'])} cities to {os.path.relpath(args.output)} "
+          f"({size / 1024:.1f} KB) in {time.perf_counter() - started:.2f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
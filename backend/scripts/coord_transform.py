@@ -0,0 +1,227 @@
+import argparse
+import json
+import os
+import re
+import sqlite3
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TS_SOURCE = os.path.join(BACKEND_DIR, '..', 'frontend', 'src', 'utils', 'coordTransform.ts')
+DEFAULT_DB = os.path.join(BACKEND_DIR, 'prisma', 'dev.db')
+
+# Krasovsky 1940 ellipsoid, as in coordTransform.ts
+A = 6378245.0
+EE = 0.00669342162296594323
+
+
+def _transform_lat(x, y):
+    ret = -100.0 + 2.0 * x + 3.0 * y + 0.2 * y * y + 0.1 * x * y + 0.2 * np.sqrt(np.abs(x))
+    ret += (20.0 * np.sin(6.0 * x * np.pi) + 20.0 * np.sin(2.0 * x * np.pi)) * 2.0 / 3.0
+    ret += (20.0 * np.sin(y * np.pi) + 40.0 * np.sin(y / 3.0 * np.pi)) * 2.0 / 3.0
+    ret += (160.0 * np.sin(y / 12.0 * np.pi) + 320 * np.sin(y * np.pi / 30.0)) * 2.0 / 3.0
+    return ret
+
+
+def _transform_lng(x, y):
+    ret = 300.0 + x + 2.0 * y + 0.1 * x * x + 0.1 * x * y + 0.1 * np.sqrt(np.abs(x))
+    ret += (20.0 * np.sin(6.0 * x * np.pi) + 20.0 * np.sin(2.0 * x * np.pi)) * 2.0 / 3.0
+    ret += (20.0 * np.sin(x * np.pi) + 40.0 * np.sin(x / 3.0 * np.pi)) * 2.0 / 3.0
+    ret += (150.0 * np.sin(x / 12.0 * np.pi) + 300.0 * np.sin(x / 30.0 * np.pi)) * 2.0 / 3.0
+    return ret
+
+
+def _offset(lng, lat):
+    # Same operation order as the TS so results match to the last bit or two
+    dlat = _transform_lat(lng - 105.0, lat - 35.0)
+    dlng = _transform_lng(lng - 105.0, lat - 35.0)
+    radlat = lat / 180.0 * np.pi
+    magic = np.sin(radlat)
+    magic = 1 - EE * magic * magic
+    sqrtmagic = np.sqrt(magic)
+    dlat = (dlat * 180.0) / ((A * (1 - EE)) / (magic * sqrtmagic) * np.pi)
+    dlng = (dlng * 180.0) / (A / sqrtmagic * np.cos(radlat) * np.pi)
+    return dlng, dlat
+
+
+def wgs84_to_gcj02(lng, lat):
+    lng = np.asarray(lng, dtype=np.float64)
+    lat = np.asarray(lat, dtype=np.float64)
+    dlng, dlat = _offset(lng, lat)
+    return lng + dlng, lat + dlat
+
+
+def gcj02_to_wgs84(lng, lat):
+    """One-step inverse, identical to gcj02ToWgs84 in the browser (error up to a few metres)."""
+    lng = np.asarray(lng, dtype=np.float64)
+    lat = np.asarray(lat, dtype=np.float64)
+    dlng, dlat = _offset(lng, lat)
+    return lng * 2 - (lng + dlng), lat * 2 - (lat + dlat)
+
+
+def gcj02_to_wgs84_exact(lng, lat, tolerance=1e-10, max_iterations=30):
+    """Inverse by fixed-point iteration: nudge the WGS-84 guess until it maps back onto the input.
+
+    Each step removes most of the remaining error, so a handful of iterations
+    reaches `tolerance` degrees (1e-10 is about 0.01 mm). Points converge
+    independently; finished ones stop being updated. Scalars and arrays of
+    any shape come back in the shape they went in, as with the forward
+    transform.
+    """
+    lng, lat = np.broadcast_arrays(np.asarray(lng, dtype=np.float64), np.asarray(lat, dtype=np.float64))
+    shape = lng.shape
+    lng, lat = np.atleast_1d(lng.ravel()), np.atleast_1d(lat.ravel())
+    wlng, wlat = gcj02_to_wgs84(lng, lat)
+    wlng, wlat = wlng.copy(), wlat.copy()
+    active = np.ones(lng.shape, dtype=bool)
+    for _ in range(max_iterations):
+        glng, glat = wgs84_to_gcj02(wlng[active], wlat[active])
+        elng = glng - lng[active]
+        elat = glat - lat[active]
+        wlng[active] -= elng
+        wlat[active] -= elat
+        done = np.maximum(np.abs(elng), np.abs(elat)) < tolerance
+        if done.all():
+            break
+        active[np.flatnonzero(active)[done]] = False
+    return wlng.reshape(shape)[()], wlat.reshape(shape)[()]
+
+
+# --- parity with the TypeScript ---
+
+def _ts_to_js(source):
+    source = re.sub(r'^export ', '', source, flags=re.M)
+    source = re.sub(r'\):\s*\[number, number\]', ')', source)
+    return re.sub(r':\s*number\b', '', source)
+
+
+_RUNNER = """
+const input = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+const out = { toWgs: [], toGcj: [] };
+for (const [lng, lat] of input) {
+  out.toWgs.push(gcj02ToWgs84(lng, lat));
+  out.toGcj.push(wgs84ToGcj02(lng, lat));
+}
+process.stdout.write(JSON.stringify(out));
+"""
+
+
+def run_ts(points, source=TS_SOURCE):
+    with open(source, 'r', encoding='utf-8') as f:
+        script = _ts_to_js(f.read()) + _RUNNER
+    result = subprocess.run(['node', '-e', script], input=json.dumps(points), capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+def check(n=20000, seed=0):
+    """Max differences against coordTransform.ts on random points over China, plus the exact inverse's round trip."""
+    rng = np.random.default_rng(seed)
+    lng = rng.uniform(73.0, 135.0, n)
+    lat = rng.uniform(18.0, 54.0, n)
+    reference = run_ts(np.column_stack([lng, lat]).tolist())
+    to_wgs = np.array(reference['toWgs'])
+    to_gcj = np.array(reference['toGcj'])
+    wlng, wlat = gcj02_to_wgs84(lng, lat)
+    glng, glat = wgs84_to_gcj02(lng, lat)
+    elng, elat = gcj02_to_wgs84_exact(lng, lat)
+    back_lng, back_lat = wgs84_to_gcj02(elng, elat)
+    return {
+        'points': n,
+        'gcj02_to_wgs84': float(max(np.abs(wlng - to_wgs[:, 0]).max(), np.abs(wlat - to_wgs[:, 1]).max())),
+        'wgs84_to_gcj02': float(max(np.abs(glng - to_gcj[:, 0]).max(), np.abs(glat - to_gcj[:, 1]).max())),
+        'exact_round_trip': float(max(np.abs(back_lng - lng).max(), np.abs(back_lat - lat).max())),
+        'one_step_error': float(max(np.abs(wlng - elng).max(), np.abs(wlat - elat).max())),
+    }
+
+
+# --- export ---
+
+def load_points(source):
+    """{'spots': [(id, lng, lat)], 'cities': [...]} from a SQLite database or backup.json."""
+    if source.endswith('.json'):
+        with open(source, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        points = {}
+        for key in ('spots', 'cities'):
+            rows = []
+            for item in data.get(key) or []:
+                location = item.get('location') or {}
+                lng, lat = item.get('lng', location.get('lng')), item.get('lat', location.get('lat'))
+                if lng is not None and lat is not None:
+                    rows.append((item['id'], lng, lat))
+            points[key] = rows
+        return points
+    conn = sqlite3.connect(f'file:{source}?mode=ro', uri=True)
+    try:
+        return {key: conn.execute(f'SELECT id, lng, lat FROM "{table}" WHERE lng IS NOT NULL AND lat IS NOT NULL '
+                                  'ORDER BY id').fetchall()
+                for key, table in (('spots', 'Spot'), ('cities', 'City'))}
+    finally:
+        conn.close()
+
+
+def export(points, precision=7):
+    """Stored coordinates are GCJ-02 (AMap); add the exact WGS-84 position for each."""
+    result = {}
+    for key, rows in points.items():
+        if not rows:
+            result[key] = []
+            continue
+        ids = [row[0] for row in rows]
+        lng = np.array([row[1] for row in rows], dtype=np.float64)
+        lat = np.array([row[2] for row in rows], dtype=np.float64)
+        wlng, wlat = gcj02_to_wgs84_exact(lng, lat)
+        result[key] = [{'id': id, 'gcj02': [round(float(a), precision), round(float(b), precision)],
+                        'wgs84': [round(float(c), precision), round(float(d), precision)]}
+                       for id, a, b, c, d in zip(ids, lng, lat, wlng, wlat)]
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Batch GCJ-02 / WGS-84 conversion for Spot and City coordinates.')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    exp = sub.add_parser('export', help='write both coordinate systems for every spot and city')
+    exp.add_argument('source', nargs='?', default=DEFAULT_DB, help='SQLite database or backup.json')
+    exp.add_argument('-o', '--output', default='coords.json')
+    exp.add_argument('--precision', type=int, default=7, help='decimal places (7 is about 1 cm)')
+
+    chk = sub.add_parser('check', help='compare against coordTransform.ts under node')
+    chk.add_argument('-n', '--points', type=int, default=20000)
+    chk.add_argument('--tolerance', type=float, default=1e-12, help='largest allowed difference in degrees')
+    args = parser.parse_args(argv)
+
+    if args.command == 'check':
+        try:
+            report = check(args.points)
+        except (OSError, subprocess.CalledProcessError) as e:
+            print(f"Error: could not run coordTransform.ts under node: {e}")
+            return 1
+        for name, value in report.items():
+            print(f"  {name:<18} {value:.3g}")
+        lng = np.random.default_rng(1).uniform(73.0, 135.0, 1_000_000)
+        lat = np.random.default_rng(2).uniform(18.0, 54.0, 1_000_000)
+        started = time.perf_counter()
+        gcj02_to_wgs84_exact(lng, lat)
+        print(f"Exact inverse of 1M points in {time.perf_counter() - started:.2f}s")
+        if max(report['gcj02_to_wgs84'], report['wgs84_to_gcj02']) > args.tolerance:
+            print("Parity check FAILED")
+            return 1
+        print("Matches coordTransform.ts")
+        return 0
+
+    if not os.path.exists(args.source):
+        print(f"Error: {args.source} does not exist")
+        return 1
+    result = export(load_points(args.source), args.precision)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=1)
+    print(f"Wrote {len(result['spots'])} spots and {len(result['cities'])} cities to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
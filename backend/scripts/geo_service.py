@@ -0,0 +1,433 @@
+import argparse
+import json
+import math
+import os
+import sqlite3
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from coord_transform import gcj02_to_wgs84_exact
+from search_index import load_rows
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DB = os.path.join(BACKEND_DIR, 'prisma', 'dev.db')
+
+# Grid cells of 0.01 degrees (1.1 km north-south); cell key = row * COLS + col
+CELL = 0.01
+COLS = round(360 / CELL)
+ROWS = round(180 / CELL)
+EARTH_RADIUS = 6371008.8
+# Past this search radius one pass over every spot is cheaper than walking cells
+BRUTE_FORCE_M = 100000
+MAX_K = 500
+
+# Same re-read window as incremental_backup: updatedAt is stamped before the write commits
+OVERLAP_MS = 5000
+
+# Sidebar category buttons search nearby by word; the ones that exist as spot tags.
+# SpotCategory names (美食, 住宿, ...) resolve through the table itself.
+ALIASES = {'酒店': 'accommodation', '景点': 'spot', '公交站': 'transport'}
+
+
+def haversine(lng1, lat1, lng2, lat2):
+    """Great-circle metres; any argument may be an array."""
+    lng1, lat1, lng2, lat2 = (np.radians(v) for v in (lng1, lat1, lng2, lat2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def _tags(value):
+    if isinstance(value, list):
+        return value
+    try:
+        value = json.loads(value or '[]')
+    except ValueError:
+        return []
+    return value if isinstance(value, list) else []
+
+
+def _record(row):
+    location = row.get('location') or {}
+    lng, lat = row.get('lng', location.get('lng')), row.get('lat', location.get('lat'))
+    if lng is None or lat is None:
+        return None
+    expiry = row.get('expiryDate')
+    return {'id': row['id'], 'name': row.get('name'), 'city': row.get('city'), 'lng': lng, 'lat': lat,
+            'tags': [str(t) for t in _tags(row.get('tags'))],
+            'expiry': expiry if isinstance(expiry, (int, float)) else None}
+
+
+def _with_wgs84(records):
+    """Stored coordinates are GCJ-02; distances are taken on WGS-84, converted once per spot."""
+    if records:
+        wlng, wlat = gcj02_to_wgs84_exact([r['lng'] for r in records], [r['lat'] for r in records])
+        for record, x, y in zip(records, wlng.tolist(), wlat.tolist()):
+            record['wgs84'] = (x, y)
+    return records
+
+
+def point_to_wgs84(lng, lat):
+    wlng, wlat = gcj02_to_wgs84_exact(lng, lat)
+    return float(wlng), float(wlat)
+
+
+class GeoIndex:
+    """Snapshot of the spots, sorted by grid cell so a bounding box is one slice per cell row.
+
+    Records live in an append-only store and the sorted arrays refer to
+    them by slot. apply() returns a new index and only touches the changed
+    records in Python; the service swaps the reference, so queries in
+    flight keep reading the old one. Only one thread may call apply().
+    """
+
+    def __init__(self, records):
+        records = list(records)
+        self.store = records
+        self.vocabulary = {}
+        self._set(*self._columns(records, np.arange(len(records))))
+
+    @staticmethod
+    def _cell(lng, lat):
+        row = np.clip(np.floor((lat + 90.0) / CELL), 0, ROWS - 1).astype(np.int64)
+        col = np.clip(np.floor((lng + 180.0) / CELL), 0, COLS - 1).astype(np.int64)
+        return row * COLS + col
+
+    def _columns(self, records, slots):
+        """Unsorted column arrays for `records`, growing the tag vocabulary as needed."""
+        for record in records:
+            for tag in record['tags']:
+                self.vocabulary.setdefault(tag, len(self.vocabulary))
+        tags = np.zeros((len(records), len(self.vocabulary)), dtype=bool)
+        lengths = [len(r['tags']) for r in records]
+        tags[np.repeat(np.arange(len(records)), lengths), [self.vocabulary[t] for r in records for t in r['tags']]] = True
+        # Integer ids from SQLite, strings from backup.json; either way a native dtype keeps isin fast
+        ids = np.array([r['id'] for r in records]) if records else np.empty(0, dtype=np.int64)
+        lng = np.array([r['wgs84'][0] for r in records], dtype=np.float64)
+        lat = np.array([r['wgs84'][1] for r in records], dtype=np.float64)
+        expiry = np.array([np.inf if r['expiry'] is None else r['expiry'] for r in records], dtype=np.float64)
+        return slots, ids, lng, lat, expiry, tags
+
+    def _set(self, slots, ids, lng, lat, expiry, tags):
+        cells = self._cell(lng, lat)
+        order = np.argsort(cells, kind='stable')
+        self.slots, self.ids, self.lng, self.lat = slots[order], ids[order], lng[order], lat[order]
+        self.cells, self.expiry, self.tags = cells[order], expiry[order], tags[order]
+
+    def __len__(self):
+        return len(self.slots)
+
+    def record(self, position):
+        return self.store[self.slots[position]]
+
+    def apply(self, upserts, deleted):
+        """New index with `upserts` (records) replacing or adding and `deleted` ids gone; only upserts are converted."""
+        upserts = _with_wgs84(list(upserts))
+        drop = set(deleted) | {r['id'] for r in upserts}
+        keep = ~np.isin(self.ids, np.array(list(drop))) if drop else np.ones(len(self), dtype=bool)
+        if len(self.store) + len(upserts) > 2 * (int(keep.sum()) + len(upserts)) + 1024:
+            # Mostly superseded records in the store; start a fresh one
+            return GeoIndex([self.record(i) for i in np.flatnonzero(keep).tolist()] + upserts)
+        index = GeoIndex.__new__(GeoIndex)
+        index.store = self.store
+        index.vocabulary = dict(self.vocabulary)
+        slots, ids, lng, lat, expiry, tags = index._columns(
+            upserts, np.arange(len(self.store), len(self.store) + len(upserts)))
+        # Appending is invisible to this index, whose slots all point below the old end
+        self.store.extend(upserts)
+        kept_tags = np.zeros((int(keep.sum()), len(index.vocabulary)), dtype=bool)
+        kept_tags[:, :self.tags.shape[1]] = self.tags[keep]
+        index._set(np.concatenate([self.slots[keep], slots]), np.concatenate([self.ids[keep], ids]),
+                   np.concatenate([self.lng[keep], lng]), np.concatenate([self.lat[keep], lat]),
+                   np.concatenate([self.expiry[keep], expiry]), np.concatenate([kept_tags, tags]))
+        return index
+
+    def _box(self, lng, lat, radius):
+        """Positions of every spot in the cells covering the circle's bounding box."""
+        dlat = math.degrees(radius / EARTH_RADIUS)
+        dlng = min(180.0, dlat / max(math.cos(math.radians(lat)), 1e-6))
+        row0 = max(0, math.floor((lat - dlat + 90.0) / CELL))
+        row1 = min(ROWS - 1, math.floor((lat + dlat + 90.0) / CELL))
+        col0 = max(0, math.floor((lng - dlng + 180.0) / CELL))
+        col1 = min(COLS - 1, math.floor((lng + dlng + 180.0) / CELL))
+        rows = np.arange(row0, row1 + 1, dtype=np.int64) * COLS
+        starts = np.searchsorted(self.cells, rows + col0)
+        ends = np.searchsorted(self.cells, rows + col1, side='right')
+        spans = [np.arange(s, e) for s, e in zip(starts.tolist(), ends.tolist()) if e > s]
+        return np.concatenate(spans) if spans else np.empty(0, dtype=np.int64)
+
+    def tag_mask(self, tags):
+        """Spots carrying any of `tags`; None when no filter applies."""
+        if not tags:
+            return None
+        columns = [self.vocabulary[t] for t in tags if t in self.vocabulary]
+        if not columns:
+            return np.zeros(len(self), dtype=bool)
+        return self.tags[:, columns].any(axis=1)
+
+    def nearest(self, lng, lat, k=20, radius=None, tags=None, now=None):
+        """Up to k spots nearest to a WGS-84 point, optionally within `radius` metres, as (record, metres).
+
+        Searches a small box first and widens it fourfold until k spots are
+        inside the searched circle, so the cost follows the local density
+        rather than the size of the table.
+        """
+        if not len(self):
+            return []
+        mask = self.tag_mask(tags)
+        now = time.time() * 1000 if now is None else now
+        step = 1000.0 if radius is None else min(radius, 1000.0)
+        while True:
+            brute = step >= BRUTE_FORCE_M
+            candidates = np.arange(len(self)) if brute else self._box(lng, lat, step)
+            keep = self.expiry[candidates] > now
+            if mask is not None:
+                keep &= mask[candidates]
+            candidates = candidates[keep]
+            distances = haversine(lng, lat, self.lng[candidates], self.lat[candidates])
+            final = brute or (radius is not None and step >= radius)
+            if not final:
+                inside = distances <= step
+            elif radius is None:
+                inside = np.ones(len(candidates), dtype=bool)
+            else:
+                inside = distances <= radius
+            if inside.sum() >= k or final:
+                candidates, distances = candidates[inside], distances[inside]
+                if len(candidates) > k:
+                    top = np.argpartition(distances, k)[:k]
+                    candidates, distances = candidates[top], distances[top]
+                order = np.argsort(distances, kind='stable')
+                return [(self.record(i), float(d)) for i, d in zip(candidates[order].tolist(), distances[order].tolist())]
+            step = step * 4 if radius is None else min(step * 4, radius)
+
+
+# --- loading and watching ---
+
+def _spot_rows(conn, since=None):
+    """Spot rows from SQLite, all or those touched at or after `since` (ms), with whether each is live."""
+    have = {row[1] for row in conn.execute('PRAGMA table_info("Spot")')}
+    columns = [c for c in ('id', 'name', 'city', 'lng', 'lat', 'tags', 'isActive', 'expiryDate') if c in have]
+    sql = f'SELECT {", ".join(columns)} FROM "Spot"'
+    if since is not None:
+        sql += ' WHERE "updatedAt" >= ?'
+    now = int(time.time() * 1000)
+    for values in conn.execute(sql, () if since is None else (since,)):
+        row = dict(zip(columns, values))
+        live = row.get('isActive', 1) and (row.get('expiryDate') is None or row['expiryDate'] > now)
+        yield row, bool(live)
+
+
+def load_categories(conn):
+    """Category word -> spot tag, from SpotCategory plus the Sidebar aliases."""
+    categories = dict(ALIASES)
+    try:
+        for name, key in conn.execute('SELECT name, "key" FROM "SpotCategory"'):
+            categories[name] = key
+            categories[key] = key
+    except sqlite3.OperationalError:
+        pass
+    return categories
+
+
+def load_index(source):
+    """(index, categories) from a SQLite database or backup.json."""
+    if source.endswith('.json'):
+        records = [_record(row) for type_, row in load_rows(source) if type_ == 'spot']
+        return GeoIndex(_with_wgs84([r for r in records if r])), dict(ALIASES)
+    conn = sqlite3.connect(f'file:{source}?mode=ro', uri=True)
+    try:
+        records = [_record(row) for row, live in _spot_rows(conn) if live]
+        return GeoIndex(_with_wgs84([r for r in records if r])), load_categories(conn)
+    finally:
+        conn.close()
+
+
+def _signature(conn):
+    return tuple(conn.execute('SELECT max("updatedAt"), count(*) FROM "Spot"').fetchone())
+
+
+class Watcher:
+    """Loads the index from the database and keeps it current.
+
+    Each poll compares max(updatedAt) and the row count; when either moved
+    it reads only the rows touched since the last watermark, plus the id
+    list to catch deletions, and swaps in index.apply(...).
+    """
+
+    def __init__(self, db, interval=5.0, overlap_ms=OVERLAP_MS):
+        self.db = db
+        self.interval = interval
+        self.overlap_ms = overlap_ms
+        self.stop = threading.Event()
+        # Taken before loading, so a write landing during the load is picked up by the first poll
+        conn = sqlite3.connect(f'file:{db}?mode=ro', uri=True)
+        try:
+            self.signature = _signature(conn)
+        finally:
+            conn.close()
+        self.watermark = self.signature[0] or 0
+        self.index, self.categories = load_index(db)
+
+    def poll(self):
+        """Apply any changes; returns (upserted, deleted) counts, or None when nothing moved."""
+        conn = sqlite3.connect(f'file:{self.db}?mode=ro', uri=True)
+        try:
+            signature = _signature(conn)
+            if signature == self.signature:
+                return None
+            upserts, gone = [], set()
+            for row, live in _spot_rows(conn, self.watermark - self.overlap_ms):
+                record = _record(row) if live else None
+                if record is None:
+                    gone.add(row['id'])
+                else:
+                    upserts.append(record)
+            present = {row[0] for row in conn.execute('SELECT id FROM "Spot"')}
+            gone |= set(self.index.ids.tolist()) - present
+            self.categories = load_categories(conn)
+        finally:
+            conn.close()
+        self.index = self.index.apply(upserts, gone)
+        self.signature, self.watermark = signature, signature[0] or 0
+        return len(upserts), len(gone)
+
+    def run(self):
+        while not self.stop.wait(self.interval):
+            try:
+                changed = self.poll()
+            except sqlite3.Error as e:
+                print(f"Watch failed: {e}")
+                continue
+            if changed:
+                print(f"Reindexed: {changed[0]} spots upserted, {changed[1]} removed ({len(self.index)} live)")
+
+
+# --- service ---
+
+def make_handler(state):
+    """`state` has .index and .categories (a Watcher, or any object holding a fixed index)."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlsplit(self.path)
+            index = state.index
+            if url.path == '/health':
+                return self._send(200, {'spots': len(index)})
+            if url.path != '/nearby':
+                return self._send(404, {'error': 'Not found'})
+            query = parse_qs(url.query)
+            try:
+                lng = float(query['lng'][0])
+                lat = float(query['lat'][0])
+                k = max(1, min(MAX_K, int(query.get('k', ['20'])[0])))
+                radius = float(query['radius'][0]) if 'radius' in query else None
+            except (KeyError, ValueError):
+                return self._send(400, {'error': 'lng and lat are required; k and radius must be numbers'})
+            if not (-180 <= lng <= 180 and -90 <= lat <= 90) or (radius is not None and not (math.isfinite(radius) and radius > 0)):
+                return self._send(400, {'error': 'Coordinates or radius out of range'})
+            datum = query.get('datum', ['gcj02'])[0]
+            if datum not in ('gcj02', 'wgs84'):
+                return self._send(400, {'error': 'datum must be gcj02 or wgs84'})
+            tags = list(query.get('tag', []))
+            for word in query.get('category', []):
+                if word not in state.categories:
+                    return self._send(400, {'error': f"Unknown category {word}"})
+                tags.append(state.categories[word])
+
+            started = time.perf_counter()
+            if datum == 'gcj02':
+                lng, lat = point_to_wgs84(lng, lat)
+            found = index.nearest(lng, lat, k, radius, tags)
+            results = [{'id': r['id'], 'name': r['name'], 'city': r['city'], 'lng': r['lng'], 'lat': r['lat'],
+                        'tags': r['tags'], 'distance': round(d, 1)} for r, d in found]
+            self._send(200, {'took_ms': round((time.perf_counter() - started) * 1000, 3),
+                             'count': len(results), 'results': results})
+
+        def _send(self, status, payload):
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+class _Fixed:
+    def __init__(self, index, categories):
+        self.index = index
+        self.categories = categories
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Nearby-spot queries over a grid index of Spot coordinates.')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    srv = sub.add_parser('serve', help='serve GET /nearby?lng=&lat=&k=&radius=&tag=&category=&datum=')
+    srv.add_argument('source', nargs='?', default=DEFAULT_DB, help='SQLite database (watched) or backup.json')
+    srv.add_argument('--host', default='127.0.0.1')
+    srv.add_argument('--port', type=int, default=3003)
+    srv.add_argument('--poll', type=float, default=5.0, help='seconds between checks for changed spots')
+
+    qry = sub.add_parser('query', help='run one lookup')
+    qry.add_argument('lng', type=float)
+    qry.add_argument('lat', type=float)
+    qry.add_argument('source', nargs='?', default=DEFAULT_DB)
+    qry.add_argument('-k', type=int, default=10)
+    qry.add_argument('--radius', type=float, help='metres')
+    qry.add_argument('--tag', action='append', default=[])
+    qry.add_argument('--wgs84', action='store_true', help='the point is WGS-84 (default GCJ-02, as AMap reports)')
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.source):
+        print(f"Error: {args.source} does not exist")
+        return 1
+    started = time.perf_counter()
+    try:
+        if args.command == 'serve' and not args.source.endswith('.json'):
+            state = Watcher(args.source, args.poll)
+        else:
+            state = _Fixed(*load_index(args.source))
+    except sqlite3.Error as e:
+        print(f"Error: {e}")
+        return 1
+    index = state.index
+    print(f"Indexed {len(index)} spots in {time.perf_counter() - started:.2f}s")
+
+    if args.command == 'query':
+        lng, lat = (args.lng, args.lat) if args.wgs84 else point_to_wgs84(args.lng, args.lat)
+        started = time.perf_counter()
+        found = index.nearest(lng, lat, args.k, args.radius, args.tag)
+        elapsed = time.perf_counter() - started
+        for record, distance in found:
+            print(f"  {distance:>9.0f} m  {record['id']:<8} {record['name']}  [{', '.join(record['tags'])}]")
+        print(f"{len(found)} spots in {elapsed * 1000:.2f} ms")
+        return 0
+
+    if isinstance(state, Watcher):
+        threading.Thread(target=state.run, daemon=True).start()
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(state))
+    print(f"Geo service on http://{args.host}:{args.port}/nearby")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if isinstance(state, Watcher):
+            state.stop.set()
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,257 @@
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BACKUP = os.path.join(BACKEND_DIR, 'backup.json')
+DEFAULT_DB = os.path.join(BACKEND_DIR, 'prisma', 'dev.db')
+
+# backup.json key -> table
+TABLES = {
+    'guides': 'Guide',
+    'spots': 'Spot',
+    'strategies': 'Strategy',
+    'ads': 'Ad',
+    'enterprises': 'Enterprise',
+}
+
+# Fields the API adds on the way out that are not columns
+DROP = {'reviews', 'favorites', 'location'}
+DATES = {'createdAt', 'updatedAt', 'expiryDate'}
+
+# Older exports name some required columns differently
+FALLBACKS = {
+    'Enterprise': {'name': 'title', 'image': 'avatar'},
+}
+
+CHUNK = 1 << 20
+
+
+class BackupReader:
+    """Yields (table, record) from a backup without loading it whole.
+
+    The top level is an object of arrays. Each record is decoded on its own
+    from a sliding buffer, so memory stays around one chunk plus the largest
+    record however big the file is.
+    """
+
+    def __init__(self, f, chunk=CHUNK):
+        self.f = f
+        self.chunk = chunk
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self):
+        data = self.f.read(self.chunk)
+        if not data:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def _peek(self):
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in ' \t\r\n':
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ''
+
+    def _expect(self, chars):
+        c = self._peek()
+        if c not in chars:
+            raise ValueError(f"Expected {' or '.join(repr(x) for x in chars)} but found {c!r}")
+        self.pos += 1
+        return c
+
+    def _value(self):
+        self._peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                # Most likely the value runs past the buffer
+                if not self._fill():
+                    raise
+                continue
+            # A number can end exactly at the buffer edge and still be incomplete
+            if end == len(self.buf) and not self.eof and not isinstance(value, (dict, list, str)):
+                if self._fill():
+                    continue
+            self.pos = end
+            return value
+
+    def __iter__(self):
+        self._expect('{')
+        if self._peek() == '}':
+            return
+        while True:
+            key = self._value()
+            self._expect(':')
+            if self._peek() == '[':
+                self.pos += 1
+                if self._peek() == ']':
+                    self.pos += 1
+                else:
+                    while True:
+                        yield key, self._value()
+                        if self._expect(',]') == ']':
+                            break
+            else:
+                self._value()
+            if self._expect(',}') == '}':
+                return
+
+
+def _json(value):
+    # Same text JSON.stringify produces
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+def _ms(value):
+    if value is None or isinstance(value, (int, float)):
+        return value
+    return int(datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp() * 1000)
+
+
+class Table:
+    def __init__(self, conn, name):
+        self.name = name
+        self.columns = {}
+        for _, column, type_, notnull, default, _ in conn.execute(f'PRAGMA table_info("{name}")'):
+            self.columns[column] = (type_.upper(), notnull and default is None)
+
+    def row(self, record, now):
+        """Column -> value for one record, normalized the way import_full_backup.js does it."""
+        row = {}
+        for key, value in record.items():
+            if key in DROP or key not in self.columns:
+                continue
+            if isinstance(value, (list, dict)):
+                value = _json(value)
+            elif key in DATES:
+                value = _ms(value)
+            elif key == 'id':
+                value = int(value)
+            row[key] = value
+        for column, source in FALLBACKS.get(self.name, {}).items():
+            if row.get(column) is None and record.get(source) is not None and column in self.columns:
+                row[column] = record[source]
+        for column, (type_, required) in self.columns.items():
+            if required and row.get(column) is None and column != 'id':
+                row[column] = now if type_ == 'DATETIME' else 0 if type_ in ('INTEGER', 'BIGINT', 'BOOLEAN') else ''
+        return row
+
+
+class Importer:
+    """Batches rows per table and column set into executemany calls."""
+
+    def __init__(self, conn, update=False, batch_size=5000):
+        self.conn = conn
+        self.update = update
+        self.batch_size = batch_size
+        self.tables = {}
+        self.pending = {}
+        self.counts = {}
+        self.now = int(time.time() * 1000)
+
+    def _sql(self, table, columns):
+        quoted = ', '.join(f'"{c}"' for c in columns)
+        placeholders = ', '.join('?' for _ in columns)
+        if not self.update:
+            return f'INSERT OR IGNORE INTO "{table}" ({quoted}) VALUES ({placeholders})'
+        assignments = ', '.join(f'"{c}" = excluded."{c}"' for c in columns if c != 'id')
+        return f'INSERT INTO "{table}" ({quoted}) VALUES ({placeholders}) ON CONFLICT("id") DO UPDATE SET {assignments}'
+
+    def add(self, key, record):
+        name = TABLES.get(key)
+        if name is None or not isinstance(record, dict):
+            self.counts.setdefault(key, {'read': 0, 'written': 0, 'skipped': True})['read'] += 1
+            return
+        table = self.tables.get(name)
+        if table is None:
+            table = self.tables[name] = Table(self.conn, name)
+            if not table.columns:
+                raise ValueError(f"Table {name} does not exist; run the migrations first")
+        row = table.row(record, self.now)
+        columns = tuple(row)
+        batch = self.pending.setdefault((key, name, columns), [])
+        batch.append(tuple(row.values()))
+        self.counts.setdefault(key, {'read': 0, 'written': 0, 'skipped': False})['read'] += 1
+        if len(batch) >= self.batch_size:
+            self._flush(key, name, columns)
+
+    def _flush(self, key, name, columns):
+        batch = self.pending.pop((key, name, columns))
+        before = self.conn.total_changes
+        self.conn.executemany(self._sql(name, columns), batch)
+        self.counts[key]['written'] += self.conn.total_changes - before
+
+    def finish(self):
+        for key, name, columns in list(self.pending):
+            self._flush(key, name, columns)
+
+
+def import_backup(path, db, update=False, batch_size=5000):
+    conn = sqlite3.connect(db, isolation_level=None)
+    importer = Importer(conn, update, batch_size)
+    conn.execute('BEGIN')
+    try:
+        with open(path, 'r', encoding='utf-8-sig') as f:
+            for key, record in BackupReader(f):
+                importer.add(key, record)
+        importer.finish()
+        conn.execute('COMMIT')
+    except BaseException:
+        conn.execute('ROLLBACK')
+        raise
+    finally:
+        conn.close()
+    return importer.counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Stream backup.json into the SQLite database in one transaction.')
+    parser.add_argument('backup', nargs='?', default=DEFAULT_BACKUP)
+    parser.add_argument('--db', default=DEFAULT_DB, help='SQLite database with the Prisma schema applied')
+    parser.add_argument('--update', action='store_true', help='overwrite rows that already exist instead of keeping them')
+    parser.add_argument('--batch-size', type=int, default=5000, help='rows per executemany call')
+    args = parser.parse_args(argv)
+
+    for path in (args.backup, args.db):
+        if not os.path.exists(path):
+            print(f"Error: {path} does not exist")
+            return 1
+    started = time.perf_counter()
+    try:
+        counts = import_backup(args.backup, args.db, args.update, args.batch_size)
+    except (ValueError, sqlite3.Error) as e:
+        print(f"Error: {e} (nothing was written)")
+        return 1
+    elapsed = time.perf_counter() - started
+
+    verb = 'written' if args.update else 'inserted'
+    total = 0
+    for key, count in counts.items():
+        total += count['read']
+        if count['skipped']:
+            print(f"  {key}: {count['read']} records skipped (no matching table)")
+        else:
+            line = f"  {key}: {count['read']} read, {count['written']} {verb}"
+            if not args.update:
+                line += f", {count['read'] - count['written']} already present"
+            print(line)
+    print(f"Imported {total} records in {elapsed:.2f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
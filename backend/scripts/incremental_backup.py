@@ -0,0 +1,294 @@
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime, timezone
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DB = os.path.join(BACKEND_DIR, 'prisma', 'dev.db')
+DEFAULT_DIR = os.path.join(BACKEND_DIR, 'backups')
+MANIFEST = 'manifest.json'
+MANIFEST_VERSION = 2
+
+# Tracked tables and the column that moves when a row changes. Review has no
+# updatedAt, so only new reviews are picked up between snapshots.
+TRACKED = {
+    'Spot': 'updatedAt',
+    'Guide': 'updatedAt',
+    'Strategy': 'updatedAt',
+    'City': 'updatedAt',
+    'Review': 'createdAt',
+}
+
+# Prisma stamps updatedAt in the app before the write commits, so re-read a
+# little behind the watermark; restores upsert, so overlap is harmless
+OVERLAP_MS = 5000
+
+# Per-table id checksum: row count and sums over the low and high 32 bits of
+# the ids, plus a multiplicative hash of the low bits. All stay well inside
+# SQLite's 64-bit integers; any deletion moves at least one of them.
+_MASK = 0xFFFFFFFF
+_MULTIPLIER = 1103515245
+CHECKSUM_SQL = (f'SELECT count(*), coalesce(sum(id & {_MASK}), 0), coalesce(sum(id >> 32), 0), '
+                f'coalesce(sum(((id & {_MASK}) * {_MULTIPLIER}) & {_MASK}), 0) FROM "{{}}"')
+
+
+def _stamp():
+    return datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def _write_atomic(path, text):
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def checksum(ids):
+    """Same checksum as CHECKSUM_SQL, over an id list."""
+    return [len(ids), sum(i & _MASK for i in ids), sum(i >> 32 for i in ids),
+            sum(((i & _MASK) * _MULTIPLIER) & _MASK for i in ids)]
+
+
+# Id lists live next to the manifest, one file per table, and are only read
+# and rewritten when that table's checksum moves
+
+def _ids_path(directory, table):
+    return os.path.join(directory, f'ids-{table}.json')
+
+
+def load_ids(directory, table):
+    path = _ids_path(directory, table)
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_ids(directory, table, ids):
+    _write_atomic(_ids_path(directory, table), json.dumps(ids, separators=(',', ':')))
+
+
+def load_manifest(directory):
+    path = os.path.join(directory, MANIFEST)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('version') == 1:
+        # Version 1 kept every id list inside the manifest
+        ids = manifest.pop('ids')
+        for table, table_ids in ids.items():
+            save_ids(directory, table, table_ids)
+        manifest['checksums'] = {table: checksum(table_ids) for table, table_ids in ids.items()}
+        manifest['version'] = MANIFEST_VERSION
+        save_manifest(directory, manifest)
+    if manifest.get('version') != MANIFEST_VERSION:
+        raise ValueError(f"{path} has version {manifest.get('version')}, expected {MANIFEST_VERSION}")
+    return manifest
+
+
+def save_manifest(directory, manifest):
+    _write_atomic(os.path.join(directory, MANIFEST), json.dumps(manifest, indent=2) + '\n')
+
+
+def _tables(conn):
+    present = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    tables = {}
+    for table, column in TRACKED.items():
+        if table in present and any(row[1] == column for row in conn.execute(f'PRAGMA table_info("{table}")')):
+            tables[table] = column
+    return tables
+
+
+def _state(conn, tables):
+    """Watermark and id checksum per table; one aggregate each, no ids leave SQLite."""
+    watermarks, checksums = {}, {}
+    for table, column in tables.items():
+        watermarks[table] = conn.execute(f'SELECT max("{column}") FROM "{table}"').fetchone()[0] or 0
+        checksums[table] = list(conn.execute(CHECKSUM_SQL.format(table)).fetchone())
+    return watermarks, checksums
+
+
+def _ids(conn, table):
+    return [row[0] for row in conn.execute(f'SELECT id FROM "{table}" ORDER BY id')]
+
+
+def snapshot(db, directory):
+    """Full copy through the online backup API, which is consistent even while the API is writing."""
+    os.makedirs(directory, exist_ok=True)
+    name = f'base-{_stamp()}.db'
+    path = os.path.join(directory, name)
+    source = sqlite3.connect(f'file:{db}?mode=ro', uri=True)
+    target = sqlite3.connect(path + '.tmp')
+    try:
+        source.backup(target)
+    finally:
+        target.close()
+        source.close()
+    os.replace(path + '.tmp', path)
+
+    conn = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+    tables = _tables(conn)
+    watermarks, checksums = _state(conn, tables)
+    for table in tables:
+        save_ids(directory, table, _ids(conn, table))
+    conn.close()
+    manifest = {'version': MANIFEST_VERSION, 'base': name, 'created': _stamp(), 'tables': tables,
+                'watermarks': watermarks, 'checksums': checksums, 'deltas': []}
+    save_manifest(directory, manifest)
+    return manifest, os.path.getsize(path)
+
+
+def delta(db, directory, overlap_ms=OVERLAP_MS):
+    """Rows changed since the last checkpoint, plus deletions, as one NDJSON file; None when nothing changed."""
+    manifest = load_manifest(directory)
+    if manifest is None:
+        raise ValueError(f"No base snapshot in {directory}; run the snapshot command first")
+    conn = sqlite3.connect(f'file:{db}?mode=ro', uri=True, isolation_level=None)
+    lines = []
+    changed = deleted = 0
+    try:
+        # One read transaction so every table is read at the same point in time
+        conn.execute('BEGIN')
+        tables = {t: c for t, c in _tables(conn).items() if t in manifest['tables']}
+        watermarks, checksums = _state(conn, tables)
+        # Ids are only listed and diffed for tables whose checksum moved
+        ids = {table: _ids(conn, table) for table in tables if checksums[table] != manifest['checksums'].get(table)}
+        for table, column in tables.items():
+            since = manifest['watermarks'].get(table, 0) - overlap_ms
+            cursor = conn.execute(f'SELECT * FROM "{table}" WHERE "{column}" >= ? ORDER BY "{column}"', (since,))
+            names = [d[0] for d in cursor.description]
+            for row in cursor:
+                lines.append(json.dumps({'t': table, 'op': 'upsert', 'row': dict(zip(names, row))},
+                                        ensure_ascii=False, separators=(',', ':')))
+                changed += 1
+            gone = sorted(set(load_ids(directory, table)) - set(ids[table])) if table in ids else []
+            if gone:
+                lines.append(json.dumps({'t': table, 'op': 'delete', 'ids': gone}, separators=(',', ':')))
+                deleted += len(gone)
+        conn.execute('COMMIT')
+    finally:
+        conn.close()
+
+    # Rows inside the overlap window come back every run; only real movement counts
+    moved = watermarks != manifest['watermarks'] or checksums != manifest['checksums']
+    if not moved:
+        return None
+    name = f"delta-{len(manifest['deltas']) + 1:04d}-{_stamp()}.ndjson"
+    _write_atomic(os.path.join(directory, name), '\n'.join(lines) + '\n')
+    manifest['deltas'].append({'file': name, 'rows': changed, 'deleted': deleted})
+    manifest['watermarks'] = watermarks
+    manifest['checksums'] = checksums
+    save_manifest(directory, manifest)
+    # After the manifest: an id list left behind by a crash only makes a later delta repeat deletes
+    for table, table_ids in ids.items():
+        save_ids(directory, table, table_ids)
+    return manifest['deltas'][-1]
+
+
+def _apply(conn, entry, columns):
+    table = entry['t']
+    if entry['op'] == 'delete':
+        conn.executemany(f'DELETE FROM "{table}" WHERE id = ?', [(i,) for i in entry['ids']])
+        return
+    # Columns added to the live schema after the base was taken are dropped
+    row = {k: v for k, v in entry['row'].items() if k in columns[table]}
+    quoted = ', '.join(f'"{c}"' for c in row)
+    placeholders = ', '.join('?' for _ in row)
+    assignments = ', '.join(f'"{c}" = excluded."{c}"' for c in row if c != 'id')
+    conn.execute(f'INSERT INTO "{table}" ({quoted}) VALUES ({placeholders}) '
+                 f'ON CONFLICT("id") DO UPDATE SET {assignments}', tuple(row.values()))
+
+
+def restore(directory, output, upto=None):
+    """Copy the base to output and replay the deltas in order (the first `upto` of them if given)."""
+    manifest = load_manifest(directory)
+    if manifest is None:
+        raise ValueError(f"No manifest in {directory}")
+    if os.path.exists(output):
+        raise ValueError(f"{output} already exists; restore into a new file")
+    source = sqlite3.connect(f"file:{os.path.join(directory, manifest['base'])}?mode=ro", uri=True)
+    conn = sqlite3.connect(output + '.tmp', isolation_level=None)
+    try:
+        source.backup(conn)
+        source.close()
+        columns = {table: {row[1] for row in conn.execute(f'PRAGMA table_info("{table}")')}
+                   for table in manifest['tables']}
+        deltas = manifest['deltas'][:upto]
+        applied = 0
+        conn.execute('BEGIN')
+        for item in deltas:
+            with open(os.path.join(directory, item['file']), 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        _apply(conn, json.loads(line), columns)
+                        applied += 1
+        conn.execute('COMMIT')
+    except BaseException:
+        conn.close()
+        os.remove(output + '.tmp')
+        raise
+    conn.close()
+    os.replace(output + '.tmp', output)
+    return len(deltas), applied
+
+
+def _size(n):
+    return f'{n / 1024:.1f} KB' if n < 1 << 20 else f'{n / (1 << 20):.1f} MB'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Base snapshots plus incremental NDJSON deltas of the SQLite database.')
+    parser.add_argument('--dir', default=DEFAULT_DIR, help='backup directory holding the manifest')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    snap = sub.add_parser('snapshot', help='take a new base snapshot and start a new delta chain')
+    snap.add_argument('--db', default=DEFAULT_DB)
+
+    inc = sub.add_parser('delta', help='write the rows changed since the last checkpoint')
+    inc.add_argument('--db', default=DEFAULT_DB)
+    inc.add_argument('--overlap', type=float, default=OVERLAP_MS / 1000, help='seconds re-read behind the watermark')
+
+    res = sub.add_parser('restore', help='rebuild a database from the base and its deltas')
+    res.add_argument('output', help='database file to create')
+    res.add_argument('--upto', type=int, default=None, help='apply only the first N deltas')
+
+    sub.add_parser('status', help='show the current chain')
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    try:
+        if args.command in ('snapshot', 'delta') and not os.path.exists(args.db):
+            raise ValueError(f"{args.db} does not exist")
+        if args.command == 'snapshot':
+            manifest, size = snapshot(args.db, args.dir)
+            print(f"Snapshot {manifest['base']} ({_size(size)}), tracking {', '.join(manifest['tables'])}")
+        elif args.command == 'delta':
+            item = delta(args.db, args.dir, int(args.overlap * 1000))
+            if item is None:
+                print("No changes since the last checkpoint")
+            else:
+                size = os.path.getsize(os.path.join(args.dir, item['file']))
+                print(f"{item['file']}: {item['rows']} rows changed, {item['deleted']} deleted ({_size(size)})")
+        elif args.command == 'restore':
+            count, entries = restore(args.dir, args.output, args.upto)
+            print(f"Restored {args.output} from the base and {count} deltas ({entries} entries)")
+        else:
+            manifest = load_manifest(args.dir)
+            if manifest is None:
+                raise ValueError(f"No manifest in {args.dir}")
+            total = sum(os.path.getsize(os.path.join(args.dir, d['file'])) for d in manifest['deltas'])
+            print(f"Base {manifest['base']} ({_size(os.path.getsize(os.path.join(args.dir, manifest['base'])))}), "
+                  f"{len(manifest['deltas'])} deltas ({_size(total)})")
+    except (ValueError, OSError, sqlite3.Error) as e:
+        print(f"Error: {e}")
+        return 1
+    print(f"Done in {time.perf_counter() - started:.2f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,365 @@
+import argparse
+import os
+import random
+import re
+import sqlite3
+import statistics
+import sys
+import time
+from collections import namedtuple
+from datetime import datetime
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PRISMA_DIR = os.path.join(BACKEND_DIR, 'prisma')
+DEFAULT_DB = os.path.join(PRISMA_DIR, 'dev.db')
+SCHEMA = os.path.join(PRISMA_DIR, 'schema.prisma')
+MIGRATIONS = os.path.join(PRISMA_DIR, 'migrations')
+
+# One query as Prisma issues it. eq columns are compared to their most common
+# value; extra is more WHERE SQL whose :params are filled the same way (:now is
+# the current time in ms, which is how Prisma stores DateTime in SQLite);
+# order is a list of (column, descending).
+Shape = namedtuple('Shape', 'name table eq extra order')
+
+NOT_EXPIRED = '("expiryDate" IS NULL OR "expiryDate" > :now)'
+
+SHAPES = [
+    Shape('SpotsService.findAll', 'Spot', ['isActive'], NOT_EXPIRED,
+          [('isTop', True), ('rank', False), ('createdAt', True)]),
+    Shape('GuidesService.findAll', 'Guide', [], NOT_EXPIRED,
+          [('isTop', True), ('rank', False), ('createdAt', False)]),
+    Shape('ReviewsService.findAllByUserId', 'Review', ['userId'], None, [('createdAt', True)]),
+    Shape('ReviewsService.findAllByPoiId', 'Review', ['poiId'], None, [('createdAt', True)]),
+    Shape('ReviewsService.findAllBySpotId', 'Review', ['spotId'], None, [('createdAt', True)]),
+    Shape('ReviewsService.findAllByGuideId', 'Review', ['guideId'], None, [('createdAt', True)]),
+    Shape('ReviewsService.findAllByStrategyId', 'Review', ['strategyId'], None, [('createdAt', True)]),
+    Shape('ReviewsService.findAllByEnterpriseId', 'Review', ['enterpriseId'], None, [('createdAt', True)]),
+    Shape('FavoritesService.findAll', 'Favorite', ['userId'], None, [('createdAt', True)]),
+    Shape('FavoritesService.toggle', 'Favorite', ['userId'], '"poiId" = :poiId', []),
+]
+
+NOW_MS = int(time.time() * 1000)
+YEAR_MS = 365 * 24 * 3600 * 1000
+
+
+def _fk(fanout):
+    # About `fanout` rows per parent, like reviews per spot or favorites per user
+    return lambda rng, rows: rng.randint(1, max(1, rows // fanout))
+
+
+def _review_target(rng, rows, row, columns):
+    # A review belongs to exactly one kind of target
+    for column in ('poiId', 'spotId', 'guideId', 'strategyId', 'enterpriseId'):
+        if column in columns:
+            row[column] = None
+    target = rng.choice([c for c in ('poiId', 'spotId', 'guideId', 'strategyId', 'enterpriseId') if c in columns])
+    row[target] = rng.randint(1, max(1, rows // 20))
+
+
+# How synthetic rows differ from the copied templates
+SYNTH = {
+    'Spot': {
+        'isActive': lambda rng, rows: int(rng.random() < 0.9),
+        'isTop': lambda rng, rows: int(rng.random() < 0.05),
+        'rank': lambda rng, rows: rng.randint(1, 99),
+        'expiryDate': lambda rng, rows: None if rng.random() < 0.8 else NOW_MS + rng.randint(-YEAR_MS, YEAR_MS),
+    },
+    'Guide': {
+        'isTop': lambda rng, rows: int(rng.random() < 0.05),
+        'rank': lambda rng, rows: rng.randint(1, 99),
+        'expiryDate': lambda rng, rows: None if rng.random() < 0.8 else NOW_MS + rng.randint(-YEAR_MS, YEAR_MS),
+    },
+    'Review': {'userId': _fk(10), '*': _review_target},
+    'Favorite': {'userId': _fk(10), 'poiId': _fk(50)},
+}
+
+_DEFAULTS = {'INTEGER': 0, 'BIGINT': 0, 'BOOLEAN': 0, 'REAL': 0.0, 'DATETIME': NOW_MS}
+
+
+def columns_of(conn, table):
+    return {row[1]: row for row in conn.execute(f'PRAGMA table_info("{table}")')}
+
+
+def scale_table(conn, table, rows, rng):
+    """Grow table to `rows` rows by copying existing ones (or a default row) with fresh ids."""
+    info = columns_of(conn, table)
+    names = list(info)
+    have = conn.execute(f'SELECT count(*) FROM "{table}"').fetchone()[0]
+    if have >= rows:
+        return
+    templates = [dict(zip(names, r)) for r in conn.execute(f'SELECT * FROM "{table}" LIMIT 200')]
+    if not templates:
+        templates = [{name: (None if not notnull else _DEFAULTS.get(type_.upper(), ''))
+                      for _, name, type_, notnull, _, _ in info.values()}]
+    next_id = (conn.execute(f'SELECT max(id) FROM "{table}"').fetchone()[0] or 0) + 1
+    synth = SYNTH.get(table, {})
+    batch = []
+    for n in range(rows - have):
+        row = dict(templates[n % len(templates)])
+        row['id'] = next_id + n
+        row['createdAt'] = NOW_MS - rng.randint(0, 3 * YEAR_MS)
+        for column, make in synth.items():
+            if column == '*':
+                make(rng, rows, row, info)
+            elif column in info:
+                row[column] = make(rng, rows)
+        batch.append(tuple(row[name] for name in names))
+    placeholders = ', '.join('?' for _ in names)
+    quoted = ', '.join(f'"{name}"' for name in names)
+    conn.executemany(f'INSERT INTO "{table}" ({quoted}) VALUES ({placeholders})', batch)
+
+
+def _common_value(conn, table, column):
+    row = conn.execute(f'SELECT "{column}" FROM "{table}" WHERE "{column}" IS NOT NULL '
+                       f'GROUP BY "{column}" ORDER BY count(*) DESC LIMIT 1').fetchone()
+    return row[0] if row else 1
+
+
+def shape_sql(shape):
+    where = [f'"{column}" = :{column}' for column in shape.eq]
+    if shape.extra:
+        where.append(shape.extra)
+    sql = f'SELECT * FROM "{shape.table}"'
+    if where:
+        sql += ' WHERE ' + ' AND '.join(where)
+    if shape.order:
+        sql += ' ORDER BY ' + ', '.join(f'"{c}" DESC' if desc else f'"{c}" ASC' for c, desc in shape.order)
+    if not shape.order and shape.eq:
+        # findFirst
+        sql += ' LIMIT 1'
+    return sql
+
+
+def shape_params(conn, shape, sql):
+    params = {}
+    for name in re.findall(r':(\w+)', sql):
+        params[name] = NOW_MS if name == 'now' else _common_value(conn, shape.table, name)
+    return params
+
+
+def applicable(conn, shape):
+    columns = columns_of(conn, shape.table)
+    if not columns:
+        return f'table {shape.table} does not exist'
+    needed = list(shape.eq) + [c for c, _ in shape.order] + re.findall(r'"(\w+)"', shape.extra or '')
+    missing = [c for c in needed if c not in columns]
+    return f"{shape.table} has no {', '.join(missing)}" if missing else None
+
+
+def explain(conn, sql, params):
+    return [row[3] for row in conn.execute('EXPLAIN QUERY PLAN ' + sql, params)]
+
+
+def time_query(conn, sql, params, repeat):
+    runs = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        conn.execute(sql, params).fetchall()
+        runs.append(time.perf_counter() - started)
+    return statistics.median(runs)
+
+
+# --- proposals ---
+
+Index = namedtuple('Index', 'table columns')
+
+
+def index_name(index):
+    return f"{index.table}_{'_'.join(c for c, _ in index.columns)}_idx"
+
+
+def index_sql(index):
+    columns = ', '.join(f'"{c}" DESC' if desc else f'"{c}"' for c, desc in index.columns)
+    return f'CREATE INDEX "{index_name(index)}" ON "{index.table}"({columns});'
+
+
+def prisma_index(index):
+    columns = ', '.join(f'{c}(sort: Desc)' if desc else c for c, desc in index.columns)
+    return f'@@index([{columns}])'
+
+
+def propose(shape):
+    """Equality columns first, then the ORDER BY, so SQLite can seek and read rows already sorted."""
+    columns = [(c, False) for c in shape.eq]
+    if not shape.order and shape.extra:
+        columns += [(c, False) for c in re.findall(r'"(\w+)" = :', shape.extra)]
+    columns += [(c, desc) for c, desc in shape.order if (c, False) not in columns]
+    return Index(shape.table, tuple(columns)) if columns else None
+
+
+def existing_indexes(conn, table):
+    found = []
+    for row in conn.execute(f'PRAGMA index_list("{table}")'):
+        columns = tuple((r[2], bool(r[3])) for r in conn.execute(f'PRAGMA index_xinfo("{row[1]}")') if r[5])
+        found.append(columns)
+    return found
+
+
+def _covers(columns, index):
+    return columns[:len(index.columns)] == index.columns
+
+
+def dedupe(indexes, conn):
+    """Drop proposals that are a prefix of another proposal or of an index the table already has."""
+    kept = []
+    for index in indexes:
+        if index in kept:
+            continue
+        if any(other != index and other.table == index.table and _covers(other.columns, index) for other in indexes):
+            continue
+        if any(_covers(columns, index) for columns in existing_indexes(conn, index.table)):
+            continue
+        kept.append(index)
+    return kept
+
+
+# --- run ---
+
+def open_copy(path):
+    source = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+    conn = sqlite3.connect(':memory:')
+    source.backup(conn)
+    source.close()
+    return conn
+
+
+def advise(path, scales, repeat=5, seed=0):
+    """Plans and timings for every shape at every scale, before and after the proposed indexes."""
+    probe = open_copy(path)
+    shapes, skipped = [], []
+    for shape in SHAPES:
+        reason = applicable(probe, shape)
+        if reason:
+            skipped.append((shape, reason))
+        else:
+            shapes.append(shape)
+    indexes = dedupe([i for i in map(propose, shapes) if i], probe)
+    probe.close()
+
+    results = {shape.name: {'sql': shape_sql(shape), 'runs': []} for shape in shapes}
+    for rows in scales:
+        conn = open_copy(path)
+        rng = random.Random(seed)
+        if rows:
+            for table in sorted({shape.table for shape in shapes}):
+                scale_table(conn, table, rows, rng)
+        conn.execute('ANALYZE')
+        before = {}
+        for shape in shapes:
+            sql = shape_sql(shape)
+            params = shape_params(conn, shape, sql)
+            before[shape.name] = (explain(conn, sql, params), time_query(conn, sql, params, repeat), params)
+        for index in indexes:
+            conn.execute(index_sql(index))
+        conn.execute('ANALYZE')
+        for shape in shapes:
+            sql = shape_sql(shape)
+            plan, seconds, params = before[shape.name]
+            table_rows = conn.execute(f'SELECT count(*) FROM "{shape.table}"').fetchone()[0]
+            results[shape.name]['runs'].append({
+                'rows': table_rows, 'plan_before': plan, 'before': seconds,
+                'plan_after': explain(conn, sql, params), 'after': time_query(conn, sql, params, repeat),
+            })
+        conn.close()
+
+    # Only keep indexes the planner actually picked at the largest scale
+    used = set()
+    for result in results.values():
+        for step in result['runs'][-1]['plan_after']:
+            used.update(index_name(i) for i in indexes if index_name(i) in step)
+    return results, [i for i in indexes if index_name(i) in used], skipped
+
+
+def render_migration(indexes):
+    return ''.join(f'-- CreateIndex\n{index_sql(index)}\n\n' for index in indexes).rstrip('\n') + '\n'
+
+
+def add_schema_indexes(text, indexes):
+    """Insert @@index lines at the end of each model block; indexes already declared are left alone."""
+    for index in indexes:
+        line = prisma_index(index)
+        match = re.search(rf'^model {index.table} \{{\n(.*?)^\}}', text, re.M | re.S)
+        if not match or line in match.group(1):
+            continue
+        body = match.group(1).rstrip('\n')
+        # Block attributes sit together after a blank line, as prisma format lays them out
+        body += ('\n' if body.splitlines()[-1].lstrip().startswith('@@') else '\n\n') + f'  {line}\n'
+        text = text[:match.start(1)] + body + text[match.end(1):]
+    return text
+
+
+def write_migration(indexes, name='add_query_indexes'):
+    directory = os.path.join(MIGRATIONS, f"{datetime.now().strftime('%Y%m%d%H%M%S')}_{name}")
+    os.makedirs(directory)
+    path = os.path.join(directory, 'migration.sql')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(render_migration(indexes))
+    with open(SCHEMA, 'r', encoding='utf-8') as f:
+        schema = f.read()
+    updated = add_schema_indexes(schema, indexes)
+    if updated != schema:
+        with open(SCHEMA, 'w', encoding='utf-8') as f:
+            f.write(updated)
+    return path
+
+
+def _ms(seconds):
+    return f'{seconds * 1000:.2f}ms'
+
+
+def format_report(results):
+    lines = []
+    for name, result in results.items():
+        lines.append(f'{name}\n  {result["sql"]}')
+        last = result['runs'][-1]
+        lines.append(f"  plan before: {'; '.join(last['plan_before'])}")
+        lines.append(f"  plan after:  {'; '.join(last['plan_after'])}")
+        for run in result['runs']:
+            speedup = run['before'] / run['after'] if run['after'] else float('inf')
+            lines.append(f"  {run['rows']:>8} rows  {_ms(run['before']):>10} -> {_ms(run['after']):>10}  ({speedup:.1f}x)")
+    return '\n'.join(lines)
+
+
+def parse_scales(spec):
+    return [0 if part == 'actual' else int(part) for part in spec.split(',')]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Explain and time the service queries, then propose indexes.')
+    parser.add_argument('db', nargs='?', default=DEFAULT_DB, help='SQLite database (opened read-only)')
+    parser.add_argument('--rows', type=parse_scales, default=[0, 1000, 10000, 100000],
+                        help='row counts to scale each queried table to; "actual" means as is')
+    parser.add_argument('--repeat', type=int, default=5, help='timed runs per query; the median is reported')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--write', action='store_true',
+                        help='write prisma/migrations/<timestamp>_add_query_indexes and the @@index lines')
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        print(f"Error: {args.db} does not exist")
+        return 1
+    results, indexes, skipped = advise(args.db, args.rows, args.repeat, args.seed)
+    print(format_report(results))
+    for shape, reason in skipped:
+        print(f"Skipped {shape.name}: {reason}")
+
+    if not indexes:
+        print("\nNo new indexes would be used")
+        return 0
+    print('\nProposed migration:\n')
+    print(render_migration(indexes))
+    print('schema.prisma:')
+    for index in indexes:
+        print(f'  model {index.table}: {prisma_index(index)}')
+    if args.write:
+        try:
+            path = write_migration(indexes)
+        except FileExistsError as e:
+            print(f"Error: {e.filename} already exists")
+            return 1
+        print(f"\nWrote {os.path.relpath(path)} and updated schema.prisma")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,278 @@
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DB = os.path.join(BACKEND_DIR, 'prisma', 'dev.db')
+# What the job last wrote, so later runs can tell admin edits from their own
+DEFAULT_STATE = os.path.join(BACKEND_DIR, 'ranking-state.json')
+
+# Ranked table -> Review foreign key and the query listing the item id of each favorite.
+# Spots are favorited as a Poi whose amapId is String(spot.id) (type 'poi' in
+# favorites.service.ts); amapIds that are not such an id are real AMap ids.
+TABLES = {
+    'Spot': ('spotId', 'SELECT CAST(p.amapId AS INTEGER) FROM "Favorite" f JOIN "Poi" p ON p.id = f.poiId '
+                       'WHERE CAST(CAST(p.amapId AS INTEGER) AS TEXT) = p.amapId'),
+    'Guide': ('guideId', None),
+    'Strategy': ('strategyId', 'SELECT "strategyId" FROM "Favorite" WHERE "strategyId" IS NOT NULL'),
+}
+
+# Score weights. Counts enter as log1p, so ten times the views adds a fixed
+# amount; rating enters as the smoothed average's distance from the table mean.
+WEIGHTS = {'views': 1.0, 'reviews': 0.8, 'favorites': 1.2, 'rating': 0.6, 'recency': 0.5}
+# Reviews of prior weight pulling each average towards the table mean
+PRIOR_REVIEWS = 5
+HALF_LIFE_DAYS = 90
+TOP = 3
+DEFAULT_RANK = 99
+DAY_MS = 86400000
+
+
+def _columns(conn, table):
+    return {row[1] for row in conn.execute(f'PRAGMA table_info("{table}")')}
+
+
+def _group(value, is_global=False):
+    """The list a row competes in: its city, a guide's first city, '*' for global guides."""
+    if is_global:
+        return '*'
+    if value and value.startswith('['):
+        try:
+            cities = json.loads(value)
+        except ValueError:
+            return value
+        return str(cities[0]) if cities else ''
+    return value or ''
+
+
+def load_items(conn, table, now):
+    """Every row of one table as numpy columns: ids, group codes, views, createdAt, rank, isTop and liveness.
+
+    Expired and inactive rows are ranked too, so one expiring does not
+    shift every rank below it and force a rewrite of its whole city.
+    """
+    have = _columns(conn, table)
+    city = 'city' if 'city' in have else 'cities'
+    live = '(expiryDate IS NULL OR expiryDate > ?)' + (' AND isActive' if 'isActive' in have else '')
+    select = ['id', f'"{city}"', 'coalesce(viewCount, 0)', 'createdAt', 'rank',
+              'isTop' if 'isTop' in have else '0', 'isGlobal' if 'isGlobal' in have else '0', live]
+    rows = conn.execute(f'SELECT {", ".join(select)} FROM "{table}" ORDER BY id', (now,)).fetchall()
+    columns = list(zip(*rows)) if rows else [()] * len(select)
+    if city == 'cities' or 'isGlobal' in have:
+        groups = [_group(value, is_global) for value, is_global in zip(columns[1], columns[6])]
+    else:
+        groups = [value or '' for value in columns[1]]
+    names, codes = np.unique(np.array(groups, dtype=object), return_inverse=True) if rows else ([], np.empty(0, int))
+    created = np.array([c if isinstance(c, (int, float)) else now for c in columns[3]], dtype=np.float64)
+    return {
+        'ids': np.array(columns[0], dtype=np.int64),
+        'group': codes.astype(np.int64),
+        'groups': list(names),
+        'views': np.array(columns[2], dtype=np.float64),
+        'created': created,
+        'rank': np.array(columns[4], dtype=np.int64),
+        'top': np.array(columns[5], dtype=bool),
+        'live': np.array(columns[7], dtype=bool),
+        'has_top': 'isTop' in have,
+    }
+
+
+def _per_item(ids, keys, weights=None):
+    """Sum of weights (or count) per id for foreign keys `keys`; keys not among ids are ignored."""
+    if not len(ids) or not len(keys):
+        return np.zeros(len(ids))
+    at = np.minimum(np.searchsorted(ids, keys), len(ids) - 1)
+    hit = ids[at] == keys
+    return np.bincount(at[hit], weights=None if weights is None else weights[hit], minlength=len(ids)).astype(np.float64)
+
+
+def engagement(conn, table, ids):
+    """Review count, rating sum and favorite count per item, aggregated in numpy."""
+    review_fk, favorite_query = TABLES[table]
+    have = _columns(conn, 'Review')
+    # Generated reviews (ADMIN_MOCK, SYSTEM_MOCK) say nothing about real interest
+    real = ' AND type = \'REAL\'' if 'type' in have else ''
+    reviews = np.array(conn.execute(f'SELECT "{review_fk}", rating FROM "Review" WHERE "{review_fk}" IS NOT NULL{real}')
+                       .fetchall(), dtype=np.float64).reshape(-1, 2)
+    keys = reviews[:, 0].astype(np.int64)
+    counts = _per_item(ids, keys)
+    ratings = _per_item(ids, keys, reviews[:, 1])
+    favorites = np.zeros(len(ids))
+    if favorite_query:
+        try:
+            fav = np.array([r[0] for r in conn.execute(favorite_query)], dtype=np.int64)
+        except sqlite3.OperationalError:
+            # Databases from before favorites (no Poi link or strategyId column)
+            fav = np.empty(0, dtype=np.int64)
+        favorites = _per_item(ids, fav)
+    return counts, ratings, favorites
+
+
+def score(items, counts, ratings, favorites, now, weights=WEIGHTS):
+    mean = ratings.sum() / counts.sum() if counts.sum() else 0.0
+    smoothed = (PRIOR_REVIEWS * mean + ratings) / (PRIOR_REVIEWS + counts)
+    # Calendar days (UTC), so reruns within a day give the same order and write nothing
+    age_days = np.maximum(now // DAY_MS - items['created'] // DAY_MS, 0)
+    return (weights['views'] * np.log1p(items['views'])
+            + weights['reviews'] * np.log1p(counts)
+            + weights['favorites'] * np.log1p(favorites)
+            + weights['rating'] * (smoothed - mean)
+            + weights['recency'] * 0.5 ** (age_days / HALF_LIFE_DAYS))
+
+
+def positions(group, scores, created):
+    """1-based place of each item within its group: higher score first, newer first on ties."""
+    order = np.lexsort((-created, -scores, group))
+    sorted_groups = group[order]
+    starts = np.searchsorted(sorted_groups, sorted_groups)
+    place = np.empty(len(order), dtype=np.int64)
+    place[order] = np.arange(len(order)) - starts + 1
+    return place
+
+
+def plan(conn, table, now, top=TOP, state=None, override=False):
+    """New rank/isTop for one table's live rows, leaving rows an admin has set by hand.
+
+    A row counts as set by hand when its current values differ from what
+    this job last wrote to it (from the defaults, for rows it never wrote).
+    """
+    items = load_items(conn, table, now)
+    counts, ratings, favorites = engagement(conn, table, items['ids'])
+    scores = score(items, counts, ratings, favorites, now)
+    place = positions(items['group'], scores, items['created'])
+    new_top = items['top']
+    if items['has_top']:
+        # Top slots go to live, engaged rows only
+        eligible = np.flatnonzero(items['live'] & ((items['views'] + counts + favorites) > 0))
+        new_top = np.zeros(len(place), dtype=bool)
+        new_top[eligible] = positions(items['group'][eligible], scores[eligible], items['created'][eligible]) <= top
+
+    expected_rank, expected_top = _expected(state or {}, table, items['ids'])
+    pinned = np.zeros(len(place), dtype=bool) if override else \
+        (items['rank'] != expected_rank) | (items['has_top'] & (items['top'] != expected_top))
+    rank = np.where(pinned, items['rank'], place)
+    new_top = np.where(pinned, items['top'], new_top)
+    return {
+        'table': table, 'items': items, 'scores': scores, 'rank': rank, 'top': new_top, 'pinned': pinned,
+        'changed': (rank != items['rank']) | (new_top != items['top']),
+    }
+
+
+def apply(conn, plans, now):
+    """Write every plan's changed rows in one transaction; updatedAt moves so incremental backups pick them up."""
+    conn.execute('BEGIN')
+    try:
+        for p in plans:
+            rows = np.flatnonzero(p['changed'])
+            ids = p['items']['ids'][rows].tolist()
+            if p['items']['has_top']:
+                conn.executemany(f'UPDATE "{p["table"]}" SET rank = ?, isTop = ?, updatedAt = ? WHERE id = ?',
+                                 zip(p['rank'][rows].tolist(), p['top'][rows].astype(int).tolist(), [now] * len(ids), ids))
+            else:
+                conn.executemany(f'UPDATE "{p["table"]}" SET rank = ?, updatedAt = ? WHERE id = ?',
+                                 zip(p['rank'][rows].tolist(), [now] * len(ids), ids))
+        conn.execute('COMMIT')
+    except BaseException:
+        conn.execute('ROLLBACK')
+        raise
+
+
+# The state file holds, per table, parallel lists sorted by id: {"ids": [...], "rank": [...], "top": [...]}
+
+def _state_columns(state, table):
+    written = state.get(table) or {'ids': [], 'rank': [], 'top': []}
+    return (np.array(written['ids'], dtype=np.int64), np.array(written['rank'], dtype=np.int64),
+            np.array(written['top'], dtype=bool))
+
+
+def _expected(state, table, ids):
+    """What the job last wrote for each id; the schema defaults where it never wrote."""
+    known, rank, top = _state_columns(state, table)
+    if not len(known):
+        return np.full(len(ids), DEFAULT_RANK, dtype=np.int64), np.zeros(len(ids), dtype=bool)
+    at = np.minimum(np.searchsorted(known, ids), len(known) - 1)
+    hit = known[at] == ids
+    return np.where(hit, rank[at], DEFAULT_RANK), np.where(hit, top[at], False)
+
+
+def record_state(path, plans, state):
+    """Remember the values the job now stands behind: what it wrote, or left in place unpinned."""
+    for p in plans:
+        keep = ~p['pinned']
+        known, rank, top = _state_columns(state, p['table'])
+        old = ~np.isin(known, p['items']['ids'][keep])
+        ids = np.concatenate([known[old], p['items']['ids'][keep]])
+        order = np.argsort(ids, kind='stable')
+        state[p['table']] = {'ids': ids[order].tolist(),
+                             'rank': np.concatenate([rank[old], p['rank'][keep]])[order].tolist(),
+                             'top': np.concatenate([top[old], p['top'][keep]])[order].tolist()}
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(state, separators=(',', ':')))
+    os.replace(tmp, path)
+
+
+def _load_state(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def format_plan(p, show=5):
+    items = p['items']
+    lines = [f"{p['table']}: {len(items['ids'])} rows ({int(items['live'].sum())} live) in {len(items['groups'])} groups, "
+             f"{int(p['changed'].sum())} to update, {int(p['pinned'].sum())} set by hand and kept"]
+    for code, name in enumerate(items['groups']):
+        members = np.flatnonzero(items['group'] == code)
+        # In list order: isTop first, then rank
+        best = members[np.lexsort((p['rank'][members], ~p['top'][members]))][:show]
+        shown = ', '.join(f"#{p['rank'][i]} {items['ids'][i]}" + (' (top)' if p['top'][i] else '')
+                          + (' (kept)' if p['pinned'][i] else '') for i in best)
+        lines.append(f"  {name or '(no city)'}: {shown}")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Recompute rank and isTop per city from views, reviews, favorites and recency.')
+    parser.add_argument('--db', default=DEFAULT_DB)
+    parser.add_argument('--state', default=DEFAULT_STATE, help='file remembering what the job wrote')
+    parser.add_argument('--top', type=int, default=TOP, help='items per city marked isTop')
+    parser.add_argument('--table', action='append', choices=list(TABLES), help='rank only these tables')
+    parser.add_argument('--override', action='store_true', help='also overwrite ranks an admin set by hand')
+    parser.add_argument('--write', action='store_true', help='write the new ranks (default is a dry run)')
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        print(f"Error: {args.db} does not exist")
+        return 1
+    started = time.perf_counter()
+    now = int(time.time() * 1000)
+    conn = sqlite3.connect(args.db, isolation_level=None)
+    try:
+        state = _load_state(args.state)
+        plans = [plan(conn, table, now, args.top, state, args.override) for table in args.table or TABLES]
+        for p in plans:
+            for line in format_plan(p):
+                print(line)
+        if args.write:
+            apply(conn, plans, now)
+            record_state(args.state, plans, state)
+            print(f"Updated {sum(int(p['changed'].sum()) for p in plans)} rows in {time.perf_counter() - started:.2f}s")
+        else:
+            print(f"Dry run in {time.perf_counter() - started:.2f}s; pass --write to apply")
+    except (sqlite3.Error, ValueError, OSError) as e:
+        print(f"Error: {e}")
+        return 1
+    finally:
+        conn.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,393 @@
+import argparse
+import html
+import json
+import math
+import mmap
+import os
+import re
+import sqlite3
+import struct
+import sys
+import time
+import unicodedata
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DB = os.path.join(BACKEND_DIR, 'prisma', 'dev.db')
+DEFAULT_INDEX = os.path.join(BACKEND_DIR, 'search.idx')
+
+MAGIC = b'TMSI'
+VERSION = 2
+# magic, version, docs, terms, postings, avgdl, then section offsets:
+# dictionary, term text, doc ids, term frequencies, doc lengths, doc types, doc offsets, doc text
+HEADER = struct.Struct('<4sIIIIf8I')
+
+TYPES = ['spot', 'guide', 'strategy', 'city']
+
+# Field weights: a hit in a name counts as three in the body
+FIELDS = {
+    'spot': {'name': 3, 'cnName': 3, 'tags': 2, 'address': 1},
+    'guide': {'name': 3, 'intro': 1},
+    'strategy': {'title': 3},
+    'city': {'name': 3, 'nameEn': 3, 'nameKo': 3},
+}
+
+K1 = 1.2
+B = 0.75
+# Terms in more than this share of documents only rescore candidates found by rarer terms
+COMMON = 0.05
+# Score scale for single-character terms, which match far more loosely than bigrams
+UNIGRAM_WEIGHT = 0.5
+
+_CJK = '぀-ヿ㐀-䶿一-鿿豈-﫿'
+_HANGUL = 'ᄀ-ᇿ㄰-㆏가-힯'
+_TOKEN = re.compile(rf'[{_CJK}]+|[{_HANGUL}]+|[^\W_{_CJK}{_HANGUL}]+')
+_IDEOGRAPHIC = re.compile(rf'[{_CJK}{_HANGUL}]')
+_TAG = re.compile(r'<[^>]+>')
+
+
+def tokenize(text, unigrams=None):
+    """Latin and digit runs become words; Chinese/Japanese and Hangul runs become overlapping bigrams.
+
+    Bigrams let 青岛 match inside 青岛啤酒博物馆 and 칭다오 inside 칭다오맥주
+    without a dictionary segmenter. Single characters stay unigrams. When
+    a list is passed as `unigrams`, the characters of longer runs are
+    appended to it, so documents can also be found by one character.
+    """
+    text = unicodedata.normalize('NFKC', text).lower()
+    tokens = []
+    for match in _TOKEN.finditer(text):
+        run = match.group()
+        if _IDEOGRAPHIC.match(run):
+            if len(run) == 1:
+                tokens.append(run)
+            else:
+                tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+                if unigrams is not None:
+                    unigrams.extend(run)
+        else:
+            tokens.append(run)
+    return tokens
+
+
+def _is_unigram(term):
+    return len(term) == 1 and _IDEOGRAPHIC.match(term) is not None
+
+
+def _text(value):
+    if value is None:
+        return ''
+    if isinstance(value, list):
+        return ' '.join(str(v) for v in value)
+    if isinstance(value, str) and value.startswith('['):
+        try:
+            return ' '.join(str(v) for v in json.loads(value))
+        except ValueError:
+            pass
+    return html.unescape(_TAG.sub(' ', str(value)))
+
+
+# --- loading ---
+
+def _rows_from_db(source):
+    now = int(time.time() * 1000)
+    conn = sqlite3.connect(f'file:{source}?mode=ro', uri=True)
+    conn.row_factory = sqlite3.Row
+    try:
+        columns = lambda table: {r[1] for r in conn.execute(f'PRAGMA table_info("{table}")')}
+        for type_, table in (('spot', 'Spot'), ('guide', 'Guide'), ('strategy', 'Strategy'), ('city', 'City')):
+            have = columns(table)
+            for row in conn.execute(f'SELECT * FROM "{table}"'):
+                row = dict(row)
+                if 'isActive' in have and not row['isActive']:
+                    continue
+                if 'expiryDate' in have and row['expiryDate'] is not None and row['expiryDate'] <= now:
+                    continue
+                yield type_, row
+    finally:
+        conn.close()
+
+
+def _rows_from_backup(source):
+    now = time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime())
+    with open(source, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    for type_, key in (('spot', 'spots'), ('guide', 'guides'), ('strategy', 'strategies'), ('city', 'cities')):
+        for row in data.get(key) or []:
+            if row.get('isActive') is False or (row.get('expiryDate') and row['expiryDate'] <= now):
+                continue
+            yield type_, row
+
+
+def load_rows(source):
+    """(type, row) for every active, unexpired spot, guide, strategy and city in a database or backup.json."""
+    return _rows_from_backup(source) if source.endswith('.json') else _rows_from_db(source)
+
+
+def load_documents(source):
+    """(type, weighted tokens, length, display record) for every searchable row.
+
+    The characters of longer CJK/Hangul runs are indexed as well but left
+    out of the length, so they do not change how bigrams and words score.
+    """
+    for type_, row in load_rows(source):
+        counts = {}
+        length = 0
+        for field, weight in FIELDS[type_].items():
+            unigrams = []
+            tokens = tokenize(_text(row.get(field)), unigrams)
+            for token in tokens + unigrams:
+                counts[token] = counts.get(token, 0) + weight
+            length += len(tokens) * weight
+        if not counts:
+            continue
+        title = row.get('name') or row.get('title')
+        subtitle = row.get('cnName') or row.get('address') or row.get('nameEn') or row.get('city')
+        yield type_, counts, length, {'type': type_, 'id': row['id'], 'title': title, 'subtitle': subtitle}
+
+
+# --- file format ---
+
+def _align(buf):
+    buf.extend(b'\0' * (-len(buf) % 4))
+
+
+def build(documents, path):
+    """Write the index; everything is little-endian and 4-byte aligned so readers can map it directly."""
+    postings = {}
+    lengths, types, records = [], [], []
+    for doc, (type_, counts, length, record) in enumerate(documents):
+        for token, tf in counts.items():
+            postings.setdefault(token, []).append((doc, min(tf, 65535)))
+        lengths.append(length)
+        types.append(TYPES.index(type_))
+        records.append(json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+    # Sorted by UTF-8 bytes, which is the order the reader bisects in
+    terms = sorted(postings, key=lambda t: t.encode('utf-8'))
+    dictionary = bytearray()
+    term_text = bytearray()
+    doc_ids = np.empty(sum(len(p) for p in postings.values()), dtype='<u4')
+    tfs = np.empty(len(doc_ids), dtype='<u2')
+    at = 0
+    for term in terms:
+        encoded = term.encode('utf-8')
+        plist = postings[term]
+        dictionary += struct.pack('<4I', len(term_text), len(encoded), at, len(plist))
+        term_text += encoded
+        for doc, tf in plist:
+            doc_ids[at] = doc
+            tfs[at] = tf
+            at += 1
+
+    body = bytearray(HEADER.size)
+    offsets = []
+    doc_offsets = np.zeros(len(records) + 1, dtype='<u4')
+    np.cumsum([len(r) for r in records], out=doc_offsets[1:])
+    for section in (dictionary, term_text, doc_ids.tobytes(), tfs.tobytes(),
+                    np.array(lengths, dtype='<u4').tobytes(), np.array(types, dtype='u1').tobytes(),
+                    doc_offsets.tobytes(), b''.join(records)):
+        _align(body)
+        offsets.append(len(body))
+        body += section
+    avgdl = sum(lengths) / len(lengths) if lengths else 0.0
+    body[:HEADER.size] = HEADER.pack(MAGIC, VERSION, len(records), len(terms), len(doc_ids), avgdl, *offsets)
+
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(body)
+    os.replace(tmp, path)
+    return {'docs': len(records), 'terms': len(terms), 'postings': len(doc_ids), 'bytes': len(body)}
+
+
+class SearchIndex:
+    """Read side: the file is mapped, never loaded, so opening is instant and memory is shared."""
+
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, self.docs, self.terms, postings, self.avgdl,
+         dictionary, term_text, doc_ids, tfs, lengths, types, doc_offsets, doc_text) = HEADER.unpack_from(self.map)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a search index")
+        if version != VERSION:
+            raise ValueError(f"{path} is a version {version} search index, this tool reads version {VERSION}; "
+                             "rebuild it with: python scripts/search_index.py build")
+        self.dictionary = np.frombuffer(self.map, dtype='<u4', count=self.terms * 4, offset=dictionary).reshape(-1, 4)
+        self.term_text = term_text
+        self.doc_ids = np.frombuffer(self.map, dtype='<u4', count=postings, offset=doc_ids)
+        self.tfs = np.frombuffer(self.map, dtype='<u2', count=postings, offset=tfs)
+        self.lengths = np.frombuffer(self.map, dtype='<u4', count=self.docs, offset=lengths)
+        self.types = np.frombuffer(self.map, dtype='u1', count=self.docs, offset=types)
+        self.doc_offsets = np.frombuffer(self.map, dtype='<u4', count=self.docs + 1, offset=doc_offsets)
+        self.doc_text = doc_text
+
+    def _term(self, i):
+        start, length = int(self.dictionary[i, 0]), int(self.dictionary[i, 1])
+        return self.map[self.term_text + start:self.term_text + start + length]
+
+    def lookup(self, term):
+        """(start, count) of the term's postings, or None."""
+        key = term.encode('utf-8')
+        lo, hi = 0, self.terms
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._term(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.terms and self._term(lo) == key:
+            return int(self.dictionary[lo, 2]), int(self.dictionary[lo, 3])
+        return None
+
+    def document(self, doc):
+        start, end = int(self.doc_offsets[doc]), int(self.doc_offsets[doc + 1])
+        return json.loads(self.map[self.doc_text + start:self.doc_text + end].decode('utf-8'))
+
+    def search(self, query, limit=10, type_=None):
+        """BM25 over the query's tokens; work is proportional to the matching postings, not the catalog.
+
+        Terms are taken rarest first. Once a rare term has produced
+        candidates, a very common term (say "spot" or "museum") is only
+        looked up for those candidates instead of scoring its whole
+        postings list; it adds next to nothing to documents outside them.
+        """
+        found = [(f, UNIGRAM_WEIGHT if _is_unigram(term) else 1.0)
+                 for term in set(tokenize(query)) for f in [self.lookup(term)] if f]
+        docs, scores = [], []
+        candidates = None
+        for (start, df), weight in sorted(found, key=lambda f: f[0][1]):
+            ids = self.doc_ids[start:start + df]
+            tf = self.tfs[start:start + df]
+            if docs and df > COMMON * self.docs:
+                if candidates is None:
+                    candidates = np.unique(np.concatenate(docs))
+                # Postings are sorted by document, so this is a merge by bisection
+                at = np.minimum(np.searchsorted(ids, candidates), df - 1)
+                hit = ids[at] == candidates
+                ids, tf = candidates[hit], tf[at[hit]]
+            tf = tf.astype(np.float64)
+            idf = math.log(1 + (self.docs - df + 0.5) / (df + 0.5))
+            norm = K1 * (1 - B + B * self.lengths[ids] / self.avgdl)
+            docs.append(ids)
+            scores.append(weight * idf * tf * (K1 + 1) / (tf + norm))
+        if not docs:
+            return []
+        ids = np.concatenate(docs)
+        unique, inverse = np.unique(ids, return_inverse=True)
+        totals = np.bincount(inverse, weights=np.concatenate(scores))
+        if type_ is not None:
+            keep = self.types[unique] == TYPES.index(type_)
+            unique, totals = unique[keep], totals[keep]
+        if len(unique) > limit:
+            top = np.argpartition(-totals, limit)[:limit]
+            unique, totals = unique[top], totals[top]
+        order = np.argsort(-totals, kind='stable')
+        return [dict(self.document(int(unique[i])), score=round(float(totals[i]), 4)) for i in order]
+
+    def close(self):
+        self.dictionary = self.doc_ids = self.tfs = self.lengths = self.types = self.doc_offsets = None
+        self.map.close()
+        self.file.close()
+
+
+# --- service ---
+
+def make_handler(index):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlsplit(self.path)
+            if url.path != '/search':
+                return self._send(404, {'error': 'Not found'})
+            query = parse_qs(url.query)
+            q = query.get('q', [''])[0]
+            type_ = query.get('type', [None])[0]
+            if type_ is not None and type_ not in TYPES:
+                return self._send(400, {'error': f"type must be one of {', '.join(TYPES)}"})
+            try:
+                limit = max(1, min(100, int(query.get('limit', ['10'])[0])))
+            except ValueError:
+                return self._send(400, {'error': 'limit must be a number'})
+            started = time.perf_counter()
+            results = index.search(q, limit, type_)
+            self._send(200, {'query': q, 'took_ms': round((time.perf_counter() - started) * 1000, 3),
+                             'results': results})
+
+        def _send(self, status, payload):
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='BM25 search over spots, guides, strategies and cities.')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    bld = sub.add_parser('build', help='build the index file')
+    bld.add_argument('source', nargs='?', default=DEFAULT_DB, help='SQLite database or backup.json')
+    bld.add_argument('-o', '--output', default=DEFAULT_INDEX)
+
+    qry = sub.add_parser('query', help='run one search')
+    qry.add_argument('text')
+    qry.add_argument('--index', default=DEFAULT_INDEX)
+    qry.add_argument('--type', choices=TYPES)
+    qry.add_argument('-n', '--limit', type=int, default=10)
+
+    srv = sub.add_parser('serve', help='serve GET /search?q=...&type=...&limit=...')
+    srv.add_argument('--index', default=DEFAULT_INDEX)
+    srv.add_argument('--host', default='127.0.0.1')
+    srv.add_argument('--port', type=int, default=3002)
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        if not os.path.exists(args.source):
+            print(f"Error: {args.source} does not exist")
+            return 1
+        started = time.perf_counter()
+        info = build(load_documents(args.source), args.output)
+        print(f"Indexed {info['docs']} documents, {info['terms']} terms, {info['postings']} postings "
+              f"into {os.path.relpath(args.output)} ({info['bytes'] / 1024:.1f} KB) in {time.perf_counter() - started:.2f}s")
+        return 0
+
+    try:
+        index = SearchIndex(args.index)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        return 1
+    if args.command == 'query':
+        started = time.perf_counter()
+        results = index.search(args.text, args.limit, args.type)
+        elapsed = time.perf_counter() - started
+        for result in results:
+            print(f"  {result['score']:>8.3f}  {result['type']:<8} {result['id']:<15} {result['title']}"
+                  + (f"  ({result['subtitle']})" if result['subtitle'] else ''))
+        print(f"{len(results)} results in {elapsed * 1000:.2f} ms")
+        index.close()
+        return 0
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(index))
+    print(f"Search service on http://{args.host}:{args.port}/search ({index.docs} documents)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        index.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,303 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from cluster_tiles import city_key
+from coord_transform import gcj02_to_wgs84_exact
+from geo_service import haversine
+from search_index import load_rows
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DB = os.path.join(BACKEND_DIR, 'prisma', 'dev.db')
+DEFAULT_OUT = os.path.join(BACKEND_DIR, '..', 'frontend', 'public', 'routes')
+# Bumped when the output changes shape, so older caches are recomputed
+VERSION = 1
+NEIGHBOURS = 10
+# Rows of the distance matrix held at once; 1024 x 10k float64 is 80 MB
+BLOCK = 1024
+
+
+def distance_matrix(lng, lat, lng2=None, lat2=None):
+    """Haversine metres between every pair, by broadcasting; against itself when no second set is given."""
+    if lng2 is None:
+        lng2, lat2 = lng, lat
+    return haversine(np.asarray(lng)[:, None], np.asarray(lat)[:, None], np.asarray(lng2)[None, :], np.asarray(lat2)[None, :])
+
+
+def nearest_neighbours(lng, lat, k=NEIGHBOURS, block=BLOCK):
+    """(indices, metres) of the k nearest other spots for each spot, nearest first.
+
+    The matrix is built a block of rows at a time and reduced with
+    argpartition, so memory stays at block x n whatever the city's size.
+    """
+    n = len(lng)
+    k = min(k, n - 1)
+    indices = np.empty((n, max(k, 0)), dtype=np.int64)
+    distances = np.empty((n, max(k, 0)), dtype=np.float64)
+    if k <= 0:
+        return indices, distances
+    for start in range(0, n, block):
+        rows = np.arange(start, min(start + block, n))
+        d = distance_matrix(lng[rows], lat[rows], lng, lat)
+        d[np.arange(len(rows)), rows] = np.inf
+        part = np.argpartition(d, k - 1, axis=1)[:, :k]
+        pd = np.take_along_axis(d, part, axis=1)
+        order = np.argsort(pd, axis=1, kind='stable')
+        indices[rows] = np.take_along_axis(part, order, axis=1)
+        distances[rows] = np.take_along_axis(pd, order, axis=1)
+    return indices, distances
+
+
+def greedy_order(d, start=0):
+    """Nearest-neighbour path through every point of distance matrix d, from `start`."""
+    n = len(d)
+    visited = np.zeros(n, dtype=bool)
+    order = [start]
+    visited[start] = True
+    for _ in range(n - 1):
+        row = np.where(visited, np.inf, d[order[-1]])
+        order.append(int(np.argmin(row)))
+        visited[order[-1]] = True
+    return order
+
+
+def two_opt(d, order):
+    """Improve an open path with a fixed first stop by reversing segments while that shortens it.
+
+    For each segment start i the gain of every segment end j is computed in
+    one vectorized step; the best improving reversal is applied and the
+    scan repeats until none is left.
+    """
+    path = np.array(order)
+    n = len(path)
+    improved = True
+    while improved:
+        improved = False
+        for i in range(1, n - 1):
+            j = np.arange(i + 1, n)
+            before = d[path[i - 1], path[i]] + np.where(j < n - 1, d[path[j], path[np.minimum(j + 1, n - 1)]], 0.0)
+            after = d[path[i - 1], path[j]] + np.where(j < n - 1, d[path[i], path[np.minimum(j + 1, n - 1)]], 0.0)
+            gain = before - after
+            best = int(np.argmax(gain))
+            if gain[best] > 1e-6:
+                path[i:j[best] + 1] = path[i:j[best] + 1][::-1]
+                improved = True
+    return path.tolist()
+
+
+def path_length(d, order):
+    return float(sum(d[a, b] for a, b in zip(order, order[1:])))
+
+
+def itinerary(lng, lat):
+    """Visiting order for one list of stops: greedy from the first listed stop, then 2-opt."""
+    d = distance_matrix(lng, lat)
+    listed = list(range(len(lng)))
+    order = two_opt(d, greedy_order(d)) if len(lng) > 2 else listed
+    return order, [float(d[a, b]) for a, b in zip(order, order[1:])], path_length(d, listed)
+
+
+# --- loading ---
+
+def _list(value):
+    if isinstance(value, list):
+        return value
+    try:
+        value = json.loads(value or '[]')
+    except ValueError:
+        return []
+    return value if isinstance(value, list) else []
+
+
+def load(source):
+    """Active spots with coordinates (GCJ-02 converted to WGS-84) grouped by city, and active strategies."""
+    spots, strategies = [], []
+    for type_, row in load_rows(source):
+        if type_ == 'spot':
+            location = row.get('location') or {}
+            lng, lat = row.get('lng', location.get('lng')), row.get('lat', location.get('lat'))
+            if lng is not None and lat is not None and row.get('city'):
+                spots.append({'id': row['id'], 'name': (row.get('name') or '').strip(),
+                              'cnName': (row.get('cnName') or '').strip(), 'city': row['city'], 'lng': lng, 'lat': lat})
+        elif type_ == 'strategy':
+            strategies.append({'id': row['id'], 'city': row.get('city'),
+                               'spots': [str(s).strip() for s in _list(row.get('spots')) if str(s).strip()]})
+    if spots:
+        wlng, wlat = gcj02_to_wgs84_exact([s['lng'] for s in spots], [s['lat'] for s in spots])
+        for spot, x, y in zip(spots, wlng.tolist(), wlat.tolist()):
+            spot['wgs84'] = (x, y)
+    by_city = {}
+    for spot in spots:
+        by_city.setdefault(spot['city'], []).append(spot)
+    for members in by_city.values():
+        members.sort(key=lambda s: str(s['id']))
+    return by_city, strategies
+
+
+def spot_set_hash(members, k):
+    """Changes whenever a spot joins, leaves or moves, or the neighbour count changes."""
+    key = [VERSION, k] + [[str(s['id']), round(s['lng'], 7), round(s['lat'], 7)] for s in members]
+    return hashlib.sha1(json.dumps(key, separators=(',', ':')).encode('utf-8')).hexdigest()[:16]
+
+
+def resolve(names, members):
+    """Spots for a strategy's spot names (name, then cnName); names that match nothing are returned apart."""
+    by_name = {}
+    for spot in members:
+        for name in (spot['name'], spot['cnName']):
+            if name:
+                by_name.setdefault(name, spot)
+    found, missing = [], []
+    for name in names:
+        spot = by_name.get(name)
+        if spot is None:
+            missing.append(name)
+        elif spot not in found:
+            found.append(spot)
+    return found, missing
+
+
+# --- build ---
+
+def _read(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_atomic(path, data):
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp, path)
+
+
+def build_city(city, members, strategies, previous, k):
+    """One city's file; neighbour lists and itineraries come from `previous` when their hashes still match."""
+    digest = spot_set_hash(members, k)
+    result = {'v': VERSION, 'city': city, 'hash': digest, 'k': k, 'nearby': {}, 'itineraries': {}}
+    reused = previous is not None and previous.get('hash') == digest
+    if reused:
+        result['nearby'] = previous['nearby']
+    elif len(members) > 1:
+        lng = np.array([s['wgs84'][0] for s in members])
+        lat = np.array([s['wgs84'][1] for s in members])
+        indices, distances = nearest_neighbours(lng, lat, k)
+        for spot, row, metres in zip(members, indices.tolist(), distances.tolist()):
+            result['nearby'][str(spot['id'])] = [[members[j]['id'], round(m)] for j, m in zip(row, metres)]
+
+    old = (previous or {}).get('itineraries', {})
+    for strategy in strategies:
+        key = hashlib.sha1(json.dumps([digest, strategy['spots']], ensure_ascii=False).encode('utf-8')).hexdigest()[:16]
+        cached = old.get(str(strategy['id']))
+        if cached and cached.get('hash') == key:
+            result['itineraries'][str(strategy['id'])] = cached
+            continue
+        stops, missing = resolve(strategy['spots'], members)
+        entry = {'hash': key, 'order': [s['id'] for s in stops], 'legs': [], 'total': 0, 'listed': 0,
+                 'unresolved': missing}
+        if len(stops) > 1:
+            order, legs, listed = itinerary(np.array([s['wgs84'][0] for s in stops]),
+                                            np.array([s['wgs84'][1] for s in stops]))
+            entry.update(order=[stops[i]['id'] for i in order], legs=[round(m) for m in legs],
+                         total=round(sum(legs)), listed=round(listed))
+        result['itineraries'][str(strategy['id'])] = entry
+    return result, reused
+
+
+def _home(strategy, by_city):
+    """A strategy's city, or for one without, the city holding most of its spots."""
+    if strategy['city'] in by_city:
+        return strategy['city']
+    names = set(strategy['spots'])
+    counts = {city: sum(1 for s in members if s['name'] in names or s['cnName'] in names)
+              for city, members in by_city.items()}
+    best = max(counts, key=counts.get, default=None)
+    return best if best is not None and counts[best] else None
+
+
+def build(by_city, strategies, cities, output, k=NEIGHBOURS, force=False):
+    os.makedirs(output, exist_ok=True)
+    index_path = os.path.join(output, 'index.json')
+    previous_index = _read(index_path)
+    if previous_index is None and os.listdir(output):
+        raise ValueError(f"{output} is not empty and holds no previous build; refusing to write into it")
+    homes = {}
+    for strategy in strategies:
+        homes.setdefault(_home(strategy, by_city), []).append(strategy)
+
+    index = {'v': VERSION, 'k': k, 'cities': {}}
+    stats = []
+    for city, members in sorted(by_city.items()):
+        file = f'{city_key(city, cities)}.json'
+        path = os.path.join(output, file)
+        previous = None if force else _read(path)
+        if previous is not None and previous.get('v') != VERSION:
+            previous = None
+        started = time.perf_counter()
+        result, reused = build_city(city, members, homes.get(city, []), previous, k)
+        if result != previous:
+            _write_atomic(path, result)
+        index['cities'][city] = {'file': file, 'hash': result['hash'], 'spots': len(members)}
+        stats.append((city, file, len(members), reused, time.perf_counter() - started, result['itineraries']))
+
+    # Drop files of cities that no longer have spots; only ever files an earlier build listed
+    for info in (previous_index or {}).get('cities', {}).values():
+        if info['file'] not in {c['file'] for c in index['cities'].values()}:
+            try:
+                os.remove(os.path.join(output, info['file']))
+            except FileNotFoundError:
+                pass
+    _write_atomic(index_path, index)
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Precompute nearest spots and strategy itineraries per city.')
+    parser.add_argument('source', nargs='?', default=DEFAULT_DB, help='SQLite database or backup.json')
+    parser.add_argument('-o', '--output', default=DEFAULT_OUT, help='directory of per-city JSON files')
+    parser.add_argument('-k', type=int, default=NEIGHBOURS, help='neighbours kept per spot')
+    parser.add_argument('--force', action='store_true', help='recompute even where the cached hash matches')
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.source):
+        print(f"Error: {args.source} does not exist")
+        return 1
+    if args.k < 1:
+        print("Error: -k must be at least 1")
+        return 1
+    started = time.perf_counter()
+    by_city, strategies = load(args.source)
+    cities = {}
+    for type_, row in load_rows(args.source):
+        if type_ == 'city':
+            cities[row['name']] = row['id']
+    try:
+        stats = build(by_city, strategies, cities, args.output, args.k, args.force)
+    except (ValueError, OSError) as e:
+        print(f"Error: {e}")
+        return 1
+    for city, file, count, reused, elapsed, itineraries in stats:
+        state = 'unchanged' if reused else f'computed in {elapsed * 1000:.0f} ms'
+        print(f"  {city} ({file}): {count} spots, neighbours {state}")
+        for id, entry in itineraries.items():
+            saved = entry['listed'] - entry['total']
+            line = f"    strategy {id}: {len(entry['order'])} stops, {entry['total'] / 1000:.1f} km"
+            if saved > 0:
+                line += f" ({saved / 1000:.1f} km shorter than as listed)"
+            if entry['unresolved']:
+                line += f"; not found: {', '.join(entry['unresolved'])}"
+            print(line)
+    print(f"Wrote {len(stats)} cities to {os.path.relpath(args.output)} in {time.perf_counter() - started:.2f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
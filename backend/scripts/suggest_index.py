@@ -0,0 +1,279 @@
+import argparse
+import gzip
+import json
+import os
+import re
+import shutil
+import sys
+import time
+import unicodedata
+
+from cluster_tiles import city_key
+from search_index import load_rows
+
+try:
+    from pypinyin import lazy_pinyin
+except ImportError:
+    lazy_pinyin = None
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DB = os.path.join(BACKEND_DIR, 'prisma', 'dev.db')
+DEFAULT_OUT = os.path.join(BACKEND_DIR, '..', 'frontend', 'public', 'suggest')
+VERSION = 1
+
+# Keys are cut to this many characters after decomposition; the client cuts queries the same way
+MAX_KEY = 32
+
+# Hangul syllables decompose into the compatibility jamo a keyboard types,
+# with compound vowels and finals split, so every intermediate IME state
+# (고 -> 과, 다 -> 당 -> 다오) is a prefix of the finished word
+CHO = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+JUNG = ['ㅏ', 'ㅐ', 'ㅑ', 'ㅒ', 'ㅓ', 'ㅔ', 'ㅕ', 'ㅖ', 'ㅗ', 'ㅗㅏ', 'ㅗㅐ', 'ㅗㅣ', 'ㅛ', 'ㅜ', 'ㅜㅓ', 'ㅜㅔ',
+        'ㅜㅣ', 'ㅠ', 'ㅡ', 'ㅡㅣ', 'ㅣ']
+JONG = ['', 'ㄱ', 'ㄲ', 'ㄱㅅ', 'ㄴ', 'ㄴㅈ', 'ㄴㅎ', 'ㄷ', 'ㄹ', 'ㄹㄱ', 'ㄹㅁ', 'ㄹㅂ', 'ㄹㅅ', 'ㄹㅌ', 'ㄹㅍ', 'ㄹㅎ',
+        'ㅁ', 'ㅂ', 'ㅂㅅ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ']
+COMPOUND = dict(zip('ㄳㄵㄶㄺㄻㄼㄽㄾㄿㅀㅄㅘㅙㅚㅝㅞㅟㅢ',
+                    ['ㄱㅅ', 'ㄴㅈ', 'ㄴㅎ', 'ㄹㄱ', 'ㄹㅁ', 'ㄹㅂ', 'ㄹㅅ', 'ㄹㅌ', 'ㄹㅍ', 'ㄹㅎ', 'ㅂㅅ',
+                     'ㅗㅏ', 'ㅗㅐ', 'ㅗㅣ', 'ㅜㅓ', 'ㅜㅔ', 'ㅜㅣ', 'ㅡㅣ']))
+# NFKC turns typed compatibility jamo into conjoining jamo; these turn them back
+CONJOINING = {**{chr(0x1100 + i): c for i, c in enumerate(CHO)},
+              **{chr(0x1161 + i): v for i, v in enumerate(JUNG)},
+              **{chr(0x11A8 + i): t for i, t in enumerate(JONG[1:])}}
+
+TYPES = ['city', 'spot', 'guide', 'strategy']
+_WORD = re.compile(r'[^\W_]+')
+
+
+def _is_hangul(c):
+    return '가' <= c <= '힣'
+
+
+def _is_han(c):
+    return '一' <= c <= '鿿' or '㐀' <= c <= '䶿'
+
+
+def decompose(text):
+    out = []
+    for c in text:
+        if _is_hangul(c):
+            s = ord(c) - 0xAC00
+            out.append(CHO[s // 588] + JUNG[s % 588 // 28] + JONG[s % 28])
+        else:
+            c = CONJOINING.get(c, c)
+            out.append(COMPOUND.get(c, c))
+    return ''.join(out)
+
+
+def normalize(text):
+    """The form keys and queries are compared in: NFKC, lower case, letters and digits only, Hangul as jamo.
+
+    Mirrored by normalizeKey in frontend/src/utils/suggest.ts.
+    """
+    text = unicodedata.normalize('NFKC', text or '').lower()
+    return decompose(''.join(_WORD.findall(text)))[:MAX_KEY]
+
+
+def _starts(text):
+    """Offsets a match may begin at inside one word: each Chinese or Hangul character and each digit/letter switch."""
+    return [j for j in range(1, len(text))
+            if _is_han(text[j]) or _is_hangul(text[j]) or text[j].isdigit() != text[j - 1].isdigit()]
+
+
+def keys(text):
+    """Every key a name should be found under, mapped to whether it starts inside the name.
+
+    The whole name, then the rest of it from each later word and each
+    Chinese or Hangul character, so 맥주 finds 칭다오 맥주 박물관 and 啤酒
+    finds 青岛啤酒博物馆. Hangul names add their initial consonants (ㅊㄷㅇ),
+    Chinese names their pinyin in full and as initials (qingdao, qd) when
+    pypinyin is installed.
+    """
+    words = _WORD.findall(unicodedata.normalize('NFKC', text or '').lower())
+    found = {}
+
+    def add(key, inner):
+        if key:
+            found[key] = found.get(key, True) and inner
+
+    for i in range(len(words)):
+        rest = ''.join(words[i:])
+        add(normalize(rest), i > 0)
+        for j in _starts(words[i]):
+            add(normalize(rest[j:]), True)
+        initials = ''.join(CHO[(ord(c) - 0xAC00) // 588] for c in rest if _is_hangul(c))
+        if len(initials) > 1:
+            add(initials[:MAX_KEY], i > 0)
+    if lazy_pinyin is not None:
+        han = ''.join(c for c in ''.join(words) if _is_han(c))
+        if han:
+            syllables = lazy_pinyin(han)
+            for i in range(len(syllables)):
+                add(''.join(syllables[i:])[:MAX_KEY], i > 0)
+            if len(syllables) > 1:
+                add(''.join(s[0] for s in syllables), False)
+    return found
+
+
+# --- loading ---
+
+def _list(value):
+    if isinstance(value, list):
+        return value
+    try:
+        value = json.loads(value or '[]')
+    except ValueError:
+        return []
+    return value if isinstance(value, list) else []
+
+
+def load_entries(source):
+    """One entry per suggestible row: display fields, the names it is found under, and where it belongs."""
+    entries = []
+    for type_, row in load_rows(source):
+        if type_ == 'spot':
+            names = [row.get('name'), row.get('cnName')]
+            label, sub, cities = row.get('name'), row.get('cnName'), [row.get('city')]
+        elif type_ == 'city':
+            names = [row.get('name'), row.get('nameEn'), row.get('nameKo')]
+            label, sub, cities = row.get('nameKo') or row.get('name'), row.get('name'), None
+        elif type_ == 'guide':
+            names = [row.get('name')]
+            label, sub = row.get('name'), row.get('title')
+            cities = None if row.get('isGlobal') else _list(row.get('cities'))
+        else:
+            names = [row.get('title')]
+            label, sub = row.get('title'), row.get('city')
+            cities = [row['city']] if row.get('city') else None
+        found = {}
+        for name in names:
+            for key, inner in keys(name).items():
+                found[key] = found.get(key, True) and inner
+        if not found or not label:
+            continue
+        entries.append({
+            'item': [type_, row['id'], label.strip(), sub.strip() if isinstance(sub, str) and sub.strip() else None],
+            'keys': found,
+            # None means every city's shard
+            'cities': cities,
+            # Cities have no isTop/rank and are few; a matching city always comes first
+            'order': (type_ != 'city', not row.get('isTop'), row.get('rank', 99) if row.get('rank') is not None else 99,
+                      -(row.get('viewCount') or 0), TYPES.index(type_), label),
+        })
+    entries.sort(key=lambda e: e['order'])
+    return entries
+
+
+# --- shards ---
+
+def _js_order(key):
+    # The client bisects with JS string comparison, which orders UTF-16 code units
+    return key.encode('utf-16-be')
+
+
+def shard(entries):
+    """Items best first, and (key, ref) pairs sorted by key.
+
+    Item order is the ranking (cities, then isTop, rank and viewCount), so the
+    client ranks matches by their smallest index without any scores. A ref
+    is the item index times two, plus one when the key starts inside the
+    name, so matches at the start of a name can be put first.
+    """
+    pairs = sorted(((key, i * 2 + inner) for i, entry in enumerate(entries) for key, inner in entry['keys'].items()),
+                   key=lambda pair: (_js_order(pair[0]), pair[1]))
+    return {'v': VERSION, 'items': [e['item'] for e in entries],
+            'keys': [key for key, _ in pairs], 'refs': [i for _, i in pairs]}
+
+
+def search(data, query, limit=8):
+    """Same lookup as the client: bisect to the first key >= query, walk while keys start with it."""
+    q = normalize(query)
+    if not q:
+        return []
+    keys_ = data['keys']
+    target = _js_order(q)
+    lo, hi = 0, len(keys_)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if _js_order(keys_[mid]) < target:
+            lo = mid + 1
+        else:
+            hi = mid
+    # Whole name first, then names starting with the query, then matches inside a name
+    best = {}
+    while lo < len(keys_) and keys_[lo].startswith(q):
+        ref = data['refs'][lo]
+        kind = 2 if ref & 1 else 0 if keys_[lo] == q else 1
+        best[ref >> 1] = min(kind, best.get(ref >> 1, 2))
+        lo += 1
+    ranked = sorted(best, key=lambda i: (best[i], i))
+    return [data['items'][i] for i in ranked[:limit]]
+
+
+def _write(path, data):
+    text = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    body = text.encode('utf-8')
+    return len(body), len(gzip.compress(body))
+
+
+def build(entries, cities, output):
+    """One shard per city (its spots, guides and strategies, plus every city and global entry) and all.json."""
+    if os.path.isdir(output):
+        if os.listdir(output) and not os.path.exists(os.path.join(output, 'index.json')):
+            raise ValueError(f"{output} is not empty and holds no previous build; refusing to replace it")
+        shutil.rmtree(output)
+    os.makedirs(output)
+    names = sorted({c for e in entries for c in e['cities'] or () if c})
+    index = {'v': VERSION, 'all': 'all.json', 'cities': {}}
+    stats = {'all.json': (len(entries),) + _write(os.path.join(output, 'all.json'), shard(entries))}
+    for name in names:
+        members = [e for e in entries if e['cities'] is None or name in e['cities']]
+        file = f'{city_key(name, cities)}.json'
+        stats[file] = (len(members),) + _write(os.path.join(output, file), shard(members))
+        index['cities'][name] = file
+    with open(os.path.join(output, 'index.json'), 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, separators=(',', ':'))
+    return index, stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build the static prefix shards behind search-as-you-type.')
+    parser.add_argument('source', nargs='?', default=DEFAULT_DB, help='SQLite database or backup.json')
+    parser.add_argument('-o', '--output', default=DEFAULT_OUT, help='shard directory (replaced on each build)')
+    parser.add_argument('--try', dest='queries', action='append', default=[], metavar='QUERY',
+                        help='print the suggestions all.json gives for QUERY (repeatable)')
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.source):
+        print(f"Error: {args.source} does not exist")
+        return 1
+    if lazy_pinyin is None:
+        print("Note: pypinyin is not installed; Chinese names get no pinyin keys")
+    started = time.perf_counter()
+    entries = load_entries(args.source)
+    # City items carry the Chinese name as their subtitle
+    cities = {e['item'][3]: e['item'][1] for e in entries if e['item'][0] == 'city'}
+    try:
+        index, stats = build(entries, cities, args.output)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    labels = {file: name for name, file in index['cities'].items()}
+    for file, (items, size, packed) in stats.items():
+        print(f"  {file:<14} {labels.get(file, '(all)')}: {items} items, {size / 1024:.1f} KB ({packed / 1024:.1f} KB gzip)")
+    print(f"Wrote {len(stats)} shards to {os.path.relpath(args.output)} in {time.perf_counter() - started:.2f}s")
+
+    if args.queries:
+        with open(os.path.join(args.output, 'all.json'), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        for query in args.queries:
+            started = time.perf_counter()
+            found = search(data, query)
+            elapsed = (time.perf_counter() - started) * 1000
+            print(f"{query!r} ({elapsed:.2f} ms): " + ', '.join(f"{item[2]} [{item[0]}]" for item in found))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,2 @@
+from .client import Client, HttpError, Response
+from .stats import EndpointStats, Histogram
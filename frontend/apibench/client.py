@@ -0,0 +1,207 @@
+import asyncio
+import gzip
+import json
+import time
+import zlib
+from urllib.parse import urlsplit
+
+DEFAULT_URL = 'http://localhost:3000'
+
+
+class HttpError(Exception):
+    pass
+
+
+class Response:
+    __slots__ = ('status', 'headers', 'body', 'wire_bytes', 'elapsed')
+
+    def __init__(self, status, headers, body, wire_bytes, elapsed):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.wire_bytes = wire_bytes
+        self.elapsed = elapsed
+
+    @property
+    def ok(self):
+        return 200 <= self.status < 300
+
+    def json(self):
+        return json.loads(self.body.decode('utf-8')) if self.body else None
+
+
+def _decode(body, encoding):
+    if encoding == 'gzip':
+        return gzip.decompress(body)
+    if encoding == 'deflate':
+        return zlib.decompress(body)
+    if encoding == 'br':
+        import brotli
+        return brotli.decompress(body)
+    return body
+
+
+class Connection:
+    """One keep-alive HTTP/1.1 connection."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.reusable = True
+
+    @classmethod
+    async def open(cls, host, port):
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def request(self, host, method, path, body=None, headers=None):
+        lines = [f'{method} {path} HTTP/1.1', f'Host: {host}', 'Accept-Encoding: gzip, deflate',
+                 'Connection: keep-alive']
+        for name, value in (headers or {}).items():
+            lines.append(f'{name}: {value}')
+        if body is not None:
+            lines.append(f'Content-Length: {len(body)}')
+        self.writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + (body or b''))
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionResetError('Connection closed by server')
+        parts = status_line.decode('latin-1').split(' ', 2)
+        if len(parts) < 2 or not parts[0].startswith('HTTP/'):
+            raise HttpError(f'Bad status line {status_line!r}')
+        status = int(parts[1])
+        response_headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            response_headers[name.strip().lower()] = value.strip()
+
+        if method == 'HEAD' or status in (204, 304) or 100 <= status < 200:
+            raw = b''
+        elif response_headers.get('transfer-encoding', '').lower() == 'chunked':
+            raw = await self._read_chunked()
+        elif 'content-length' in response_headers:
+            raw = await self.reader.readexactly(int(response_headers['content-length']))
+        else:
+            raw = await self.reader.read()
+            self.reusable = False
+        if response_headers.get('connection', '').lower() == 'close':
+            self.reusable = False
+        return status, response_headers, raw
+
+    async def _read_chunked(self):
+        chunks = []
+        while True:
+            size = int((await self.reader.readline()).split(b';')[0].strip() or b'0', 16)
+            if size == 0:
+                # Trailers end with an empty line
+                while (await self.reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass
+                return b''.join(chunks)
+            chunks.append(await self.reader.readexactly(size))
+            await self.reader.readline()
+
+    def close(self):
+        self.reusable = False
+        self.writer.close()
+
+
+class Client:
+    """Pooled keep-alive client for the NestJS API.
+
+    At most max_connections sockets are open at once; idle ones are reused
+    most-recently-used first so a warm pool stays small. Every completed
+    request is passed to the observers, which is how recording hooks in.
+    """
+
+    def __init__(self, base_url=DEFAULT_URL, max_connections=64, timeout=30.0):
+        parts = urlsplit(base_url)
+        if parts.scheme != 'http':
+            raise ValueError(f'Only http:// URLs are supported, got {base_url}')
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.host_header = parts.netloc
+        self.prefix = parts.path.rstrip('/')
+        self.timeout = timeout
+        self.observers = []
+        self.connections_opened = 0
+        self._idle = []
+        self._slots = asyncio.Semaphore(max_connections)
+
+    async def _acquire(self):
+        await self._slots.acquire()
+        while self._idle:
+            conn = self._idle.pop()
+            if not conn.reader.at_eof():
+                return conn, True
+            conn.close()
+        try:
+            conn = await Connection.open(self.host, self.port)
+        except BaseException:
+            self._slots.release()
+            raise
+        self.connections_opened += 1
+        return conn, False
+
+    def _release(self, conn):
+        if conn.reusable:
+            self._idle.append(conn)
+        else:
+            conn.close()
+        self._slots.release()
+
+    async def request(self, method, path, json_body=None, headers=None):
+        body = None
+        headers = dict(headers or {})
+        if json_body is not None:
+            body = json.dumps(json_body).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+        start = time.perf_counter()
+        conn, reused = await self._acquire()
+        try:
+            try:
+                status, response_headers, raw = await asyncio.wait_for(
+                    conn.request(self.host_header, method, self.prefix + path, body, headers), self.timeout)
+            except (ConnectionResetError, asyncio.IncompleteReadError, BrokenPipeError):
+                if not reused:
+                    raise
+                # The server dropped an idle keep-alive socket; retry once on a fresh one
+                conn.close()
+                conn = await Connection.open(self.host, self.port)
+                self.connections_opened += 1
+                status, response_headers, raw = await asyncio.wait_for(
+                    conn.request(self.host_header, method, self.prefix + path, body, headers), self.timeout)
+        except BaseException:
+            conn.close()
+            self._release(conn)
+            raise
+        self._release(conn)
+        response = Response(status, response_headers, _decode(raw, response_headers.get('content-encoding')),
+                            len(raw), time.perf_counter() - start)
+        for observer in self.observers:
+            observer(method, path, json_body, response, start)
+        return response
+
+    async def get(self, path, **kwargs):
+        return await self.request('GET', path, **kwargs)
+
+    async def post(self, path, json_body=None, **kwargs):
+        return await self.request('POST', path, json_body, **kwargs)
+
+    async def close(self):
+        while self._idle:
+            conn = self._idle.pop()
+            conn.close()
+            try:
+                await conn.writer.wait_closed()
+            except OSError:
+                pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
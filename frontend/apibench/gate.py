@@ -0,0 +1,186 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+from .client import DEFAULT_URL, Client
+from .replay import STARTUP_BURST, endpoint
+from .server import BACKEND_DIR, FRONTEND_DIR, running
+from .stats import EndpointStats
+
+DEFAULT_BASELINE = os.path.join(FRONTEND_DIR, 'api-baseline.json')
+BASELINE_VERSION = 1
+DETAIL_SPOTS = 5
+
+
+def _commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=FRONTEND_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def scenario(client):
+    """The fixed request list: the startup burst, then detail views of the first spots."""
+    response = await client.get('/spots')
+    spots = response.json() if response.ok else []
+    paths = list(STARTUP_BURST)
+    for spot in (spots or [])[:DETAIL_SPOTS]:
+        paths += [f"/spots/{spot['id']}", f"/reviews/spot/{spot['id']}"]
+    paths.append('/favorites?userId=1')
+    return paths
+
+
+async def measure(url, rounds=20, concurrency=4, warmup=2):
+    """Run the scenario `rounds` times; returns {endpoint: summary with wire and body bytes}."""
+    stats = {}
+    body_bytes = {}
+    async with Client(url, max_connections=concurrency) as client:
+        paths = await scenario(client)
+        queue = asyncio.Queue()
+        for n in range(warmup + rounds):
+            for path in paths:
+                queue.put_nowait((n >= warmup, path))
+
+        async def worker():
+            while not queue.empty():
+                recorded, path = queue.get_nowait()
+                response = await client.get(path)
+                if recorded:
+                    name = endpoint('GET', path)
+                    stats.setdefault(name, EndpointStats()).record(response.elapsed, response.status,
+                                                                   response.wire_bytes)
+                    body_bytes[name] = body_bytes.get(name, 0) + len(response.body)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    results = {}
+    for name, endpoint_stats in sorted(stats.items()):
+        s = endpoint_stats.summary()
+        results[name] = {
+            'count': s['count'], 'errors': s['errors'],
+            'p50': s['p50'], 'p95': s['p95'], 'p99': s['p99'],
+            'wire_bytes': round(s['avg_bytes']),
+            'body_bytes': round(body_bytes[name] / s['count']),
+        }
+    return results
+
+
+async def measure_stand_in(source, rounds, concurrency, warmup):
+    async with running(source) as url:
+        return await measure(url, rounds, concurrency, warmup)
+
+
+def compare(baseline, current, latency_threshold=1.25, bytes_threshold=1.10, min_delta_ms=2.0):
+    """Readable diff lines plus the list of regressions."""
+    lines = [f"{'endpoint':<30} {'p95 base':>9} {'p95 now':>9} {'ratio':>6}   {'bytes base':>10} {'bytes now':>10} {'ratio':>6}"]
+    regressions = []
+    for name, now in current.items():
+        base = baseline.get(name)
+        if base is None:
+            lines.append(f"{name:<30} {'':>9} {now['p95'] * 1000:>9.1f} {'new':>6}   {'':>10} {now['body_bytes']:>10} {'new':>6}")
+            continue
+        p95_ratio = now['p95'] / base['p95'] if base['p95'] else 1.0
+        bytes_ratio = now['body_bytes'] / base['body_bytes'] if base['body_bytes'] else (1.0 if not now['body_bytes'] else float('inf'))
+        flags = []
+        # Sub-millisecond endpoints double on noise alone, so demand an absolute change too
+        if p95_ratio > latency_threshold and (now['p95'] - base['p95']) * 1000 > min_delta_ms:
+            flags.append('latency')
+            regressions.append((name, 'p95', base['p95'], now['p95']))
+        if bytes_ratio > bytes_threshold:
+            flags.append('bytes')
+            regressions.append((name, 'body_bytes', base['body_bytes'], now['body_bytes']))
+        if now['errors'] > base.get('errors', 0):
+            flags.append('errors')
+            regressions.append((name, 'errors', base.get('errors', 0), now['errors']))
+        lines.append(f"{name:<30} {base['p95'] * 1000:>9.1f} {now['p95'] * 1000:>9.1f} {p95_ratio:>6.2f}   "
+                     f"{base['body_bytes']:>10} {now['body_bytes']:>10} {bytes_ratio:>6.2f}"
+                     + ('  REGRESSION: ' + ', '.join(flags) if flags else ''))
+    for name in baseline:
+        if name not in current:
+            lines.append(f"{name:<30} missing from this run")
+    return lines, regressions
+
+
+def load_baseline(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if data.get('version') != BASELINE_VERSION:
+        raise ValueError(f"{path} has baseline version {data.get('version')}, expected {BASELINE_VERSION}")
+    return data
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Fail when API latency or payload size regresses against a baseline.')
+    parser.add_argument('--url', default=DEFAULT_URL, help='backend to measure')
+    parser.add_argument('--stand-in', metavar='SOURCE', help='measure the stand-in server on backup.json or a .db instead')
+    parser.add_argument('--seed-cmd', help='command run in backend/ first to reseed, e.g. "npx prisma db seed"')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='baseline JSON file')
+    parser.add_argument('--update', action='store_true', help='write this run as the new baseline')
+    parser.add_argument('--rounds', type=int, default=20, help='measured passes over the scenario')
+    parser.add_argument('--warmup', type=int, default=2, help='unmeasured passes first')
+    parser.add_argument('-c', '--concurrency', type=int, default=4)
+    parser.add_argument('--latency-threshold', type=float, default=1.25, help='p95 ratio that fails the gate')
+    parser.add_argument('--bytes-threshold', type=float, default=1.10, help='response size ratio that fails the gate')
+    parser.add_argument('--min-delta-ms', type=float, default=2.0, help='ignore p95 changes smaller than this')
+    args = parser.parse_args(argv)
+
+    if not args.update and not os.path.exists(args.baseline):
+        print(f"Error: no baseline found at {os.path.relpath(args.baseline)}; run with --update to record one")
+        return 1
+
+    if args.seed_cmd:
+        print(f"Seeding: {args.seed_cmd}")
+        if subprocess.run(args.seed_cmd, shell=True, cwd=BACKEND_DIR).returncode != 0:
+            print("Error: seed command failed")
+            return 1
+
+    started = time.perf_counter()
+    try:
+        if args.stand_in:
+            current = asyncio.run(measure_stand_in(args.stand_in, args.rounds, args.concurrency, args.warmup))
+        else:
+            current = asyncio.run(measure(args.url, args.rounds, args.concurrency, args.warmup))
+    except OSError as e:
+        print(f"Error: cannot reach the backend: {e}")
+        return 1
+    print(f"Measured {len(current)} endpoints in {time.perf_counter() - started:.1f}s")
+
+    if args.update:
+        data = {'version': BASELINE_VERSION, 'commit': _commit(), 'python': platform.python_version(),
+                'target': args.stand_in or args.url, 'rounds': args.rounds, 'concurrency': args.concurrency,
+                'endpoints': current}
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"Baseline written to {os.path.relpath(args.baseline)}")
+        return 0
+
+    try:
+        baseline = load_baseline(args.baseline)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    lines, regressions = compare(baseline['endpoints'], current, args.latency_threshold,
+                                 args.bytes_threshold, args.min_delta_ms)
+    print(f"Against baseline from {baseline.get('commit') or 'unknown commit'} ({baseline.get('target')}):")
+    print('\n'.join(lines))
+    if regressions:
+        print(f"\n{len(regressions)} regression(s):")
+        for name, metric, base, now in regressions:
+            if metric == 'p95':
+                print(f"  {name}: p95 {base * 1000:.1f} ms -> {now * 1000:.1f} ms")
+            else:
+                print(f"  {name}: {metric} {base} -> {now}")
+        return 1
+    print("\nNo regressions")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,173 @@
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import namedtuple
+
+from .client import DEFAULT_URL, Client
+from .stats import EndpointStats, format_table
+
+# path may contain {id}, filled from the id pool for each request
+Scenario = namedtuple('Scenario', 'name weight method path body')
+
+# Roughly what a map session does: the list endpoints DataContext loads,
+# plus POI detail reviews and favorites as people browse
+SCENARIOS = [
+    Scenario('GET /spots', 25, 'GET', '/spots', None),
+    Scenario('GET /guides', 10, 'GET', '/guides', None),
+    Scenario('GET /strategies', 10, 'GET', '/strategies', None),
+    Scenario('GET /cities', 15, 'GET', '/cities', None),
+    Scenario('GET /ads', 5, 'GET', '/ads', None),
+    Scenario('GET /favorites', 10, 'GET', '/favorites?userId={id}', None),
+    Scenario('GET /reviews/poi/:id', 25, 'GET', '/reviews/poi/{id}', None),
+]
+
+
+def parse_weights(specs, scenarios=SCENARIOS):
+    """Apply NAME=WEIGHT overrides, matching on the path; weight 0 drops the scenario."""
+    weights = {}
+    for spec in specs:
+        name, _, weight = spec.rpartition('=')
+        if not name:
+            raise ValueError(f"Expected ENDPOINT=WEIGHT, got {spec!r}")
+        weights[name] = float(weight)
+    chosen = []
+    for scenario in scenarios:
+        short = scenario.path.split('?')[0]
+        weight = next((w for name, w in weights.items() if name in (scenario.name, short, short.split('/')[1])), scenario.weight)
+        if weight > 0:
+            chosen.append(scenario._replace(weight=weight))
+    if not chosen:
+        raise ValueError("No scenarios left to run")
+    return chosen
+
+
+def parse_ids(spec):
+    ids = []
+    for part in spec.split(','):
+        lo, _, hi = part.partition('-')
+        ids.extend(range(int(lo), int(hi) + 1) if hi else [int(lo)])
+    return ids
+
+
+class LoadRun:
+    """Weighted scenario mix against one client.
+
+    Closed loop: `concurrency` workers each issue requests back to back.
+    Open loop: requests are scheduled at `rate` per second regardless of how
+    fast responses come back, with at most `concurrency` in flight; latency
+    is measured from the scheduled start so a stalled server cannot hide
+    its queueing delay.
+    """
+
+    def __init__(self, client, scenarios=SCENARIOS, ids=range(1, 21), seed=None):
+        self.client = client
+        self.scenarios = list(scenarios)
+        self.weights = [s.weight for s in self.scenarios]
+        self.ids = list(ids)
+        self.random = random.Random(seed)
+        self.stats = {s.name: EndpointStats() for s in self.scenarios}
+
+    def _pick(self):
+        scenario = self.random.choices(self.scenarios, self.weights)[0]
+        return scenario, scenario.path.replace('{id}', str(self.random.choice(self.ids)))
+
+    async def _issue(self, scenario, path, started):
+        try:
+            response = await self.client.request(scenario.method, path, scenario.body)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+            self.stats[scenario.name].record(time.perf_counter() - started)
+            return
+        self.stats[scenario.name].record(time.perf_counter() - started, response.status, response.wire_bytes)
+
+    async def closed_loop(self, concurrency, duration):
+        deadline = time.perf_counter() + duration
+
+        async def worker():
+            while time.perf_counter() < deadline:
+                scenario, path = self._pick()
+                await self._issue(scenario, path, time.perf_counter())
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    async def open_loop(self, rate, concurrency, duration, poisson=False):
+        slots = asyncio.Semaphore(concurrency)
+        start = time.perf_counter()
+        tasks = []
+        next_at = start
+
+        async def one(scenario, path, scheduled):
+            async with slots:
+                await self._issue(scenario, path, scheduled)
+
+        while next_at < start + duration:
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            scenario, path = self._pick()
+            tasks.append(asyncio.ensure_future(one(scenario, path, next_at)))
+            next_at += self.random.expovariate(rate) if poisson else 1.0 / rate
+        await asyncio.gather(*tasks)
+
+    def report(self, elapsed):
+        summaries = {name: stats.summary(elapsed) for name, stats in self.stats.items() if stats.latency.count}
+        total = EndpointStats()
+        for stats in self.stats.values():
+            total.merge(stats)
+        summaries['total'] = total.summary(elapsed)
+        return summaries
+
+
+async def run_load(url=DEFAULT_URL, scenarios=SCENARIOS, concurrency=10, duration=10.0, rate=None,
+                   poisson=False, ids=range(1, 21), warmup=0.0, seed=None):
+    async with Client(url, max_connections=concurrency) as client:
+        if warmup:
+            await LoadRun(client, scenarios, ids, seed).closed_loop(concurrency, warmup)
+        run = LoadRun(client, scenarios, ids, seed)
+        start = time.perf_counter()
+        if rate:
+            await run.open_loop(rate, concurrency, duration, poisson)
+        else:
+            await run.closed_loop(concurrency, duration)
+        elapsed = time.perf_counter() - start
+        return run.report(elapsed), {'elapsed': elapsed, 'connections': client.connections_opened}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate weighted load against the TravelMap API.')
+    parser.add_argument('--url', default=DEFAULT_URL, help='API base URL')
+    parser.add_argument('-c', '--concurrency', type=int, default=10, help='workers (closed loop) or max in flight (open loop)')
+    parser.add_argument('-d', '--duration', type=float, default=10.0, help='seconds to run')
+    parser.add_argument('-r', '--rate', type=float, default=None, help='requests per second; omit for closed loop')
+    parser.add_argument('--poisson', action='store_true', help='exponential inter-arrival times in open loop')
+    parser.add_argument('-w', '--weight', action='append', default=[], metavar='ENDPOINT=N',
+                        help='override a scenario weight, e.g. spots=50 or reviews=0')
+    parser.add_argument('--ids', default='1-20', help='ids used for {id} paths, e.g. 1-50 or 3,7,9')
+    parser.add_argument('--warmup', type=float, default=1.0, help='seconds of unrecorded warm-up')
+    parser.add_argument('--seed', type=int, default=None, help='seed for the scenario mix')
+    parser.add_argument('-o', '--output', help='write the summary as JSON')
+    args = parser.parse_args(argv)
+
+    try:
+        scenarios = parse_weights(args.weight)
+        ids = parse_ids(args.ids)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    mode = f"open loop at {args.rate:g} req/s" if args.rate else 'closed loop'
+    print(f"{args.url}: {mode}, concurrency {args.concurrency}, {args.duration:g}s")
+    summaries, info = asyncio.run(run_load(args.url, scenarios, args.concurrency, args.duration, args.rate,
+                                           args.poisson, ids, args.warmup, args.seed))
+    print(format_table(summaries))
+    print(f"{info['connections']} connections opened")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'url': args.url, 'mode': mode, 'concurrency': args.concurrency, **info,
+                       'endpoints': summaries}, f, indent=2)
+    return 1 if summaries['total']['count'] == 0 else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
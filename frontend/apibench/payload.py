@@ -0,0 +1,193 @@
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import re
+import sys
+
+from .client import DEFAULT_URL, Client
+from .server import FRONTEND_DIR, running
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+SRC_DIR = os.path.join(FRONTEND_DIR, 'src')
+
+# Components that render each list endpoint on first paint (paths under src/)
+LIST_VIEWS = {
+    '/spots': ['components/MainLayout.tsx', 'components/MapContainer.tsx', 'components/mobile/CityDrawer.tsx',
+               'components/mobile/SearchResultsDrawer.tsx'],
+    '/guides': ['components/mobile/GuideView.tsx', 'components/mobile/EnterpriseView.tsx'],
+    '/strategies': ['components/mobile/StrategyView.tsx'],
+    '/ads': ['components/mobile/AdsWidget.tsx', 'components/mobile/GuideView.tsx'],
+    '/cities': ['components/mobile/CityDrawer.tsx', 'components/mobile/FilterBar.tsx', 'components/MainLayout.tsx'],
+    '/spot-categories': ['components/MapContainer.tsx', 'components/mobile/FilterBar.tsx',
+                         'components/mobile/CityDrawer.tsx'],
+    '/strategy-categories': ['components/mobile/StrategyView.tsx'],
+}
+
+# Views opened from a list item; fields only they use could come from /<resource>/:id instead
+DETAIL_VIEWS = {
+    '/spots': ['components/mobile/PoiDetailBottomSheet.tsx', 'components/Sidebar.tsx'],
+}
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _gzip(data):
+    return len(gzip.compress(data, 6, mtime=0))
+
+
+def _brotli(data):
+    return len(brotli.compress(data, quality=5)) if brotli else None
+
+
+def referenced_fields(files, fields):
+    """Fields read as `.field`, `?.field` or `['field']` in any of the files."""
+    text = ''
+    for name in files:
+        path = os.path.join(SRC_DIR, name)
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                text += f.read()
+    found = set()
+    for field in fields:
+        escaped = re.escape(field)
+        # Generous on purpose: a fallback like `s.intro || s.content` still counts as rendered
+        if re.search(rf"\.{escaped}\b|\[['\"]{escaped}['\"]\]", text):
+            found.add(field)
+    return found
+
+
+def profile(records):
+    """Per-field and per-record byte breakdown of a JSON list response."""
+    body = _dumps(records)
+    total_gzip = _gzip(body)
+    fields = {}
+    for record in records:
+        for key, value in record.items():
+            field = fields.setdefault(key, {'bytes': 0, 'present': 0})
+            # "key":value plus the separating comma
+            field['bytes'] += len(_dumps(key)) + 1 + len(_dumps(value)) + 1
+            field['present'] += 1
+    for key, field in fields.items():
+        # Marginal cost after compression: how much smaller the gzipped list gets without this field
+        without = _dumps([{k: v for k, v in record.items() if k != key} for record in records])
+        field['gzip_saved'] = total_gzip - _gzip(without)
+        field['share'] = field['bytes'] / len(body) if body else 0.0
+    sizes = sorted(((len(_dumps(record)), record.get('id'), record.get('name') or record.get('title'))
+                    for record in records), key=lambda item: item[0], reverse=True)
+    return {
+        'records': len(records),
+        'bytes': len(body),
+        'gzip': total_gzip,
+        'brotli': _brotli(body),
+        'fields': fields,
+        'largest': [{'id': id, 'label': label, 'bytes': size} for size, id, label in sizes],
+    }
+
+
+def projection(records, keep):
+    """Sizes of the list if it carried only the `keep` fields."""
+    body = _dumps([{k: v for k, v in record.items() if k in keep} for record in records])
+    return {'fields': sorted(keep), 'bytes': len(body), 'gzip': _gzip(body), 'brotli': _brotli(body)}
+
+
+def analyse(path, records):
+    result = profile(records)
+    fields = set(result['fields'])
+    listed = referenced_fields(LIST_VIEWS.get(path, []), fields)
+    detail = referenced_fields(DETAIL_VIEWS.get(path, []), fields) - listed
+    for name, field in result['fields'].items():
+        field['view'] = 'list' if name in listed else 'detail' if name in detail else 'unused'
+    # id is needed to open the detail view even when no list component prints it
+    result['projection'] = projection(records, listed | ({'id'} & fields)) if path in LIST_VIEWS else None
+    return result
+
+
+async def fetch(url, paths):
+    results = {}
+    async with Client(url) as client:
+        for path in paths:
+            response = await client.get(path)
+            data = response.json() if response.ok else None
+            if not isinstance(data, list):
+                print(f"Skipping {path}: status {response.status}, not a JSON list")
+                continue
+            results[path] = [record for record in data if isinstance(record, dict)]
+    return results
+
+
+async def fetch_stand_in(source, paths):
+    async with running(source) as url:
+        return await fetch(url, paths)
+
+
+def _kb(n):
+    return '-' if n is None else f"{n / 1024:.1f}K"
+
+
+def format_report(path, result, top=5):
+    lines = [f"{path}: {result['records']} records, {_kb(result['bytes'])} raw, "
+             f"{_kb(result['gzip'])} gzip, {_kb(result['brotli'])} brotli"]
+    lines.append(f"  {'field':<16} {'raw':>8} {'share':>6} {'gzip -':>8} {'present':>8}  view")
+    for name, field in sorted(result['fields'].items(), key=lambda item: item[1]['bytes'], reverse=True):
+        lines.append(f"  {name:<16} {_kb(field['bytes']):>8} {field['share'] * 100:>5.1f}% "
+                     f"{_kb(field['gzip_saved']):>8} {field['present']:>8}  {field['view']}")
+    if result['largest']:
+        lines.append('  largest records: ' + ', '.join(
+            f"{item['id']} {item['label'] or ''} ({_kb(item['bytes'])})".replace('  ', ' ')
+            for item in result['largest'][:top]))
+    proj = result['projection']
+    if proj:
+        lines.append(f"  list projection ({', '.join(proj['fields'])}): "
+                     f"{_kb(proj['bytes'])} raw, {_kb(proj['gzip'])} gzip, {_kb(proj['brotli'])} brotli "
+                     f"-> saves {_kb(result['gzip'] - proj['gzip'])} gzip "
+                     f"({(1 - proj['gzip'] / result['gzip']) * 100 if result['gzip'] else 0:.0f}%)")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Break list endpoint responses down by field and record.')
+    parser.add_argument('paths', nargs='*', help='endpoints to profile (default: every list view endpoint)')
+    parser.add_argument('--url', default=DEFAULT_URL, help='backend to profile')
+    parser.add_argument('--stand-in', metavar='SOURCE', help='profile the stand-in server on backup.json or a .db')
+    parser.add_argument('--top', type=int, default=5, help='largest records to list per endpoint')
+    parser.add_argument('-o', '--output', help='write the full breakdown as JSON')
+    args = parser.parse_args(argv)
+
+    paths = args.paths or list(LIST_VIEWS)
+    try:
+        if args.stand_in:
+            responses = asyncio.run(fetch_stand_in(args.stand_in, paths))
+        else:
+            responses = asyncio.run(fetch(args.url, paths))
+    except OSError as e:
+        print(f"Error: cannot reach the backend: {e}")
+        return 1
+    if brotli is None:
+        print("brotli is not installed; brotli sizes are omitted")
+
+    results = {path: analyse(path, records) for path, records in responses.items()}
+    for path, result in results.items():
+        print(format_report(path, result, args.top))
+        print()
+
+    listed = [r for r in results.values() if r['projection']]
+    full = sum(r['gzip'] for r in listed)
+    slim = sum(r['projection']['gzip'] for r in listed)
+    print(f"First paint: {_kb(full)} gzip now, {_kb(slim)} with list projections "
+          f"(saves {_kb(full - slim)})")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
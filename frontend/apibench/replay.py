@@ -0,0 +1,254 @@
+import argparse
+import asyncio
+import contextvars
+import json
+import random
+import re
+import sys
+import time
+from urllib.parse import urlsplit
+
+from .client import DEFAULT_URL, Client
+from .server import _read_request, _response
+from .stats import EndpointStats, format_table
+
+# Session the current task belongs to; gather() children inherit it
+SESSION = contextvars.ContextVar('session', default='main')
+
+# The requests DataContext.refreshData fires in parallel when the app opens
+STARTUP_BURST = ['/guides', '/strategies', '/strategy-categories', '/spots', '/ads', '/contact-info',
+                 '/cities', '/spot-categories']
+
+_ID_SEGMENT = re.compile(r'^(?:\d+|[A-Za-z]*\d[\w-]{5,})$')
+
+
+def endpoint(method, path):
+    """'GET /reviews/spot/:id' for 'GET /reviews/spot/23?x=1'."""
+    parts = urlsplit(path).path.split('/')
+    return method + ' ' + '/'.join(':id' if _ID_SEGMENT.match(part) else part for part in parts)
+
+
+class Recorder:
+    """Client observer that appends one NDJSON line per completed request.
+
+    Fields: s session, t start offset and d duration in seconds, m method,
+    p path, b JSON body (omitted when empty), st status, n response bytes.
+    """
+
+    def __init__(self, path):
+        # Line buffered, so a proxy stopped with a signal keeps what it saw
+        self.file = open(path, 'w', encoding='utf-8', buffering=1)
+        self.origin = time.perf_counter()
+        self.count = 0
+
+    def __call__(self, method, path, body, response, started):
+        entry = {'s': SESSION.get(), 't': round(started - self.origin, 4), 'd': round(response.elapsed, 4),
+                 'm': method, 'p': path}
+        if body is not None:
+            entry['b'] = body
+        entry['st'] = response.status
+        entry['n'] = response.wire_bytes
+        self.file.write(json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + '\n')
+        self.count += 1
+
+    def close(self):
+        self.file.close()
+
+
+def load_log(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+# --- capture ---
+
+async def startup_burst(client):
+    return await asyncio.gather(*(client.get(path) for path in STARTUP_BURST), return_exceptions=True)
+
+
+async def user_session(client, rng, user_id, think=1.0):
+    """App open, a few POI detail opens, the odd favorite toggle and review."""
+    responses = await startup_burst(client)
+    spots_response = responses[STARTUP_BURST.index('/spots')]
+    spots = []
+    if not isinstance(spots_response, BaseException) and spots_response.ok:
+        spots = spots_response.json() or []
+    for _ in range(rng.randint(1, 4)):
+        await asyncio.sleep(rng.expovariate(1 / think) if think else 0)
+        if not spots:
+            break
+        spot = rng.choice(spots)
+        await asyncio.gather(client.get(f"/spots/{spot['id']}"), client.get(f"/reviews/spot/{spot['id']}"))
+        await client.post(f"/spots/{spot['id']}/view")
+        if rng.random() < 0.3:
+            await client.post('/favorites/toggle', {
+                'userId': user_id, 'targetId': f"spot_{spot['id']}", 'type': 'poi',
+                'itemData': {'name': spot.get('name'), 'type': 'spot', 'address': spot.get('address')}})
+            await client.get(f'/favorites?userId={user_id}')
+        if rng.random() < 0.1:
+            await client.post('/reviews', {'spotId': spot['id'], 'userId': user_id, 'rating': rng.randint(3, 5),
+                                           'content': 'Recorded by apibench'})
+            await client.get(f"/reviews/spot/{spot['id']}")
+
+
+async def capture(url, output, sessions=5, stagger=2.0, think=1.0, seed=None):
+    rng = random.Random(seed)
+    recorder = Recorder(output)
+    async with Client(url) as client:
+        client.observers.append(recorder)
+
+        async def one(n):
+            SESSION.set(f'u{n}')
+            await asyncio.sleep(rng.uniform(0, stagger))
+            await user_session(client, random.Random(rng.random()), n + 1, think)
+
+        try:
+            await asyncio.gather(*(one(n) for n in range(sessions)))
+        finally:
+            recorder.close()
+    return recorder.count
+
+
+async def proxy(url, output, host='127.0.0.1', port=3001):
+    """Forward real traffic to url and record it; each client address is a session."""
+    recorder = Recorder(output)
+    client = Client(url)
+    client.observers.append(recorder)
+
+    async def handle(reader, writer):
+        SESSION.set(writer.get_extra_info('peername', ('?',))[0])
+        try:
+            while True:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, target, headers, raw = request
+                body = json.loads(raw.decode('utf-8')) if raw else None
+                response = await client.request(method, target, body)
+                writer.write(_response(response.status, response.body, headers))
+                await writer.drain()
+        except (ConnectionResetError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, host, port)
+    print(f"Recording proxy on http://{host}:{port} -> {url}, writing {output}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        recorder.close()
+        await client.close()
+
+
+# --- replay ---
+
+async def replay(entries, url=DEFAULT_URL, speed=1.0, max_connections=64):
+    """Re-issue a recording, keeping gaps (scaled by speed) and per-session ordering.
+
+    speed=None replays as fast as possible. Within a session a request waits
+    for every earlier request that had finished before it started in the
+    recording, so parallel bursts stay parallel and dependent calls stay
+    sequential.
+    """
+    sessions = {}
+    for entry in sorted(entries, key=lambda e: e['t']):
+        sessions.setdefault(entry['s'], []).append(entry)
+    stats = {}
+
+    async with Client(url, max_connections=max_connections) as client:
+        start = time.perf_counter()
+
+        async def issue(entry, after):
+            if after:
+                await asyncio.gather(*after)
+            if speed:
+                delay = start + entry['t'] / speed - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            name = endpoint(entry['m'], entry['p'])
+            began = time.perf_counter()
+            try:
+                response = await client.request(entry['m'], entry['p'], entry.get('b'))
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+                stats.setdefault(name, EndpointStats()).record(time.perf_counter() - began)
+                return
+            stats.setdefault(name, EndpointStats()).record(time.perf_counter() - began, response.status,
+                                                           response.wire_bytes)
+
+        async def run_session(items):
+            tasks = []
+            for entry in items:
+                after = [task for previous, task in zip(items, tasks) if previous['t'] + previous['d'] <= entry['t']]
+                tasks.append(asyncio.ensure_future(issue(entry, after)))
+            await asyncio.gather(*tasks)
+
+        await asyncio.gather(*(run_session(items) for items in sessions.values()))
+        elapsed = time.perf_counter() - start
+    return stats, elapsed
+
+
+def recorded_stats(entries):
+    stats = {}
+    for entry in entries:
+        stats.setdefault(endpoint(entry['m'], entry['p']), EndpointStats()).record(entry['d'], entry['st'], entry['n'])
+    return stats
+
+
+def parse_speed(value):
+    if value == 'max':
+        return None
+    speed = float(value.rstrip('x'))
+    if speed <= 0:
+        raise argparse.ArgumentTypeError('speed must be positive or "max"')
+    return speed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Record API sessions to NDJSON and replay them.')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    rec = sub.add_parser('record', help='run scripted user sessions and record them')
+    rec.add_argument('-o', '--output', default='traffic.ndjson')
+    rec.add_argument('--url', default=DEFAULT_URL)
+    rec.add_argument('-n', '--sessions', type=int, default=5, help='concurrent simulated users')
+    rec.add_argument('--stagger', type=float, default=2.0, help='seconds over which sessions start')
+    rec.add_argument('--think', type=float, default=1.0, help='mean think time between detail opens')
+    rec.add_argument('--seed', type=int, default=None)
+
+    prx = sub.add_parser('proxy', help='record real traffic through a forwarding proxy')
+    prx.add_argument('-o', '--output', default='traffic.ndjson')
+    prx.add_argument('--url', default=DEFAULT_URL, help='backend to forward to')
+    prx.add_argument('--port', type=int, default=3001)
+
+    rep = sub.add_parser('replay', help='replay a recording')
+    rep.add_argument('log', help='NDJSON recording')
+    rep.add_argument('--url', default=DEFAULT_URL)
+    rep.add_argument('--speed', type=parse_speed, default=1.0, help='1, 10 (or 10x), or max')
+    rep.add_argument('-c', '--connections', type=int, default=64, help='max open connections')
+    args = parser.parse_args(argv)
+
+    if args.command == 'record':
+        count = asyncio.run(capture(args.url, args.output, args.sessions, args.stagger, args.think, args.seed))
+        print(f"Recorded {count} requests from {args.sessions} sessions to {args.output}")
+    elif args.command == 'proxy':
+        try:
+            asyncio.run(proxy(args.url, args.output, port=args.port))
+        except KeyboardInterrupt:
+            pass
+    else:
+        entries = load_log(args.log)
+        stats, elapsed = asyncio.run(replay(entries, args.url, args.speed, args.connections))
+        original = recorded_stats(entries)
+        span = max((e['t'] + e['d'] for e in entries), default=0)
+        speed = 'max' if args.speed is None else f"{args.speed:g}x"
+        print(f"Replayed {len(entries)} requests at {speed} in {elapsed:.2f}s (recorded span {span:.2f}s)")
+        print(format_table({name: s.summary(elapsed) for name, s in sorted(stats.items())}))
+        print("\nRecorded:")
+        print(format_table({name: s.summary(span) for name, s in sorted(original.items())}))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
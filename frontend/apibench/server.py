@@ -0,0 +1,404 @@
+import argparse
+import asyncio
+import contextlib
+import datetime
+import gzip
+import json
+import os
+import random
+import sqlite3
+import sys
+import time
+from urllib.parse import parse_qs, urlsplit
+
+FRONTEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKEND_DIR = os.path.join(os.path.dirname(FRONTEND_DIR), 'backend')
+DEFAULT_BACKUP = os.path.join(BACKEND_DIR, 'backup.json')
+
+# URL resource -> Prisma model
+RESOURCES = {
+    'spots': 'Spot', 'guides': 'Guide', 'strategies': 'Strategy', 'ads': 'Ad', 'cities': 'City',
+    'pois': 'Poi', 'favorites': 'Favorite', 'reviews': 'Review', 'enterprises': 'Enterprise',
+    'spot-categories': 'SpotCategory', 'strategy-categories': 'StrategyCategory',
+    'contact-info': 'ContactInfo', 'bookings': 'Booking', 'users': 'User',
+}
+BIGINT_IDS = {'Spot', 'Guide', 'Strategy', 'Ad', 'Enterprise'}
+BOOLEANS = {'hasCar', 'isTop', 'isGlobal', 'isActive'}
+DATES = {'createdAt', 'updatedAt', 'expiryDate', 'loginAt', 'date'}
+JSON_LISTS = {'photos', 'videos', 'tags', 'cities', 'images', 'spots'}
+# Matches the compression() middleware default threshold
+GZIP_MIN_BYTES = 1024
+REASONS = {200: 'OK', 201: 'Created', 400: 'Bad Request', 404: 'Not Found', 500: 'Internal Server Error',
+           503: 'Service Unavailable'}
+
+
+def _now():
+    return datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+
+
+def _api_row(model, row):
+    """A SQLite row shaped like the Nest services return it."""
+    row = dict(row)
+    for key, value in row.items():
+        if key in BOOLEANS and value is not None:
+            row[key] = bool(value)
+        elif key in DATES and isinstance(value, (int, float)):
+            row[key] = datetime.datetime.fromtimestamp(value / 1000, datetime.timezone.utc) \
+                .isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+        elif key in JSON_LISTS and isinstance(value, str):
+            try:
+                parsed = json.loads(value)
+                row[key] = parsed if isinstance(parsed, list) else []
+            except ValueError:
+                row[key] = []
+    if model in BIGINT_IDS:
+        row['id'] = str(row['id'])
+    if model == 'Spot':
+        row['location'] = {'lng': row.get('lng'), 'lat': row.get('lat')}
+        row.setdefault('reviews', [])
+    return row
+
+
+class Store:
+    """In-memory tables keyed by model name."""
+
+    def __init__(self, tables):
+        self.tables = {model: list(rows) for model, rows in tables.items()}
+        self._next_id = {}
+
+    @classmethod
+    def from_backup(cls, path=DEFAULT_BACKUP):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls({RESOURCES[name]: rows for name, rows in data.items() if name in RESOURCES})
+
+    @classmethod
+    def load(cls, source):
+        return cls.from_sqlite(source) if source.endswith('.db') else cls.from_backup(source)
+
+    @classmethod
+    def from_sqlite(cls, path):
+        conn = sqlite3.connect(path)
+        conn.row_factory = sqlite3.Row
+        tables = {}
+        try:
+            for model in set(RESOURCES.values()):
+                try:
+                    tables[model] = [_api_row(model, row) for row in conn.execute(f'SELECT * FROM "{model}"')]
+                except sqlite3.OperationalError:
+                    tables[model] = []
+        finally:
+            conn.close()
+        return cls(tables)
+
+    def rows(self, model):
+        return self.tables.setdefault(model, [])
+
+    def find(self, model, id):
+        return next((row for row in self.rows(model) if str(row.get('id')) == str(id)), None)
+
+    def insert(self, model, data):
+        rows = self.rows(model)
+        if model not in self._next_id:
+            self._next_id[model] = max((int(row['id']) for row in rows if str(row.get('id', '')).isdigit()), default=0) + 1
+        row = dict(data)
+        row['id'] = str(self._next_id[model]) if model in BIGINT_IDS else self._next_id[model]
+        self._next_id[model] += 1
+        row.setdefault('createdAt', _now())
+        row['updatedAt'] = row['createdAt']
+        rows.append(row)
+        return row
+
+
+class Faults:
+    """Latency and error injection; per-route settings override the defaults."""
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, drop_rate=0.0, routes=None, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.drop_rate = drop_rate
+        self.routes = routes or {}
+        self.random = random.Random(seed)
+
+    def delay(self, resource):
+        base = self.routes.get(resource, self.latency)
+        return max(0.0, base + self.random.uniform(-self.jitter, self.jitter)) if base or self.jitter else 0.0
+
+    def fail(self):
+        return self.error_rate and self.random.random() < self.error_rate
+
+    def drop(self):
+        return self.drop_rate and self.random.random() < self.drop_rate
+
+
+class StandInApp:
+    """Serves the read paths and the common writes of the Nest API from a Store."""
+
+    def __init__(self, store, faults=None):
+        self.store = store
+        self.faults = faults or Faults()
+        self.served = 0
+
+    def handle(self, method, path, query, body):
+        parts = [p for p in path.split('/') if p]
+        if not parts:
+            return 200, 'Hello World!'
+        resource = parts[0]
+        model = RESOURCES.get(resource)
+        if model is None:
+            return 404, {'message': f'Cannot {method} {path}', 'statusCode': 404}
+
+        if resource == 'favorites':
+            return self._favorites(method, parts, query, body)
+        if resource == 'reviews':
+            return self._reviews(method, parts, body)
+        if resource == 'contact-info':
+            rows = self.store.rows(model)
+            return 200, rows[0] if rows else {}
+
+        if method == 'GET' and len(parts) == 1:
+            return 200, self._list(model, query)
+        if method == 'GET' and len(parts) == 2:
+            # Nest answers a missing record with an empty 200
+            return 200, self.store.find(model, parts[1])
+        if method == 'POST' and len(parts) == 1:
+            if model == 'Poi' and body and body.get('amapId'):
+                existing = next((row for row in self.store.rows('Poi') if row.get('amapId') == body['amapId']), None)
+                if existing is not None:
+                    existing.update(body)
+                    existing['updatedAt'] = _now()
+                    return 201, existing
+            return 201, self.store.insert(model, body or {})
+        if method == 'POST' and len(parts) == 3 and parts[2] == 'view':
+            row = self.store.find(model, parts[1])
+            if row is None:
+                return 404, {'message': 'Not Found', 'statusCode': 404}
+            row['viewCount'] = (row.get('viewCount') or 0) + 1
+            return 201, row
+        if method in ('PUT', 'PATCH') and len(parts) >= 2:
+            row = self.store.find(model, parts[1])
+            if row is None:
+                return 404, {'message': 'Not Found', 'statusCode': 404}
+            row.update(body or {})
+            row['updatedAt'] = _now()
+            return 200, row
+        return 404, {'message': f'Cannot {method} {path}', 'statusCode': 404}
+
+    def _list(self, model, query):
+        rows = self.store.rows(model)
+        if model in ('Spot', 'Enterprise') and query.get('includeInactive') != 'true':
+            rows = [row for row in rows if row.get('isActive', True)]
+        if 'expiryDate' in (rows[0] if rows else {}) and query.get('includeExpired') != 'true':
+            now = _now()
+            rows = [row for row in rows if not row.get('expiryDate') or row['expiryDate'] > now]
+        return rows
+
+    def _favorites(self, method, parts, query, body):
+        favorites = self.store.rows('Favorite')
+        if method == 'GET':
+            user_id = int(query.get('userId') or 0)
+            result = []
+            for fav in favorites:
+                if fav.get('userId') == user_id:
+                    fav = dict(fav)
+                    fav['poi'] = self.store.find('Poi', fav['poiId']) if fav.get('poiId') else None
+                    fav['strategy'] = self.store.find('Strategy', fav['strategyId']) if fav.get('strategyId') else None
+                    result.append(fav)
+            return 200, result
+        if method == 'POST' and parts[1:] == ['toggle']:
+            body = body or {}
+            user_id, kind = body.get('userId'), body.get('type', 'poi')
+            if kind == 'poi':
+                amap_id = str(body.get('targetId'))
+                poi = next((row for row in self.store.rows('Poi') if row.get('amapId') == amap_id), None)
+                if poi is None:
+                    item = body.get('itemData')
+                    if not item:
+                        return 400, {'message': 'POI not found and no item data provided for auto-creation.', 'statusCode': 400}
+                    poi = self.store.insert('Poi', {'amapId': amap_id, 'name': item.get('name') or 'Unknown POI',
+                                                    'type': item.get('type') or 'spot', 'address': item.get('address') or ''})
+                field, target = 'poiId', poi['id']
+            else:
+                field, target = f'{kind}Id', str(body.get('targetId'))
+            existing = next((fav for fav in favorites if fav.get('userId') == user_id and fav.get(field) == target), None)
+            if existing is not None:
+                favorites.remove(existing)
+                return 201, existing
+            return 201, self.store.insert('Favorite', {'userId': user_id, field: target})
+        return 404, {'message': 'Not Found', 'statusCode': 404}
+
+    def _reviews(self, method, parts, body):
+        reviews = self.store.rows('Review')
+        if method == 'GET' and len(parts) == 3:
+            field = {'poi': 'poiId', 'spot': 'spotId', 'guide': 'guideId', 'strategy': 'strategyId',
+                     'enterprise': 'enterpriseId', 'user': 'userId'}.get(parts[1])
+            if field is None:
+                return 404, {'message': 'Not Found', 'statusCode': 404}
+            matches = [row for row in reviews if str(row.get(field)) == parts[2]]
+            return 200, sorted(matches, key=lambda row: row.get('createdAt') or '', reverse=True)
+        if method == 'POST' and len(parts) == 1:
+            body = dict(body or {})
+            if not any(body.get(f) for f in ('poiId', 'spotId', 'guideId', 'strategyId', 'enterpriseId')):
+                return 500, {'message': 'Internal server error', 'statusCode': 500}
+            body.setdefault('type', 'REAL')
+            return 201, self.store.insert('Review', body)
+        return 404, {'message': 'Not Found', 'statusCode': 404}
+
+
+class BadRequest(ValueError):
+    pass
+
+
+async def _read_request(reader):
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    parts = request_line.decode('latin-1').rstrip('\r\n').split(' ')
+    if len(parts) != 3 or not parts[0] or not parts[1]:
+        raise BadRequest('Malformed request line')
+    method, target, _ = parts
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get('content-length', 0) or 0)
+    except ValueError:
+        length = -1
+    if length < 0:
+        raise BadRequest('Bad Content-Length')
+    body = await reader.readexactly(length)
+    return method, target, headers, body
+
+
+def _response(status, payload, headers, close=False):
+    body = payload if isinstance(payload, bytes) else (
+        payload.encode('utf-8') if isinstance(payload, str) else json.dumps(payload, ensure_ascii=False).encode('utf-8'))
+    lines = [f'HTTP/1.1 {status} {REASONS.get(status, "")}',
+             'Content-Type: ' + ('text/html; charset=utf-8' if isinstance(payload, str) else 'application/json; charset=utf-8'),
+             'Cache-Control: private, no-cache, no-store, must-revalidate',
+             'Connection: ' + ('close' if close else 'keep-alive')]
+    if len(body) >= GZIP_MIN_BYTES and 'gzip' in headers.get('accept-encoding', ''):
+        body = gzip.compress(body, compresslevel=6)
+        lines.append('Content-Encoding: gzip')
+    lines.append(f'Content-Length: {len(body)}')
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body
+
+
+def _dispatch(app, method, path, query, raw):
+    """(status, payload) for one request; bad input is a 400 and handler failures a 500, as in Nest."""
+    try:
+        body = json.loads(raw.decode('utf-8')) if raw else None
+    except ValueError:
+        return 400, {'message': 'Bad JSON body', 'statusCode': 400}
+    if body is not None and not isinstance(body, dict):
+        return 400, {'message': 'JSON body must be an object', 'statusCode': 400}
+    try:
+        return app.handle(method, path, query, body)
+    except ValueError as e:
+        return 400, {'message': str(e), 'statusCode': 400}
+    except Exception:
+        return 500, {'message': 'Internal server error', 'statusCode': 500}
+
+
+async def serve_connection(app, reader, writer):
+    try:
+        while True:
+            try:
+                request = await _read_request(reader)
+            except BadRequest as e:
+                # The stream position is unknown after a bad request, so answer and hang up
+                writer.write(_response(400, {'message': str(e), 'statusCode': 400}, {}, close=True))
+                await writer.drain()
+                break
+            if request is None:
+                break
+            method, target, headers, raw = request
+            url = urlsplit(target)
+            query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            faults = app.faults
+            delay = faults.delay(url.path.strip('/').split('/')[0])
+            if delay:
+                await asyncio.sleep(delay)
+            if faults.drop():
+                break
+            if faults.fail():
+                status, payload = 503, {'message': 'Injected failure', 'statusCode': 503}
+            else:
+                status, payload = _dispatch(app, method, url.path, query, raw)
+            # Nest writes an empty 200 body for a null result
+            writer.write(_response(status, b'' if payload is None else payload, headers))
+            await writer.drain()
+            app.served += 1
+            if headers.get('connection', '').lower() == 'close':
+                break
+    except (ConnectionResetError, asyncio.IncompleteReadError, BrokenPipeError):
+        pass
+    finally:
+        writer.close()
+
+
+async def start(app, host='127.0.0.1', port=3000):
+    return await asyncio.start_server(lambda r, w: serve_connection(app, r, w), host, port)
+
+
+@contextlib.asynccontextmanager
+async def running(source, faults=None):
+    """Serve backup.json or a .db on a free local port for the duration of the block; yields the URL."""
+    server = await start(StandInApp(Store.load(source), faults), port=0)
+    async with server:
+        yield f'http://127.0.0.1:{server.sockets[0].getsockname()[1]}'
+        # Let the connection handlers see EOF before the loop shuts down
+        await asyncio.sleep(0.05)
+
+
+def parse_routes(specs):
+    routes = {}
+    for spec in specs:
+        name, _, ms = spec.rpartition('=')
+        routes[name.strip('/')] = float(ms) / 1000
+    return routes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve the TravelMap API routes from backup.json or a SQLite file.')
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--backup', default=DEFAULT_BACKUP, help='backup.json to serve (default)')
+    source.add_argument('--sqlite', help='Prisma SQLite database to serve instead')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=3000)
+    parser.add_argument('--latency', type=float, default=0.0, help='added latency per request in ms')
+    parser.add_argument('--jitter', type=float, default=0.0, help='uniform +/- jitter on the latency in ms')
+    parser.add_argument('--route-latency', action='append', default=[], metavar='RESOURCE=MS',
+                        help='latency for one resource, e.g. spots=120')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests answered with 503')
+    parser.add_argument('--drop-rate', type=float, default=0.0, help='fraction of requests whose connection is dropped')
+    parser.add_argument('--seed', type=int, default=None, help='seed for the injected faults')
+    args = parser.parse_args(argv)
+
+    store = Store.load(args.sqlite or args.backup)
+    faults = Faults(args.latency / 1000, args.jitter / 1000, args.error_rate, args.drop_rate,
+                    parse_routes(args.route_latency), args.seed)
+    app = StandInApp(store, faults)
+
+    async def serve():
+        server = await start(app, args.host, args.port)
+        counts = ', '.join(f"{len(rows)} {model}" for model, rows in sorted(store.tables.items()) if rows)
+        print(f"Stand-in API on http://{args.host}:{args.port} ({counts})")
+        async with server:
+            await server.serve_forever()
+
+    started = time.perf_counter()
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        print(f"\n{app.served} requests in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
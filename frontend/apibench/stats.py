@@ -0,0 +1,113 @@
+import math
+
+# Bucket boundaries grow by 2%, so any reported percentile is within 2% of the true value
+GROWTH = 1.02
+_LOG_GROWTH = math.log(GROWTH)
+MIN_SECONDS = 1e-6
+
+
+class Histogram:
+    """Log-bucketed latency histogram in seconds; cheap to record and to merge."""
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        index = int(math.log(max(seconds, MIN_SECONDS) / MIN_SECONDS) / _LOG_GROWTH)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def merge(self, other):
+        for index, n in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + n
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, p):
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * p / 100))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                # Upper edge of the bucket, capped by the largest value seen
+                return min(MIN_SECONDS * GROWTH ** (index + 1), self.max)
+        return self.max
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+            'max': self.max,
+        }
+
+    def to_dict(self):
+        return {'buckets': {str(k): v for k, v in sorted(self.buckets.items())},
+                'count': self.count, 'total': self.total, 'max': self.max}
+
+    @classmethod
+    def from_dict(cls, data):
+        hist = cls()
+        hist.buckets = {int(k): v for k, v in data['buckets'].items()}
+        hist.count = data['count']
+        hist.total = data['total']
+        hist.max = data['max']
+        return hist
+
+
+class EndpointStats:
+    def __init__(self):
+        self.latency = Histogram()
+        self.errors = 0
+        self.statuses = {}
+        self.bytes = 0
+
+    def record(self, seconds, status=None, size=0):
+        self.latency.record(seconds)
+        self.bytes += size
+        key = str(status) if status is not None else 'error'
+        self.statuses[key] = self.statuses.get(key, 0) + 1
+        if status is None or status >= 400:
+            self.errors += 1
+
+    def merge(self, other):
+        self.latency.merge(other.latency)
+        self.errors += other.errors
+        self.bytes += other.bytes
+        for key, n in other.statuses.items():
+            self.statuses[key] = self.statuses.get(key, 0) + n
+
+    def summary(self, elapsed=None):
+        result = self.latency.summary()
+        result.update({
+            'errors': self.errors,
+            'statuses': dict(sorted(self.statuses.items())),
+            'avg_bytes': self.bytes / self.latency.count if self.latency.count else 0,
+        })
+        if elapsed:
+            result['rps'] = self.latency.count / elapsed
+        return result
+
+
+def format_table(summaries):
+    """Fixed-width table of {name: summary} in milliseconds."""
+    lines = [f"{'endpoint':<28} {'reqs':>7} {'err':>5} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8} {'bytes':>9}"]
+    for name, s in summaries.items():
+        lines.append(f"{name:<28} {s['count']:>7} {s['errors']:>5} {s.get('rps', 0):>8.1f} "
+                     f"{s['p50'] * 1000:>8.1f} {s['p95'] * 1000:>8.1f} {s['p99'] * 1000:>8.1f} "
+                     f"{s['max'] * 1000:>8.1f} {s['avg_bytes']:>9.0f}")
+    return '\n'.join(lines)
@@ -0,0 +1,4 @@
+from .cache import StepCache
+from .jsx import JsxIndex
+from .rewrite import ReplacementTable, replace_all, report, splice
+from .steps import Step, apply_file, run_script
@@ -0,0 +1,249 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from .jsx import JsxIndex
+from .runner import FRONTEND_DIR, SCRIPTS, load_script
+from .steps import apply_file
+
+BENCH_SCRIPTS = [path for path in SCRIPTS if os.path.dirname(path) == FRONTEND_DIR]
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+HEADER = """import React, { useState, useEffect } from 'react';
+import { Search, Globe, Calendar, Navigation, Star, Clock, X } from 'lucide-react';
+import MenuDrawer from './MenuDrawer';
+import { toggleFavorite, getFavorites, createOrUpdatePoi, createBooking, getReviews, createReview, Poi } from '../api';
+
+const CATEGORIES = [
+  { icon: Utensils, label: '美食', query: '美食' },
+  { icon: Hotel, label: '酒店', query: '酒店' },
+];
+
+export default function Sidebar({ onSearch, selectedPoi, onClear }: any) {
+  const [currentLang, setCurrentLang] = useState(localStorage.getItem('travelmap_lang') || 'zh-CN');
+  const [toastMessage, setToastMessage] = useState<string | null>(null);
+  const [bookingModalOpen, setBookingModalOpen] = useState(false);
+  const [rating, setRating] = useState(5);
+  const [keyword, setKeyword] = useState('');
+
+  const loadFavorites = async () => {};
+
+  const handleSearch = (e: React.FormEvent) => {
+    e.preventDefault();
+    if (keyword.trim()) {
+      onSearch(keyword);
+    }
+  };
+
+  const handleToggleFavorite = async (e: React.MouseEvent) => {};
+
+  return (
+    <div className="flex flex-col h-full">
+"""
+
+SECTION = """      <div className="p-4 space-y-4" data-section="{n}">
+        <div className="flex gap-4 items-start group">
+          <div className="p-2.5 bg-green-50 rounded-2xl"><Clock size={20} /></div>
+          <div className="text-gray-600 mt-1"><span className="text-green-600 font-medium">Open</span>  Closes 10PM</div>
+        </div>
+        <div className="flex gap-4 items-start group">
+          <div className="p-2.5 bg-pink-50 rounded-2xl text-pink-600 group-hover:bg-pink-100 transition-colors">
+            <Globe size={20} />
+          </div>
+          <div className="text-blue-600 hover:underline cursor-pointer mt-1 font-medium">Visit website</div>
+        </div>
+        <div className="flex gap-3">
+          <button onClick={() => setBookingModalOpen(true)} className="flex-1 py-3 rounded-2xl">
+            <Calendar size={18} /> {selectedPoi.name}
+          </button>
+          <button onClick={() => onSearch(keyword)} className="flex-1 py-3 rounded-2xl">
+            <Navigation size={18} />
+          </button>
+          <button onClick={handleToggleFavorite} className="p-3 rounded-2xl"><Star size={18} /></button>
+        </div>
+{literals}
+      </div>
+"""
+
+FOOTER = """    </div>
+  );
+}
+"""
+
+
+def _literal_lines():
+    # Seed the sections with the literals refactor_i18n.py rewrites
+    module = load_script(os.path.join(FRONTEND_DIR, 'refactor_i18n.py'))
+    keys = list(module.menu_replacements) + list(module.sidebar_replacements) + list(module.followups)
+    lines = []
+    for key in keys:
+        if '\n' in key or key.startswith('function'):
+            continue
+        if key.startswith('<') or key.startswith('text-'):
+            lines.append('        ' + key)
+        elif key.startswith('"') or key.startswith("'"):
+            lines.append(f'        <span>{{{key}}}</span>')
+        elif '=' in key:
+            lines.append(f'        <MenuItem {key} />')
+        else:
+            lines.append(f'        <span>{key}</span>')
+    return lines
+
+
+def synthetic_component(lines):
+    """A Sidebar-shaped component of roughly the given line count."""
+    literals = _literal_lines()
+    parts = [HEADER]
+    total = HEADER.count('\n') + FOOTER.count('\n')
+    n = 0
+    while total < lines:
+        chunk = '\n'.join(literals[(n * 4 + i) % len(literals)] for i in range(4))
+        section = SECTION.replace('{n}', str(n)).replace('{literals}', chunk)
+        parts.append(section)
+        total += section.count('\n')
+        n += 1
+    parts.append(FOOTER)
+    return ''.join(parts)
+
+
+CATALOG_LOCALES = ['zh-CN', 'en-US', 'ja-JP', 'ko-KR']
+
+
+def synthetic_catalog(lines):
+    """A translations.ts-shaped TRANSLATIONS module of roughly the given line count, four locales."""
+    per_locale = max(lines // len(CATALOG_LOCALES), 8)
+    parts = ['export const TRANSLATIONS: any = {\n']
+    for i, locale in enumerate(CATALOG_LOCALES):
+        parts.append(f"  '{locale}': {{\n    common: {{\n      searching: '...',\n      savedPlaces: '{locale} saved',\n"
+                     f"      back: '{locale} back'\n    }}")
+        for n in range((per_locale - 6) // 6):
+            keys = ',\n'.join(f"      key{k}: '{locale} section {n} text {k}'" for k in range(4))
+            parts.append(f",\n    section{n}: {{\n{keys}\n    }}")
+        parts.append('\n  }' + (',\n' if i < len(CATALOG_LOCALES) - 1 else '\n'))
+    parts.append('};\n')
+    return ''.join(parts)
+
+
+def _best(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _input(step, inputs):
+    # Steps on the translation catalog need a catalog; every other step gets the component
+    return inputs['catalog'] if os.path.basename(step.path) == 'translations.ts' else inputs['component']
+
+
+def bench_script(script_path, inputs, workdir, repeat):
+    steps = load_script(script_path).STEPS
+    step_times = {}
+    for step in steps:
+        # Each step sees the same synthetic input, so steps are comparable across commits
+        content = _input(step, inputs)
+        step_times[step.name] = _best(lambda: step.transform(content), repeat)
+
+    def end_to_end():
+        paths = {}
+        for step in steps:
+            paths.setdefault(os.path.join(workdir, os.path.basename(step.path)), []).append(('bench', step))
+        for path, keyed_steps in paths.items():
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(_input(keyed_steps[0][1], inputs))
+            apply_file(path, keyed_steps, cache=None)
+
+    return {'total': _best(end_to_end, repeat), 'steps': step_times}
+
+
+def run(sizes=DEFAULT_SIZES, scripts=BENCH_SCRIPTS, repeat=3):
+    results = {}
+    workdir = tempfile.mkdtemp(prefix='codemod-bench-')
+    try:
+        for lines in sizes:
+            content = synthetic_component(lines)
+            inputs = {'component': content, 'catalog': synthetic_catalog(lines)}
+            entry = {
+                'bytes': len(content.encode('utf-8')),
+                'jsx_index': _best(lambda: JsxIndex(content), repeat),
+                'scripts': {},
+            }
+            for script_path in scripts:
+                name = os.path.basename(script_path)
+                entry['scripts'][name] = bench_script(script_path, inputs, workdir, repeat)
+                print(f"{lines:>7} lines  {name:<24} {entry['scripts'][name]['total'] * 1000:10.2f} ms")
+            results[str(lines)] = entry
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def _commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=FRONTEND_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline, current, threshold):
+    """Print per-script ratios against a baseline; return the entries slower than threshold."""
+    regressions = []
+    for lines, entry in current['sizes'].items():
+        base_entry = baseline['sizes'].get(lines)
+        if not base_entry:
+            continue
+        for name, result in entry['scripts'].items():
+            base = base_entry['scripts'].get(name)
+            if not base or not base['total']:
+                continue
+            ratio = result['total'] / base['total']
+            flag = '  REGRESSION' if ratio > threshold else ''
+            print(f"{lines:>7} lines  {name:<24} {base['total'] * 1000:10.2f} -> {result['total'] * 1000:10.2f} ms  x{ratio:.2f}{flag}")
+            if ratio > threshold:
+                regressions.append((lines, name, ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Time the codemod scripts on synthetic components.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='component sizes in lines')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per measurement, best is kept')
+    parser.add_argument('--scripts', nargs='+', default=None, help='scripts to time (default: frontend patch stack)')
+    parser.add_argument('-o', '--output', default='codemod-bench.json', help='where to write results')
+    parser.add_argument('--compare', metavar='BASELINE', help='compare against an earlier results file')
+    parser.add_argument('--threshold', type=float, default=1.25, help='slowdown ratio reported as a regression')
+    args = parser.parse_args(argv)
+
+    current = {
+        'commit': _commit(),
+        'python': platform.python_version(),
+        'repeat': args.repeat,
+        'sizes': run(args.sizes, [os.path.abspath(p) for p in args.scripts] if args.scripts else BENCH_SCRIPTS, args.repeat),
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(current, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if compare(baseline, current, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,62 @@
+import hashlib
+import os
+
+DEFAULT_ROOT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.codemod-cache')
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def script_key(script_path):
+    # The script source is part of the key so editing a patch invalidates its entries
+    with open(script_path, 'rb') as f:
+        source_digest = hashlib.sha256(f.read()).hexdigest()
+    return f"{os.path.basename(script_path)}@{source_digest[:12]}"
+
+
+def _write_atomic(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class StepCache:
+    """Persistent memo of (script, step, input hash) -> output.
+
+    Every entry and output blob is its own file written with os.replace, so
+    several processes can share one cache directory without a lock.
+    """
+
+    def __init__(self, root=DEFAULT_ROOT):
+        self.root = root
+
+    def _entry_path(self, script, step, digest):
+        key = hashlib.sha256(f"{script}\0{step}\0{digest}".encode('utf-8')).hexdigest()
+        return os.path.join(self.root, 'steps', key[:2], key)
+
+    def _object_path(self, digest):
+        return os.path.join(self.root, 'objects', digest[:2], digest)
+
+    def lookup(self, script, step, content):
+        digest = content_hash(content)
+        try:
+            with open(self._entry_path(script, step, digest), 'r', encoding='utf-8') as f:
+                result_digest = f.read().strip()
+            if result_digest == digest:
+                return content
+            with open(self._object_path(result_digest), 'r', encoding='utf-8') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def store(self, script, step, content, result):
+        digest = content_hash(content)
+        result_digest = content_hash(result)
+        if result_digest != digest:
+            object_path = self._object_path(result_digest)
+            if not os.path.exists(object_path):
+                _write_atomic(object_path, result)
+        _write_atomic(self._entry_path(script, step, digest), result_digest)
@@ -0,0 +1,255 @@
+import re
+from bisect import bisect_left, bisect_right
+
+_JS_STOP = re.compile(r'["\'`/{}<]')
+_CHILD_STOP = re.compile(r'[{<]')
+_NAME = re.compile(r'[A-Za-z0-9_$.:-]*')
+_ATTR_NAME = re.compile(r'[^\s=/>{"\']+')
+_IDENT_TAIL = re.compile(r'[A-Za-z0-9_$]+$')
+# Keywords after which '<' starts JSX rather than a generic or comparison
+_JSX_KEYWORDS = {'return', 'yield', 'await', 'default', 'case', 'else', 'do'}
+
+
+class Element:
+    __slots__ = ('tag', 'start', 'open_end', 'end', 'class_name', 'parent', 'children')
+
+    def __init__(self, tag, start, parent):
+        self.tag = tag
+        self.start = start
+        self.open_end = start
+        self.end = start
+        self.class_name = None
+        self.parent = parent
+        self.children = []
+
+    def contains(self, pos):
+        return self.start <= pos < self.end
+
+    def has_classes(self, tokens):
+        return self.class_name is not None and set(tokens) <= set(self.class_name.split())
+
+    def __repr__(self):
+        return f"<Element {self.tag or '<>'} {self.start}:{self.end}>"
+
+
+class JsxIndex:
+    """Tag/brace span index over a TSX source.
+
+    The source is tokenized once; elements are kept in start order so lookups
+    by position are a bisect followed by a walk up the parent chain. Strings,
+    template literals and comments in code are skipped, so '<' and '}' inside
+    them never confuse the nesting.
+
+    The same pass records JSX text nodes as (start, end) in `texts` and string
+    literals as (start, end, attribute) in `strings`, where attribute is the
+    JSX attribute the literal is assigned to, or None for literals in code.
+    Template literals with substitutions are not recorded.
+    """
+
+    def __init__(self, content):
+        self.content = content
+        self.elements = []
+        self.texts = []
+        self.strings = []
+        self._class_tokens = {}
+        self._tags = {}
+        self._scan_js(0, None, None)
+        self._starts = [el.start for el in self.elements]
+        for el in self.elements:
+            self._tags.setdefault(el.tag, []).append(el)
+            if el.class_name:
+                for token in set(el.class_name.split()):
+                    self._class_tokens.setdefault(token, []).append(el)
+
+    # --- queries ---
+
+    def source(self, el):
+        return self.content[el.start:el.end]
+
+    def enclosing(self, pos, tag=None, class_name=None):
+        """Innermost element containing pos, optionally filtered by tag and className tokens."""
+        if pos < 0:
+            return None
+        idx = bisect_right(self._starts, pos) - 1
+        el = self.elements[idx] if idx >= 0 else None
+        tokens = class_name.split() if class_name else None
+        while el is not None:
+            if el.contains(pos) and (tag is None or el.tag == tag) and (tokens is None or el.has_classes(tokens)):
+                return el
+            el = el.parent
+        return None
+
+    def enclosing_text(self, text, tag=None, class_name=None, start=0):
+        return self.enclosing(self.content.find(text, start), tag, class_name)
+
+    def with_class(self, class_name):
+        """Elements whose className contains every token of class_name, in source order."""
+        tokens = class_name.split()
+        candidates = min((self._class_tokens.get(token, []) for token in tokens), key=len)
+        return [el for el in candidates if el.has_classes(tokens)]
+
+    def with_tag(self, tag):
+        return list(self._tags.get(tag, []))
+
+    def within(self, start, end):
+        """Elements lying entirely inside [start, end), in source order."""
+        lo = bisect_left(self._starts, start)
+        hi = bisect_left(self._starts, end)
+        return [el for el in self.elements[lo:hi] if el.end <= end]
+
+    # --- scanner ---
+
+    def _skip_string(self, i, quote):
+        content = self.content
+        i += 1
+        while i < len(content):
+            ch = content[i]
+            if ch == '\\':
+                i += 2
+                continue
+            if ch == quote or ch == '\n':
+                return i + 1
+            i += 1
+        return i
+
+    def _skip_template(self, i, parent):
+        content = self.content
+        start = i
+        substituted = False
+        i += 1
+        while i < len(content):
+            ch = content[i]
+            if ch == '\\':
+                i += 2
+            elif ch == '`':
+                if not substituted:
+                    self.strings.append((start, i + 1, None))
+                return i + 1
+            elif ch == '$' and content.startswith('{', i + 1):
+                substituted = True
+                i = self._scan_js(i + 2, '}', parent) + 1
+            else:
+                i += 1
+        return i
+
+    def _is_jsx_start(self, i):
+        content = self.content
+        nxt = content[i + 1:i + 2]
+        if not (nxt.isalpha() or nxt == '>'):
+            return False
+        j = i - 1
+        while j >= 0 and content[j] in ' \t\r\n':
+            j -= 1
+        if j < 0:
+            return True
+        prev = content[j]
+        if prev in '([{,;:=?&|!>}+-*%~':
+            return True
+        word = _IDENT_TAIL.search(content, max(0, j - 16), j + 1)
+        return word is not None and word.group(0) in _JSX_KEYWORDS
+
+    def _scan_js(self, i, closer, parent):
+        """Scan code until an unmatched closer ('}') and return its index."""
+        content = self.content
+        depth = 0
+        while True:
+            match = _JS_STOP.search(content, i)
+            if match is None:
+                return len(content)
+            i = match.start()
+            ch = content[i]
+            if ch == '"' or ch == "'":
+                end = self._skip_string(i, ch)
+                self.strings.append((i, end, None))
+                i = end
+            elif ch == '`':
+                i = self._skip_template(i, parent)
+            elif ch == '/':
+                if content.startswith('//', i):
+                    newline = content.find('\n', i)
+                    i = len(content) if newline == -1 else newline + 1
+                elif content.startswith('/*', i):
+                    close = content.find('*/', i + 2)
+                    i = len(content) if close == -1 else close + 2
+                else:
+                    i += 1
+            elif ch == '{':
+                depth += 1
+                i += 1
+            elif ch == '}':
+                if depth == 0 and closer == '}':
+                    return i
+                depth = max(0, depth - 1)
+                i += 1
+            elif self._is_jsx_start(i):
+                i = self._scan_element(i, parent)
+            else:
+                i += 1
+
+    def _scan_element(self, i, parent):
+        content = self.content
+        name = _NAME.match(content, i + 1)
+        el = Element(name.group(0), i, parent)
+        self.elements.append(el)
+        if parent is not None:
+            parent.children.append(el)
+        i = name.end()
+
+        # Attributes
+        while i < len(content):
+            ch = content[i]
+            if ch in ' \t\r\n':
+                i += 1
+            elif content.startswith('/>', i):
+                el.open_end = el.end = i + 2
+                return el.end
+            elif ch == '>':
+                el.open_end = i + 1
+                break
+            elif ch == '{':
+                i = self._scan_js(i + 1, '}', el) + 1
+            else:
+                attr = _ATTR_NAME.match(content, i)
+                if attr is None:
+                    i += 1
+                    continue
+                i = attr.end()
+                if not content.startswith('=', i):
+                    continue
+                i += 1
+                value_start = i
+                if content[i:i + 1] in ('"', "'"):
+                    i = self._skip_string(i, content[i])
+                    value = content[value_start + 1:i - 1]
+                    self.strings.append((value_start, i, attr.group(0)))
+                elif content.startswith('{', i):
+                    i = self._scan_js(i + 1, '}', el) + 1
+                    value = content[value_start + 1:i - 1].strip()
+                    if value.startswith('`') and value.endswith('`'):
+                        value = value[1:-1]
+                else:
+                    continue
+                if attr.group(0) == 'className':
+                    el.class_name = value
+        else:
+            el.open_end = el.end = len(content)
+            return el.end
+
+        # Children
+        i = el.open_end
+        while True:
+            match = _CHILD_STOP.search(content, i)
+            if match is None:
+                el.end = len(content)
+                return el.end
+            if match.start() > i and not content[i:match.start()].isspace():
+                self.texts.append((i, match.start()))
+            i = match.start()
+            if content[i] == '{':
+                i = self._scan_js(i + 1, '}', el) + 1
+            elif content.startswith('</', i):
+                close = content.find('>', i)
+                el.end = len(content) if close == -1 else close + 1
+                return el.end
+            else:
+                i = self._scan_element(i, el)
@@ -0,0 +1,181 @@
+import argparse
+import json
+import os
+import sys
+
+from .cache import DEFAULT_ROOT, content_hash, script_key
+from .runner import FRONTEND_DIR, SCRIPTS, load_script, markers, run
+from .steps import missing_markers, read_text, report_file
+
+DEFAULT_JOURNAL = os.path.join(FRONTEND_DIR, '.codemod-journal.json')
+
+# rewrite_sidebar.py restores the Sidebar base that update_sidebar.py and
+# update_sidebar_v2.py patch together; it only runs when that base is missing.
+PIPELINE = [os.path.join(FRONTEND_DIR, 'rewrite_sidebar.py')] + SCRIPTS
+
+
+class PipelineError(Exception):
+    pass
+
+
+class Node:
+    """One patch script in the DAG.
+
+    Scripts may declare, next to STEPS:
+      AFTER     names of scripts that must be applied first
+      REQUIRES  {path: [markers]} that must be present before running
+      PROVIDES  {path: [markers]} that are present once the script is applied
+      REPLACES  names of scripts whose combined output this script produces
+    Paths are relative to the script, names are script file stems.
+    """
+
+    def __init__(self, script_path):
+        module = load_script(script_path)
+        self.script_path = os.path.abspath(script_path)
+        self.name = os.path.splitext(os.path.basename(script_path))[0]
+        self.key = script_key(script_path)
+        self.after = list(getattr(module, 'AFTER', []))
+        self.replaces = list(getattr(module, 'REPLACES', []))
+        base_dir = os.path.dirname(self.script_path)
+        self.requires = markers(script_path, 'REQUIRES')
+        self.provides = markers(script_path, 'PROVIDES')
+        self.outputs = sorted({os.path.normpath(os.path.join(base_dir, step.path)) for step in module.STEPS})
+
+
+def topological_order(nodes):
+    """Kahn's algorithm, ties broken by declaration order.
+
+    Whatever runs after a replaced script also runs after its replacement.
+    """
+    by_name = {node.name: node for node in nodes}
+    replaced_by = {}
+    for node in nodes:
+        for name in node.replaces:
+            replaced_by.setdefault(name, []).append(node.name)
+
+    deps = {}
+    for node in nodes:
+        names = set()
+        for name in node.after:
+            if name not in by_name:
+                raise PipelineError(f"{node.name} runs after unknown script {name}")
+            names.add(name)
+            names.update(replaced_by.get(name, []))
+        deps[node.name] = names
+
+    ordered = []
+    done = set()
+    while len(ordered) < len(nodes):
+        ready = [node for node in nodes if node.name not in done and deps[node.name] <= done]
+        if not ready:
+            cycle = sorted(name for name in deps if name not in done)
+            raise PipelineError(f"Dependency cycle between: {', '.join(cycle)}")
+        ordered.append(ready[0])
+        done.add(ready[0].name)
+    return ordered
+
+
+class Journal:
+    def __init__(self, path=DEFAULT_JOURNAL):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+
+    def record(self, node, how, covered_by=None):
+        self.entries[node.name] = {
+            'script': node.key,
+            'how': how,
+            'covered_by': covered_by,
+            'outputs': {os.path.relpath(path, FRONTEND_DIR): content_hash(read_text(path)) for path in node.outputs},
+        }
+
+    def save(self):
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+class Pipeline:
+    def __init__(self, script_paths=PIPELINE, journal=None):
+        self.nodes = topological_order([Node(path) for path in script_paths])
+        self.by_name = {node.name: node for node in self.nodes}
+        self.journal = journal if journal is not None else Journal()
+
+    def status(self, node):
+        """'journal' or 'detected' when applied, otherwise 'pending'."""
+        markers_ok = not missing_markers(node.provides) if node.provides else None
+        entry = self.journal.entries.get(node.name)
+        if entry and entry['script'] == node.key and markers_ok is not False:
+            return 'journal'
+        if markers_ok:
+            return 'detected'
+        return 'pending'
+
+    def run(self, jobs=None, cache_root=DEFAULT_ROOT, dry_run=False, force=()):
+        applied = set()
+        for node in self.nodes:
+            state = 'pending' if node.name in force else self.status(node)
+            if node.replaces:
+                # Only rebuild from scratch when the scripts it stands in for are not all applied
+                if state == 'pending' and all(self.status(self.by_name[name]) != 'pending' for name in node.replaces):
+                    state = 'superseded'
+            elif any(name in applied for name in self._replacements(node)):
+                state = 'covered'
+
+            if state != 'pending':
+                print(f"{node.name}: {state}")
+                if state == 'detected' and not dry_run:
+                    self.journal.record(node, 'detected')
+                    self.journal.save()
+                continue
+
+            missing = missing_markers(node.requires)
+            if missing:
+                raise PipelineError(f"{node.name}: precondition not met, "
+                                    + '; '.join(f"{os.path.relpath(path)} lacks {marker!r}" for path, marker in missing))
+            if dry_run:
+                print(f"{node.name}: would run")
+                continue
+
+            print(f"{node.name}: running")
+            for result in run([node.script_path], jobs, cache_root):
+                report_file(result)
+            missing = missing_markers(node.provides)
+            if missing:
+                raise PipelineError(f"{node.name}: ran but did not produce "
+                                    + '; '.join(f"{marker!r} in {os.path.relpath(path)}" for path, marker in missing))
+            applied.add(node.name)
+            self.journal.record(node, 'ran')
+            for name in node.replaces:
+                self.journal.record(self.by_name[name], 'ran', covered_by=node.name)
+            self.journal.save()
+
+    def _replacements(self, node):
+        return [other.name for other in self.nodes if node.name in other.replaces]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Apply the patch scripts in dependency order, skipping applied ones.')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='worker processes per script (default: CPU count)')
+    parser.add_argument('--dry-run', action='store_true', help='print what would run and exit')
+    parser.add_argument('--force', action='append', default=[], metavar='SCRIPT', help='rerun SCRIPT even if applied')
+    parser.add_argument('--reset', action='store_true', help='forget the journal before running')
+    parser.add_argument('--no-cache', action='store_true', help='bypass the step cache')
+    args = parser.parse_args(argv)
+
+    journal = Journal()
+    if args.reset:
+        journal.entries = {}
+    try:
+        Pipeline(journal=journal).run(args.jobs, None if args.no_cache else DEFAULT_ROOT, args.dry_run, set(args.force))
+    except PipelineError as e:
+        print(f"Error: {e}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
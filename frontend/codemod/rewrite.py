@@ -0,0 +1,78 @@
+import re
+from collections import Counter
+
+
+def _trie_pattern(node):
+    # Children have distinct first characters, so at most one branch can match
+    # at any position; the trailing '?' on terminal nodes makes the match greedy
+    # and falls back to the shorter key only when the longer one fails.
+    branches = [re.escape(ch) + _trie_pattern(child) for ch, child in sorted(node.items()) if ch]
+    if not branches:
+        return ''
+    terminal = '' in node
+    if len(branches) == 1 and not terminal:
+        return branches[0]
+    body = '(?:' + '|'.join(branches) + ')'
+    return body + '?' if terminal else body
+
+
+def compile_keys(keys):
+    trie = {}
+    for key in keys:
+        if not key:
+            raise ValueError('Replacement keys must be non-empty')
+        node = trie
+        for ch in key:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+    return re.compile(_trie_pattern(trie))
+
+
+class ReplacementTable:
+    """Applies a whole {literal: replacement} table in a single scan.
+
+    Matches are resolved leftmost-longest and never overlap, so the result does
+    not depend on the order of the dict. Replacements are not rescanned.
+    """
+
+    def __init__(self, table):
+        self.table = dict(table)
+        self.pattern = compile_keys(self.table) if self.table else None
+
+    def apply(self, content):
+        hits = Counter({key: 0 for key in self.table})
+        if self.pattern is None:
+            return content, hits
+
+        def substitute(match):
+            key = match.group(0)
+            hits[key] += 1
+            return self.table[key]
+
+        return self.pattern.sub(substitute, content), hits
+
+
+def replace_all(content, table):
+    return ReplacementTable(table).apply(content)
+
+
+def report(label, hits):
+    applied = sum(1 for count in hits.values() if count)
+    print(f"{label}: {applied}/{len(hits)} replacements applied, {sum(hits.values())} hits")
+    for key, count in hits.items():
+        if not count:
+            print(f"  no match: {key!r}")
+
+
+def splice(content, edits):
+    """Apply (start, end, text) edits in one rebuild; edits must not overlap."""
+    pieces = []
+    last = 0
+    for start, end, text in sorted(edits, key=lambda edit: (edit[0], edit[1])):
+        if start < last:
+            raise ValueError(f"Overlapping edits at offset {start}")
+        pieces.append(content[last:start])
+        pieces.append(text)
+        last = end
+    pieces.append(content[last:])
+    return ''.join(pieces)
@@ -0,0 +1,139 @@
+import argparse
+import importlib.util
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from .cache import DEFAULT_ROOT, StepCache, script_key
+from .steps import apply_file, missing_markers, report_file
+
+FRONTEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKEND_DIR = os.path.join(os.path.dirname(FRONTEND_DIR), 'backend')
+
+# Patch stack in the order it is normally applied. Scripts whose PROVIDES
+# markers are already present are skipped, so rerunning it is a no-op.
+SCRIPTS = [
+    os.path.join(FRONTEND_DIR, 'update_sidebar.py'),
+    os.path.join(FRONTEND_DIR, 'update_sidebar_v2.py'),
+    os.path.join(FRONTEND_DIR, 'fix_features.py'),
+    os.path.join(FRONTEND_DIR, 'fix_ui.py'),
+    os.path.join(FRONTEND_DIR, 'refactor_i18n.py'),
+    os.path.join(FRONTEND_DIR, 'fix_sidebar_final.py'),
+    os.path.join(FRONTEND_DIR, 'fix_translations.py'),
+    os.path.join(BACKEND_DIR, 'create_reviews_module.py'),
+]
+
+_modules = {}
+
+
+def load_script(script_path):
+    script_path = os.path.abspath(script_path)
+    if script_path not in _modules:
+        name = 'codemod_script_' + os.path.splitext(os.path.basename(script_path))[0]
+        spec = importlib.util.spec_from_file_location(name, script_path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        if not hasattr(module, 'STEPS'):
+            raise ValueError(f"{script_path} does not declare STEPS")
+        _modules[script_path] = module
+    return _modules[script_path]
+
+
+def markers(script_path, kind):
+    """A script's REQUIRES or PROVIDES, with paths resolved against the script."""
+    base_dir = os.path.dirname(os.path.abspath(script_path))
+    declared = getattr(load_script(script_path), kind, {})
+    return {os.path.normpath(os.path.join(base_dir, path)): list(found) for path, found in declared.items()}
+
+
+def select(script_paths, force=False):
+    """Split scripts into (to run, already applied).
+
+    A script counts as applied when every PROVIDES marker is present. REQUIRES
+    markers must be present unless an earlier selected script edits that file
+    and may add them; otherwise nothing runs.
+    """
+    selected, applied = [], []
+    touched = set()
+    for script_path in script_paths:
+        provides = markers(script_path, 'PROVIDES')
+        if provides and not force and not missing_markers(provides):
+            applied.append(script_path)
+            continue
+        missing = [(path, marker) for path, marker in missing_markers(markers(script_path, 'REQUIRES'))
+                   if path not in touched]
+        if missing:
+            raise ValueError(f"{os.path.basename(script_path)}: precondition not met, "
+                             + '; '.join(f"{os.path.relpath(path)} lacks {marker!r}" for path, marker in missing))
+        selected.append(script_path)
+        touched.update(plan([script_path]))
+    return selected, applied
+
+
+def plan(script_paths):
+    """Group every declared step by the file it edits.
+
+    Within a file, steps keep script order and then declaration order. Files
+    are independent of each other, so each group can run in its own process.
+    """
+    groups = {}
+    for script_path in script_paths:
+        script_path = os.path.abspath(script_path)
+        base_dir = os.path.dirname(script_path)
+        for step in load_script(script_path).STEPS:
+            path = os.path.normpath(os.path.join(base_dir, step.path))
+            groups.setdefault(path, []).append((script_path, step.name))
+    return groups
+
+
+def run_group(path, entries, cache_root=None):
+    # Workers only receive paths and step names and load the scripts themselves,
+    # so step transforms never need to be picklable.
+    cache = StepCache(cache_root) if cache_root else None
+    keyed_steps = []
+    for script_path, step_name in entries:
+        steps = {step.name: step for step in load_script(script_path).STEPS}
+        keyed_steps.append((script_key(script_path), steps[step_name]))
+    return apply_file(path, keyed_steps, cache)
+
+
+def run(script_paths, jobs=None, cache_root=DEFAULT_ROOT):
+    groups = plan(script_paths)
+    jobs = min(jobs or os.cpu_count() or 1, len(groups) or 1)
+    if jobs == 1:
+        return [run_group(path, entries, cache_root) for path, entries in groups.items()]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(run_group, path, entries, cache_root) for path, entries in groups.items()]
+        return [future.result() for future in futures]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Apply codemod scripts, one process per target file.')
+    parser.add_argument('scripts', nargs='*', help='patch scripts to apply, in order (default: the full stack)')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--no-cache', action='store_true', help='run every step even if its input was seen before')
+    parser.add_argument('--force', action='store_true', help='run scripts even if their PROVIDES markers are present')
+    parser.add_argument('--plan', action='store_true', help='print which steps touch which files and exit')
+    args = parser.parse_args(argv)
+
+    try:
+        scripts, applied = select(args.scripts or SCRIPTS, args.force)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    for script_path in applied:
+        print(f"{os.path.basename(script_path)}: already applied")
+    if args.plan:
+        for path, entries in plan(scripts).items():
+            print(os.path.relpath(path))
+            for script_path, step_name in entries:
+                print(f"  {os.path.basename(script_path)}:{step_name}")
+        return 0
+
+    for result in run(scripts, args.jobs, None if args.no_cache else DEFAULT_ROOT):
+        report_file(result)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
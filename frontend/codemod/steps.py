@@ -0,0 +1,77 @@
+import os
+from collections import namedtuple
+
+from .cache import StepCache, script_key
+
+# path is relative to the directory of the script that declares the step
+Step = namedtuple('Step', 'name path transform')
+
+
+def read_text(path):
+    if not os.path.exists(path):
+        return ''
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def missing_markers(markers):
+    """(path, marker) pairs from {path: [markers]} that the files do not contain."""
+    missing = []
+    for path, expected in markers.items():
+        content = read_text(path)
+        missing.extend((path, marker) for marker in expected if marker not in content)
+    return missing
+
+
+def write_if_changed(path, content):
+    # Leaving identical files alone keeps their mtime, so Vite/tsc don't rebuild them
+    if os.path.exists(path) and read_text(path) == content:
+        return False
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    return True
+
+
+def apply_file(path, keyed_steps, cache=None):
+    """Run (script key, step) pairs against one file, in order, writing at most once."""
+    original = read_text(path)
+    content = original
+    ran = cached = 0
+    for script, step in keyed_steps:
+        result = cache.lookup(script, step.name, content) if cache else None
+        if result is None:
+            result = step.transform(content)
+            if cache:
+                cache.store(script, step.name, content, result)
+            ran += 1
+        else:
+            cached += 1
+        content = result
+    changed = content != original and write_if_changed(path, content)
+    return {'path': path, 'ran': ran, 'cached': cached, 'changed': changed}
+
+
+def group_by_file(script_path, steps):
+    base_dir = os.path.dirname(os.path.abspath(script_path))
+    key = script_key(script_path)
+    groups = {}
+    for step in steps:
+        groups.setdefault(os.path.normpath(os.path.join(base_dir, step.path)), []).append((key, step))
+    return groups
+
+
+def run_script(script_path, steps, cache=None):
+    if cache is None:
+        cache = StepCache()
+    results = [apply_file(path, keyed_steps, cache) for path, keyed_steps in group_by_file(script_path, steps).items()]
+    for result in results:
+        report_file(result)
+    return results
+
+
+def report_file(result):
+    status = 'updated' if result['changed'] else 'unchanged'
+    print(f"{os.path.relpath(result['path'])}: {status} ({result['ran']} steps run, {result['cached']} cached)")
@@ -181,3 +181,7 @@ with open('src/utils/translations.ts', 'w', encoding='utf-8') as f:
     f.write(translation_content)
 
 print("Translations created")
+
+# Per-locale bundles the app actually loads
+from i18n.bundles import write_bundles
+write_bundles()
@@ -1,34 +1,30 @@
-﻿import os
+﻿from codemod import Step, run_script
 
 # --- Update API ---
 api_path = 'src/api/index.ts'
-with open(api_path, 'r', encoding='utf-8') as f:
-    api_content = f.read()
 
-if 'getUserReviews' not in api_content:
-    api_content = api_content.replace(
-        "export const createReview = async (userId: number, poiId: number, rating: number, content: string) => {",
-        "export const getUserReviews = async (userId: number) => {\n  const response = await api.get(`/reviews/user/${userId}`);\n  return response.data;\n};\n\nexport const createReview = async (userId: number, poiId: number, rating: number, content: string) => {"
-    )
-    with open(api_path, 'w', encoding='utf-8') as f:
-        f.write(api_content)
-    print("API updated with getUserReviews")
+def add_get_user_reviews(api_content):
+    if 'getUserReviews' not in api_content:
+        api_content = api_content.replace(
+            "export const createReview = async (userId: number, poiId: number, rating: number, content: string) => {",
+            "export const getUserReviews = async (userId: number) => {\n  const response = await api.get(`/reviews/user/${userId}`);\n  return response.data;\n};\n\nexport const createReview = async (userId: number, poiId: number, rating: number, content: string) => {"
+        )
+    return api_content
 
 # --- Update Sidebar ---
 sidebar_path = 'src/components/Sidebar.tsx'
-with open(sidebar_path, 'r', encoding='utf-8') as f:
-    sidebar_content = f.read()
 
 # 1. Add import
-if 'getUserReviews' not in sidebar_content:
-    sidebar_content = sidebar_content.replace(
-        "getReviews, createReview, Poi } from '../api';",
-        "getReviews, createReview, getUserReviews, Poi } from '../api';"
-    )
+def import_user_reviews(sidebar_content):
+    if 'getUserReviews' not in sidebar_content:
+        sidebar_content = sidebar_content.replace(
+            "getReviews, createReview, Poi } from '../api';",
+            "getReviews, createReview, getUserReviews, Poi } from '../api';"
+        )
+    return sidebar_content
 
 # 2. Add saveRecentSearch helper (before handleSearch)
-if 'const saveRecentSearch' not in sidebar_content:
-    helper_code = """  const saveRecentSearch = (kw: string) => {
+helper_code = """  const saveRecentSearch = (kw: string) => {
     const recent = JSON.parse(localStorage.getItem('recent_searches') || '[]');
     if (!recent.includes(kw)) {
       const newRecent = [kw, ...recent].slice(0, 10);
@@ -37,16 +33,21 @@ if 'const saveRecentSearch' not in sidebar_content:
   };
 
   const handleSearch = (e: React.FormEvent) => {"""
-    sidebar_content = sidebar_content.replace(
-        "const handleSearch = (e: React.FormEvent) => {",
-        helper_code
-    )
+
+def add_save_recent_search(sidebar_content):
+    if 'const saveRecentSearch' not in sidebar_content:
+        sidebar_content = sidebar_content.replace(
+            "const handleSearch = (e: React.FormEvent) => {",
+            helper_code
+        )
+    return sidebar_content
 
 # 3. Call saveRecentSearch in handleSearch
-sidebar_content = sidebar_content.replace(
-    "if (keyword.trim()) {\n      onSearch(keyword);",
-    "if (keyword.trim()) {\n      saveRecentSearch(keyword);\n      onSearch(keyword);"
-)
+def call_save_recent_search(sidebar_content):
+    return sidebar_content.replace(
+        "if (keyword.trim()) {\n      onSearch(keyword);",
+        "if (keyword.trim()) {\n      saveRecentSearch(keyword);\n      onSearch(keyword);"
+    )
 
 # 4. Update ActionModal for Recent and Contributions
 # We need to inject logic to fetch reviews for contributions, but ActionModal is a functional component.
@@ -78,10 +79,11 @@ action_modal_body_start = """    if (!action || action === 'saved') return null;
 
     return ("""
 
-sidebar_content = sidebar_content.replace(
-    "function ActionModal({ action, onClose, savedPlaces, onSearch }: { action: string | null, onClose: () => void, savedPlaces: any[], onSearch: (keyword: string, isNearby?: boolean) => void }) {\n    if (!action || action === 'saved') return null; // 'saved' is handled by main view\n\n    return (",
-    action_modal_start + "\n" + action_modal_body_start
-)
+def add_action_modal_state(sidebar_content):
+    return sidebar_content.replace(
+        "function ActionModal({ action, onClose, savedPlaces, onSearch }: { action: string | null, onClose: () => void, savedPlaces: any[], onSearch: (keyword: string, isNearby?: boolean) => void }) {\n    if (!action || action === 'saved') return null; // 'saved' is handled by main view\n\n    return (",
+        action_modal_start + "\n" + action_modal_body_start
+    )
 
 # Now replace the "Recent" section
 old_recent = """                    {action === 'recent' ? (
@@ -110,7 +112,9 @@ new_recent = """                    {action === 'recent' ? (
                             )}
                         </div>
                     )"""
-sidebar_content = sidebar_content.replace(old_recent, new_recent)
+
+def render_recent_searches(sidebar_content):
+    return sidebar_content.replace(old_recent, new_recent)
 
 # Replace "Contributions" section (which was generic "demo" before)
 # It was: {action === 'recent' && ...} {action === 'contributions' && '您的贡献'} ...
@@ -139,9 +143,23 @@ new_categories = """                    ) : action === 'contributions' ? (
                         </div>
                     ) : action === 'categories' ? ("""
 
-sidebar_content = sidebar_content.replace(old_categories, new_categories)
-
-with open(sidebar_path, 'w', encoding='utf-8') as f:
-    f.write(sidebar_content)
-
-print("Sidebar updated with Recent and Contributions")
+def render_contributions(sidebar_content):
+    return sidebar_content.replace(old_categories, new_categories)
+
+AFTER = ['update_sidebar_v2']
+REQUIRES = {api_path: ['export const createReview']}
+PROVIDES = {api_path: ['getUserReviews']}
+
+STEPS = [
+    Step('add-get-user-reviews', api_path, add_get_user_reviews),
+    Step('import-user-reviews', sidebar_path, import_user_reviews),
+    Step('add-save-recent-search', sidebar_path, add_save_recent_search),
+    Step('call-save-recent-search', sidebar_path, call_save_recent_search),
+    Step('add-action-modal-state', sidebar_path, add_action_modal_state),
+    Step('render-recent-searches', sidebar_path, render_recent_searches),
+    Step('render-contributions', sidebar_path, render_contributions),
+]
+
+if __name__ == '__main__':
+    run_script(__file__, STEPS)
+    print("Sidebar updated with Recent and Contributions")
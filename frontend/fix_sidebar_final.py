@@ -1,10 +1,7 @@
-﻿import os
+﻿from codemod import JsxIndex, Step, run_script, splice
 
 file_path = 'src/components/Sidebar.tsx'
 
-with open(file_path, 'r', encoding='utf-8') as f:
-    content = f.read()
-
 # 1. Add isBookable function
 is_bookable_func = """
   const isBookable = (type: string) => {
@@ -14,24 +11,18 @@ is_bookable_func = """
   };
 
 """
-if "const isBookable" not in content:
-    target = "const handleToggleFavorite"
-    if target in content:
-        content = content.replace(target, is_bookable_func + target)
-    else:
-        print("Warning: Could not find insertion point for isBookable")
 
-# 2. Replace Action Buttons
-old_btn_start = 'button onClick={() => setBookingModalOpen(true)}'
-start_idx = content.find(old_btn_start)
-if start_idx != -1:
-    next_btn_marker = 'onClick={handleToggleFavorite}'
-    end_idx = content.find(next_btn_marker)
-    if end_idx != -1:
-        btn_end = content.rfind('</button>', 0, end_idx)
-        if btn_end != -1:
-             real_start = content.rfind('<', 0, start_idx)
-             new_block = """{isBookable(selectedPoi.type) ? (
+def add_is_bookable(content):
+    if "const isBookable" not in content:
+        target = "const handleToggleFavorite"
+        if target in content:
+            content = content.replace(target, is_bookable_func + target)
+        else:
+            print("Warning: Could not find insertion point for isBookable")
+    return content
+
+# 2. Replace Action Buttons, Opening Hours and Website
+action_buttons = """{isBookable(selectedPoi.type) ? (
                    <button onClick={() => setBookingModalOpen(true)} className="flex-1 bg-gradient-to-r from-blue-600 to-indigo-600 text-white py-3 rounded-2xl font-semibold shadow-lg shadow-blue-500/30 hover:shadow-xl hover:shadow-blue-500/40 hover:-translate-y-0.5 transition-all flex items-center justify-center gap-2">
                      <Calendar size={18} /> {t.common.book || 'Book'}
                    </button>
@@ -40,34 +31,10 @@ if start_idx != -1:
                      <Navigation size={18} /> {t.common.navigate || 'Navigate'}
                    </button>
                  )}"""
-             content = content[:real_start] + new_block + content[btn_end+9:]
-             print("Buttons updated")
-    else:
-        print("Could not find next button to delimit")
-else:
-    print("Could not find Book button start")
 
-# 3. Replace Opening Hours
-old_hours_snippet = '<span className="text-green-600 font-medium">Open</span>  Closes 10PM'
-if old_hours_snippet in content:
-    new_hours = '{selectedPoi.biz_ext?.open_time ? (<span>{selectedPoi.biz_ext.open_time}</span>) : (<span className="text-gray-400">Opening hours not available</span>)}'
-    content = content.replace(old_hours_snippet, new_hours)
-    print("Opening hours updated")
-else:
-    print("Opening hours snippet not found")
+opening_hours = '{selectedPoi.biz_ext?.open_time ? (<span>{selectedPoi.biz_ext.open_time}</span>) : (<span className="text-gray-400">Opening hours not available</span>)}'
 
-# 4. Replace Website
-old_web_snippet = '<div className="text-blue-600 hover:underline cursor-pointer mt-1 font-medium">Visit website</div>'
-if old_web_snippet in content:
-    globe_idx = content.find('<Globe size={20} />')
-    if globe_idx != -1:
-        parent_start = content.rfind('<div className="flex gap-4 items-start group">', 0, globe_idx)
-        if parent_start != -1:
-            visit_idx = content.find(old_web_snippet, globe_idx)
-            if visit_idx != -1:
-                parent_end = content.find('</div>', visit_idx + len(old_web_snippet)) + 6
-                old_block = content[parent_start:parent_end]
-                new_block = """{selectedPoi.website && (
+website_block = """{selectedPoi.website && (
                      <div className="flex gap-4 items-start group">
                        <div className="p-2.5 bg-pink-50 rounded-2xl text-pink-600 group-hover:bg-pink-100 transition-colors">
                          <Globe size={20} />
@@ -75,8 +42,48 @@ if old_web_snippet in content:
                        <a href={selectedPoi.website} target="_blank" rel="noopener noreferrer" className="text-blue-600 hover:underline cursor-pointer mt-1 font-medium">Visit website</a>
                      </div>
                    )}"""
-                content = content.replace(old_block, new_block)
-                print("Website block updated")
 
-with open(file_path, 'w', encoding='utf-8') as f:
-    f.write(content)
+def replace_detail_blocks(content):
+    # One index for all three blocks, then a single splice
+    index = JsxIndex(content)
+    edits = []
+
+    book_btn = index.enclosing_text('onClick={() => setBookingModalOpen(true)}', tag='button')
+    favorite_btn = index.enclosing_text('onClick={handleToggleFavorite}', tag='button')
+    if book_btn is None:
+        print("Could not find Book button start")
+    elif favorite_btn is None:
+        print("Could not find next button to delimit")
+    else:
+        # Everything from the Book button up to the last button before the favorite toggle
+        buttons = [el for el in index.within(book_btn.start, favorite_btn.start) if el.tag == 'button']
+        edits.append((book_btn.start, max(el.end for el in buttons), action_buttons))
+        print("Buttons updated")
+
+    hours = index.enclosing_text('Closes 10PM', tag='div', class_name='text-gray-600 mt-1')
+    if hours is not None:
+        edits.append((hours.start, hours.end, f'<div className="text-gray-600 mt-1">{opening_hours}</div>'))
+        print("Opening hours updated")
+    else:
+        print("Opening hours block not found")
+
+    website = index.enclosing_text('>Visit website</div>', tag='div', class_name='flex gap-4 items-start group')
+    if website is not None and '<Globe size={20} />' in index.source(website):
+        edits.append((website.start, website.end, website_block))
+        print("Website block updated")
+    else:
+        print("Website block not found")
+
+    return splice(content, edits)
+
+AFTER = ['refactor_i18n']
+REQUIRES = {file_path: ['handleToggleFavorite']}
+PROVIDES = {file_path: ['Opening hours not available', 'selectedPoi.website']}
+
+STEPS = [
+    Step('add-is-bookable', file_path, add_is_bookable),
+    Step('replace-detail-blocks', file_path, replace_detail_blocks),
+]
+
+if __name__ == '__main__':
+    run_script(__file__, STEPS)
@@ -1,14 +1,23 @@
-﻿import os
+﻿from codemod import Step, run_script
+from i18n.merge import merge_text
+
 file_path = 'src/utils/translations.ts'
-with open(file_path, 'r', encoding='utf-8') as f:
-    content = f.read()
-if "navigate: 'Navigate'," not in content:
-    content = content.replace("savedPlaces: '已保存的地点',", "savedPlaces: '已保存的地点', book: '预订', navigate: '导航',")
-    content = content.replace("savedPlaces: 'Saved Places',", "savedPlaces: 'Saved Places', book: 'Book', navigate: 'Navigate',")
-    content = content.replace("savedPlaces: '保存された場所',", "savedPlaces: '保存された場所', book: '予約', navigate: 'ナビ',")
-    content = content.replace("savedPlaces: '저장된 장소',", "savedPlaces: '저장된 장소', book: '예약', navigate: '길찾기',")
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(content)
-    print('Translations updated')
-else:
-    print('Translations already updated')
+
+book_navigate = {
+    'common.book': {'zh-CN': '预订', 'en-US': 'Book', 'ja-JP': '予約', 'ko-KR': '예약'},
+    'common.navigate': {'zh-CN': '导航', 'en-US': 'Navigate', 'ja-JP': 'ナビ', 'ko-KR': '길찾기'},
+}
+
+def add_book_navigate(content):
+    return merge_text(content, book_navigate, after={'common.book': 'common.savedPlaces', 'common.navigate': 'common.book'})
+
+AFTER = ['fix_sidebar_final']
+REQUIRES = {file_path: ['savedPlaces:']}
+PROVIDES = {file_path: ['navigate:']}
+
+STEPS = [
+    Step('add-book-navigate', file_path, add_book_navigate),
+]
+
+if __name__ == '__main__':
+    run_script(__file__, STEPS)
@@ -1,49 +1,37 @@
-﻿import os
+﻿from codemod import ReplacementTable, Step, run_script
 
 # --- MenuDrawer.tsx ---
 menu_drawer_path = 'src/components/MenuDrawer.tsx'
-with open(menu_drawer_path, 'r', encoding='utf-8') as f:
-    menu_content = f.read()
 
-# Update state initialization
-menu_content = menu_content.replace(
-    "const [currentLang, setCurrentLang] = useState('zh-CN');",
-    "const [currentLang, setCurrentLang] = useState(localStorage.getItem('travelmap_lang') || 'zh-CN');"
-)
-
-# Update onClick handler
-menu_content = menu_content.replace(
-    "setCurrentLang(lang.code);\n                    setShowLanguages(false);\n                    handleAction('language');",
-    "setCurrentLang(lang.code);\n                    localStorage.setItem('travelmap_lang', lang.code);\n                    setShowLanguages(false);\n                    handleAction('language:' + lang.code);"
-)
-
-with open(menu_drawer_path, 'w', encoding='utf-8') as f:
-    f.write(menu_content)
-
-print("MenuDrawer.tsx updated")
+def persist_language(menu_content):
+    menu_content, _ = ReplacementTable({
+        # Update state initialization
+        "const [currentLang, setCurrentLang] = useState('zh-CN');":
+            "const [currentLang, setCurrentLang] = useState(localStorage.getItem('travelmap_lang') || 'zh-CN');",
+        # Update onClick handler
+        "setCurrentLang(lang.code);\n                    setShowLanguages(false);\n                    handleAction('language');":
+            "setCurrentLang(lang.code);\n                    localStorage.setItem('travelmap_lang', lang.code);\n                    setShowLanguages(false);\n                    handleAction('language:' + lang.code);",
+    }).apply(menu_content)
+    return menu_content
 
 # --- Sidebar.tsx ---
 sidebar_path = 'src/components/Sidebar.tsx'
-with open(sidebar_path, 'r', encoding='utf-8') as f:
-    sidebar_content = f.read()
-
-# Update ActionModal signature
-sidebar_content = sidebar_content.replace(
-    "function ActionModal({ action, onClose, savedPlaces }: { action: string | null, onClose: () => void, savedPlaces: any[] }) {",
-    "function ActionModal({ action, onClose, savedPlaces, onSearch }: { action: string | null, onClose: () => void, savedPlaces: any[], onSearch: (keyword: string, isNearby?: boolean) => void }) {"
-)
-
-# Update ActionModal usage (2 occurrences)
-sidebar_content = sidebar_content.replace(
-    "<ActionModal action={activeAction} onClose={() => setActiveAction(null)} savedPlaces={savedPlaces} />",
-    "<ActionModal action={activeAction} onClose={() => setActiveAction(null)} savedPlaces={savedPlaces} onSearch={onSearch} />"
-)
 
 # Update Category Buttons in ActionModal
-# We use a regex or string replacement for the button part
 old_button = 'button key={idx} className="flex flex-col items-center gap-2"'
 new_button = 'button key={idx} className="flex flex-col items-center gap-2" onClick={() => { onSearch(cat.query, true); onClose(); }}'
-sidebar_content = sidebar_content.replace(old_button, new_button)
+
+def pass_on_search(sidebar_content):
+    sidebar_content, _ = ReplacementTable({
+        # Update ActionModal signature
+        "function ActionModal({ action, onClose, savedPlaces }: { action: string | null, onClose: () => void, savedPlaces: any[] }) {":
+            "function ActionModal({ action, onClose, savedPlaces, onSearch }: { action: string | null, onClose: () => void, savedPlaces: any[], onSearch: (keyword: string, isNearby?: boolean) => void }) {",
+        # Update ActionModal usage (2 occurrences)
+        "<ActionModal action={activeAction} onClose={() => setActiveAction(null)} savedPlaces={savedPlaces} />":
+            "<ActionModal action={activeAction} onClose={() => setActiveAction(null)} savedPlaces={savedPlaces} onSearch={onSearch} />",
+        old_button: new_button,
+    }).apply(sidebar_content)
+    return sidebar_content
 
 # Update handleAction to handle language
 handle_action_logic = """    } else if (action === 'saved') {
@@ -56,9 +44,19 @@ new_handle_action_logic = """    } else if (action === 'saved') {
       showToast('语言已切换 / Language switched');
       setActiveAction(null);
     }"""
-sidebar_content = sidebar_content.replace(handle_action_logic, new_handle_action_logic)
 
-with open(sidebar_path, 'w', encoding='utf-8') as f:
-    f.write(sidebar_content)
+def handle_language_action(sidebar_content):
+    return sidebar_content.replace(handle_action_logic, new_handle_action_logic)
+
+AFTER = ['fix_features']
+REQUIRES = {menu_drawer_path: ['setCurrentLang']}
+PROVIDES = {menu_drawer_path: ["'language:' + lang.code"], sidebar_path: ["startsWith('language"]}
+
+STEPS = [
+    Step('persist-language', menu_drawer_path, persist_language),
+    Step('pass-on-search', sidebar_path, pass_on_search),
+    Step('handle-language-action', sidebar_path, handle_language_action),
+]
 
-print("Sidebar.tsx updated")
+if __name__ == '__main__':
+    run_script(__file__, STEPS)
@@ -0,0 +1,128 @@
+import argparse
+import json
+import os
+import sys
+
+from codemod.steps import read_text, write_if_changed
+
+from .catalog import DEFAULT_CATALOG, FRONTEND_DIR, Catalog
+
+DEFAULT_OUT_DIR = os.path.join(FRONTEND_DIR, 'src', 'utils', 'locales')
+DEFAULT_FALLBACK = 'zh-CN'
+STORAGE_KEY = 'travelmap_lang'
+GENERATED = '// Generated by i18n/bundles.py from utils/translations.ts; do not edit.\n'
+
+LOADER = """{generated}
+export const LOCALES = {locales};
+export const DEFAULT_LOCALE = '{fallback}';
+export const STORAGE_KEY = '{storage_key}';
+
+const loaders: Record<string, () => Promise<{{ default: any }}>> = {{
+{loaders}
+}};
+
+const loaded: Record<string, any> = {{}};
+let lastLoaded: string | null = null;
+
+export const resolveLocale = (lang: string | null | undefined) =>
+  lang && loaders[lang] ? lang : DEFAULT_LOCALE;
+
+export const isLoaded = (lang: string) => resolveLocale(lang) in loaded;
+
+// Every bundle has been filled from the fallback locale, so any loaded bundle is complete
+export async function loadLocale(lang: string) {{
+  const code = resolveLocale(lang);
+  if (!loaded[code]) {{
+    loaded[code] = (await loaders[code]()).default;
+  }}
+  lastLoaded = code;
+  return loaded[code];
+}}
+
+export const getTranslation = (lang: string) => {{
+  const code = resolveLocale(lang);
+  return loaded[code] || (lastLoaded ? loaded[lastLoaded] : {{}});
+}};
+"""
+
+
+def fill_missing(tree, fallback):
+    """Copy of tree with every key missing from it taken from fallback; returns (tree, filled count)."""
+    merged = dict(tree)
+    filled = 0
+    for key, value in fallback.items():
+        if key not in merged:
+            merged[key] = value
+            filled += _count(value)
+        elif isinstance(value, dict) and isinstance(merged[key], dict):
+            merged[key], n = fill_missing(merged[key], value)
+            filled += n
+    return merged, filled
+
+
+def _count(value):
+    if isinstance(value, dict):
+        return sum(_count(child) for child in value.values())
+    return 1
+
+
+def render_bundle(tree):
+    # JSON is valid TS and keeps the bundle compact; non-ASCII text stays readable
+    return GENERATED + 'export default ' + json.dumps(tree, ensure_ascii=False, separators=(',', ':')) + ';\n'
+
+
+def render_loader(locales, fallback):
+    return LOADER.format(
+        generated=GENERATED,
+        locales=json.dumps(locales).replace('"', "'"),
+        fallback=fallback,
+        storage_key=STORAGE_KEY,
+        loaders=',\n'.join(f"  '{locale}': () => import('./{locale}')" for locale in locales),
+    )
+
+
+def build(catalog, fallback=DEFAULT_FALLBACK):
+    """{file name: source} for every locale bundle plus the loader, and filled key counts per locale."""
+    if fallback not in catalog.locales:
+        raise ValueError(f"Fallback locale {fallback} is not in the catalog")
+    files = {}
+    filled = {}
+    for locale, tree in catalog.locales.items():
+        tree, filled[locale] = fill_missing(tree, catalog.locales[fallback])
+        files[f'{locale}.ts'] = render_bundle(tree)
+    files['index.ts'] = render_loader(list(catalog.locales), fallback)
+    return files, filled
+
+
+def write_bundles(catalog_path=DEFAULT_CATALOG, out_dir=DEFAULT_OUT_DIR, fallback=DEFAULT_FALLBACK):
+    files, filled = build(Catalog.load(catalog_path), fallback)
+    written = [name for name, source in files.items() if write_if_changed(os.path.join(out_dir, name), source)]
+    # Bundles of locales removed from the catalog would otherwise stay importable
+    for name in sorted(os.listdir(out_dir)):
+        if name.endswith('.ts') and name not in files and read_text(os.path.join(out_dir, name)).startswith(GENERATED):
+            os.remove(os.path.join(out_dir, name))
+            print(f"Removed stale bundle {name}")
+    for locale, count in filled.items():
+        size = len(files[f'{locale}.ts'].encode('utf-8'))
+        note = f", {count} keys filled from {fallback}" if count else ''
+        print(f"{locale}: {size} bytes{note}")
+    print(f"{len(written)} of {len(files)} files updated in {os.path.relpath(out_dir)}")
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Split the translation catalog into per-locale bundles.')
+    parser.add_argument('--catalog', default=DEFAULT_CATALOG, help='translations.ts to read')
+    parser.add_argument('--out', default=DEFAULT_OUT_DIR, help='directory for the bundles and loader')
+    parser.add_argument('--fallback', default=DEFAULT_FALLBACK, help='locale used to fill missing keys')
+    args = parser.parse_args(argv)
+    try:
+        write_bundles(args.catalog, args.out, args.fallback)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,270 @@
+import copy
+import os
+import re
+
+from codemod.rewrite import splice
+
+FRONTEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CATALOG = os.path.join(FRONTEND_DIR, 'src', 'utils', 'translations.ts')
+
+_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<comment>//[^\n]*|/\*.*?\*/)
+      | (?P<string>'(?:\\.|[^'\\\n])*'|"(?:\\.|[^"\\\n])*"|`(?:\\.|[^`\\$])*`)
+      | (?P<name>[A-Za-z_$][\w$]*)
+      | (?P<punct>[{}:,])
+    )""", re.S | re.X)
+_ESCAPE = re.compile(r"\\(u[0-9a-fA-F]{4}|x[0-9a-fA-F]{2}|.)", re.S)
+_SIMPLE_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', 'v': '\v', '0': '\0'}
+_IDENTIFIER = re.compile(r'^[A-Za-z_$][\w$]*$')
+
+
+def _unescape(body):
+    def replace(match):
+        code = match.group(1)
+        if code[0] in 'ux' and len(code) > 1:
+            return chr(int(code[1:], 16))
+        return _SIMPLE_ESCAPES.get(code, code)
+    return _ESCAPE.sub(replace, body)
+
+
+def _tokens(text, pos):
+    while True:
+        match = _TOKEN.match(text, pos)
+        if match is None:
+            rest = text[pos:].lstrip()
+            if rest:
+                raise ValueError(f"Unexpected input at line {text.count(chr(10), 0, pos) + 1}: {rest[:30]!r}")
+            return
+        pos = match.end()
+        if match.group('comment'):
+            continue
+        kind = match.lastgroup
+        yield kind, match.group(kind), match.start(kind), pos
+
+
+class Span:
+    """Where an object literal sits in the source: its braces and, per key, (key start, value start, value end)."""
+    __slots__ = ('open', 'close', 'entries', 'children')
+
+    def __init__(self, open_):
+        self.open = open_
+        self.close = open_
+        self.entries = {}
+        self.children = {}
+
+
+def parse_object(text, pos, spans=False):
+    """Parse a nested object literal of string values starting at text[pos] == '{'.
+
+    Returns (dict, end offset), plus the root Span when spans is true. Keys
+    keep their source order.
+    """
+    stack = []
+    current = span = None
+    key = key_start = None
+    expect = 'open'
+
+    def close(end):
+        nonlocal current, span
+        span.close = end
+        parent, parent_key, parent_span, parent_key_start = stack.pop()
+        parent[parent_key] = current
+        parent_span.entries[parent_key] = (parent_key_start, span.open, end)
+        parent_span.children[parent_key] = span
+        current, span = parent, parent_span
+
+    for kind, value, start, end in _tokens(text, pos):
+        if expect == 'open':
+            if value != '{':
+                raise ValueError(f"Expected '{{' at offset {start}")
+            current, span = {}, Span(start)
+            expect = 'key'
+        elif expect == 'key':
+            if value == '}':
+                if not stack:
+                    span.close = end
+                    return (current, end, span) if spans else (current, end)
+                close(end)
+                expect = 'comma'
+            elif kind == 'name':
+                key, key_start = value, start
+                expect = 'colon'
+            elif kind == 'string':
+                key, key_start = _unescape(value[1:-1]), start
+                expect = 'colon'
+            else:
+                raise ValueError(f"Expected key at offset {start}, got {value!r}")
+        elif expect == 'colon':
+            if value != ':':
+                raise ValueError(f"Expected ':' after {key!r} at offset {start}")
+            expect = 'value'
+        elif expect == 'value':
+            if value == '{':
+                stack.append((current, key, span, key_start))
+                current, span = {}, Span(start)
+                expect = 'key'
+            elif kind == 'string':
+                current[key] = _unescape(value[1:-1])
+                span.entries[key] = (key_start, start, end)
+                expect = 'comma'
+            else:
+                raise ValueError(f"Unsupported value for {key!r} at offset {start}: {value!r}")
+        elif expect == 'comma':
+            if value == ',':
+                expect = 'key'
+            elif value == '}':
+                if not stack:
+                    span.close = end
+                    return (current, end, span) if spans else (current, end)
+                close(end)
+                expect = 'comma'
+            else:
+                raise ValueError(f"Expected ',' or '}}' at offset {start}, got {value!r}")
+    raise ValueError("Unterminated object literal")
+
+
+def quote(value):
+    escaped = value.replace('\\', '\\\\').replace("'", "\\'").replace('\n', '\\n').replace('\r', '\\r').replace('\t', '\\t')
+    return f"'{escaped}'"
+
+
+def _entry(key, value, indent):
+    name = key if _IDENTIFIER.match(key) else quote(key)
+    return f"{name}: {render_object(value, indent) if isinstance(value, dict) else quote(value)}"
+
+
+def render_object(tree, indent=0):
+    """Object literal source for a nested dict, one key per line, in dict order."""
+    if not tree:
+        return '{}'
+    pad = '  ' * (indent + 1)
+    lines = [pad + _entry(key, value, indent + 1) for key, value in tree.items()]
+    return '{\n' + ',\n'.join(lines) + '\n' + '  ' * indent + '}'
+
+
+def _indent_at(text, pos):
+    line = text.rfind('\n', 0, pos) + 1
+    return len(text[line:pos]) - len(text[line:pos].lstrip(' '))
+
+
+def _edits(text, tree, original, span, edits):
+    """Splice edits turning the object at `span` (parsed as `original`) into `tree`.
+
+    Entries that did not change keep their source text, comments and layout;
+    new keys go after the existing key they follow, on its line when the
+    next key shares that line, otherwise on a line of their own.
+    """
+    kept = [key for key in original if key in tree]
+    if not kept or kept != [key for key in tree if key in original]:
+        # Emptied or reordered: render the object afresh
+        depth = _indent_at(text, span.open) // 2
+        edits.append((span.open, span.close, render_object(tree, depth)))
+        return
+
+    # A removed run takes everything up to the next kept key, so whole lines go;
+    # a run at the end takes the comma before it instead
+    keys = list(original)
+    i = 0
+    while i < len(keys):
+        if keys[i] in tree:
+            i += 1
+            continue
+        j = i
+        while j < len(keys) and keys[j] not in tree:
+            j += 1
+        if j < len(keys):
+            edits.append((span.entries[keys[i]][0], span.entries[keys[j]][0], ''))
+        else:
+            edits.append((span.entries[keys[i - 1]][2], span.entries[keys[j - 1]][2], ''))
+        i = j
+
+    for key in kept:
+        key_start, value_start, value_end = span.entries[key]
+        value, before = tree[key], original[key]
+        if isinstance(value, dict) and isinstance(before, dict):
+            _edits(text, value, before, span.children[key], edits)
+        elif value != before:
+            rendered = render_object(value, _indent_at(text, key_start) // 2) if isinstance(value, dict) else quote(value)
+            edits.append((value_start, value_end, rendered))
+
+    anchor = None
+    added = {}
+    for key in tree:
+        if key in original:
+            anchor = key
+        else:
+            added.setdefault(anchor, []).append(key)
+    for anchor, new_keys in added.items():
+        if anchor is None:
+            pad = _indent_at(text, span.entries[kept[0]][0])
+            text_ = ''.join(f"\n{' ' * pad}{_entry(key, tree[key], pad // 2)}," for key in new_keys)
+            edits.append((span.open + 1, span.open + 1, text_))
+            continue
+        key_start, _, value_end = span.entries[anchor]
+        pad = _indent_at(text, key_start)
+        following = keys[keys.index(anchor) + 1:]
+        inline = following and '\n' not in text[value_end:span.entries[following[0]][0]]
+        sep = ', ' if inline else f",\n{' ' * pad}"
+        edits.append((value_end, value_end, ''.join(sep + _entry(key, tree[key], pad // 2) for key in new_keys)))
+
+
+def flatten(tree, prefix=''):
+    flat = {}
+    for key, value in tree.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, path + '.'))
+        else:
+            flat[path] = value
+    return flat
+
+
+class Catalog:
+    """TRANSLATIONS object from translations.ts, one nested dict per locale.
+
+    `prefix` and `suffix` hold the source around the object literal so the
+    module can be written back unchanged apart from the catalog itself. A
+    parsed catalog also keeps the literal's source and spans, so render()
+    rewrites only the entries that changed.
+    """
+
+    def __init__(self, locales, prefix='', suffix=''):
+        self.locales = locales
+        self.prefix = prefix
+        self.suffix = suffix
+        self._source = None
+
+    @classmethod
+    def parse(cls, text, name='TRANSLATIONS'):
+        decl = re.search(rf'\b{name}\b[^=]*=\s*', text)
+        if decl is None:
+            raise ValueError(f"No {name} declaration found")
+        locales, end, span = parse_object(text, decl.end(), spans=True)
+        catalog = cls(locales, text[:decl.end()], text[end:])
+        catalog._source = (text, copy.deepcopy(locales), span)
+        return catalog
+
+    @classmethod
+    def load(cls, path=DEFAULT_CATALOG):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.parse(f.read())
+
+    def flat(self, locale):
+        return flatten(self.locales.get(locale, {}))
+
+    def render(self):
+        if self._source is None:
+            return self.prefix + render_object(self.locales) + self.suffix
+        text, original, span = self._source
+        if text[:span.open] != self.prefix or text[span.close:] != self.suffix:
+            return self.prefix + render_object(self.locales) + self.suffix
+        edits = []
+        _edits(text, self.locales, original, span, edits)
+        return splice(text, edits)
+
+    def save(self, path=DEFAULT_CATALOG):
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
@@ -0,0 +1,223 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from codemod.jsx import JsxIndex
+from codemod.rewrite import splice
+from codemod.steps import write_if_changed
+
+from .bundles import DEFAULT_OUT_DIR
+from .catalog import DEFAULT_CATALOG, FRONTEND_DIR, Catalog
+
+SRC_DIR = os.path.join(FRONTEND_DIR, 'src')
+# CJK ideographs, kana, Hangul syllables and jamo
+CJK = re.compile(r'[぀-ヿ㐀-䶿一-鿿가-힯ᄀ-ᇿ㄰-㆏]')
+LETTER = re.compile(r'[^\W\d_]')
+# Attributes whose Latin-only values are still user-facing text
+TEXT_ATTRIBUTES = {'placeholder', 'title', 'label', 'alt', 'aria-label'}
+SKIP_LINE = re.compile(r'\b(?:import|console\.\w+|require)\b')
+SOURCE_EXTENSIONS = ('.ts', '.tsx')
+
+
+def source_files(src_dir=SRC_DIR, catalog_path=DEFAULT_CATALOG):
+    skip = os.path.abspath(catalog_path)
+    bundles = os.path.abspath(DEFAULT_OUT_DIR)
+    for root, dirs, files in os.walk(src_dir):
+        # The generated locale bundles are copies of the catalog
+        dirs[:] = sorted(d for d in dirs if d != 'node_modules' and os.path.join(os.path.abspath(root), d) != bundles)
+        for name in sorted(files):
+            path = os.path.abspath(os.path.join(root, name))
+            if name.endswith(SOURCE_EXTENSIONS) and not name.endswith('.d.ts') and path != skip:
+                yield path
+
+
+def _line_of(content, pos):
+    start = content.rfind('\n', 0, pos) + 1
+    end = content.find('\n', pos)
+    return content.count('\n', 0, pos) + 1, content[start:end if end != -1 else len(content)]
+
+
+def extract_file(path):
+    """Untranslated literals in one file as (text, token, kind, line, start, end) tuples.
+
+    token is the exact source to replace and start:end its span: the quoted
+    literal, the attribute assignment for JSX attributes, or the trimmed
+    text of a JSX text node.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    index = JsxIndex(content)
+    found = []
+
+    for start, end in index.texts:
+        raw = content[start:end]
+        text = ' '.join(raw.split())
+        if LETTER.search(text):
+            start += len(raw) - len(raw.lstrip())
+            end = start + len(raw.strip())
+            line, _ = _line_of(content, start)
+            found.append((text, content[start:end], 'jsx-text', line, start, end))
+
+    for start, end, attribute in index.strings:
+        text = content[start + 1:end - 1]
+        if not text.strip():
+            continue
+        line, source_line = _line_of(content, start)
+        if attribute is not None:
+            if CJK.search(text) or (attribute in TEXT_ATTRIBUTES and LETTER.search(text)):
+                name = content.rfind(attribute, 0, start)
+                found.append((text, content[name:end], 'attribute', line, name, end))
+        elif CJK.search(text) and not SKIP_LINE.search(source_line):
+            found.append((text, content[start:end], 'string', line, start, end))
+    return path, found
+
+
+def _camel(name):
+    parts = re.split(r'[^A-Za-z0-9]+', name)
+    parts = [p.lower() if p.isupper() else p for p in parts if p]
+    if not parts:
+        return ''
+    return parts[0][0].lower() + parts[0][1:] + ''.join(p[0].upper() + p[1:] for p in parts[1:])
+
+
+def make_key(namespace, text, taken):
+    words = re.findall(r'[A-Za-z0-9]+', text)
+    slug = _camel(' '.join(words[:4])) if words and not CJK.search(text) else ''
+    if not slug or slug[0].isdigit():
+        slug = 'text' + hashlib.sha1(text.encode('utf-8')).hexdigest()[:6]
+    key = f"{namespace}.{slug}"
+    n = 2
+    while key in taken:
+        key = f"{namespace}.{slug}{n}"
+        n += 1
+    return key
+
+
+def _accessor(content):
+    # Components using the LanguageContext hook call t('a.b'); the rest index a getTranslation() object
+    return "t('{}')" if 'useLanguage()' in content else 't.{}'
+
+
+def build_index(results, catalog, locale='zh-CN', src_dir=SRC_DIR):
+    """Dedupe findings into a literal -> key index plus per-file replacement tables."""
+    existing = {}
+    for path, value in catalog.flat(locale).items():
+        existing.setdefault(value, path)
+
+    occurrences = {}
+    for path, found in results:
+        rel = os.path.relpath(path, src_dir)
+        for text, token, kind, line, start, end in found:
+            occurrences.setdefault(text, []).append({'file': rel, 'line': line, 'kind': kind, 'token': token,
+                                                     'span': [start, end]})
+
+    taken = set(catalog.flat(locale))
+    keys = {}
+    for text in sorted(occurrences, key=lambda t: (occurrences[t][0]['file'], occurrences[t][0]['line'])):
+        files = {occ['file'] for occ in occurrences[text]}
+        if text in existing:
+            key, is_new = existing[text], False
+        else:
+            namespace = 'common' if len(files) > 1 else _camel(os.path.splitext(os.path.basename(next(iter(files))))[0])
+            key, is_new = make_key(namespace, text, taken), True
+            taken.add(key)
+        keys[text] = {'key': key, 'new': is_new, 'occurrences': occurrences[text]}
+
+    replacements = {}
+    accessors = {}
+    for text, entry in keys.items():
+        for occ in entry['occurrences']:
+            rel = occ['file']
+            if rel not in accessors:
+                with open(os.path.join(src_dir, rel), 'r', encoding='utf-8') as f:
+                    accessors[rel] = _accessor(f.read())
+            expr = accessors[rel].format(entry['key'])
+            if occ['kind'] == 'string':
+                replacement = expr
+            elif occ['kind'] == 'attribute':
+                replacement = occ['token'].split('=', 1)[0] + '={' + expr + '}'
+            else:
+                replacement = '{' + expr + '}'
+            replacements.setdefault(rel, []).append([occ['span'][0], occ['span'][1], occ['token'], replacement])
+    for edits in replacements.values():
+        edits.sort()
+    return keys, replacements
+
+
+# Replacements are per-file [start, end, source, replacement] edits rather than
+# {source: replacement} tables: a short literal such as 'A' or 'reviews' also
+# occurs inside identifiers and other strings, and only its offsets single out
+# the occurrence that was found.
+
+def stale_edits(content, edits):
+    """Edits whose recorded source no longer sits at their offsets."""
+    return [edit for edit in edits if content[edit[0]:edit[1]] != edit[2]]
+
+
+def apply_index(replacements, src_dir=SRC_DIR, dry_run=False):
+    """Splice every file's edits in; files changed since extraction are left alone and returned."""
+    changed, stale = [], {}
+    for rel, edits in sorted(replacements.items()):
+        path = os.path.join(src_dir, rel)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                content = f.read()
+        except FileNotFoundError:
+            stale[rel] = edits
+            continue
+        bad = stale_edits(content, edits)
+        if bad:
+            stale[rel] = bad
+            continue
+        if not dry_run:
+            write_if_changed(path, splice(content, [(start, end, new) for start, end, _, new in edits]))
+        changed.append(rel)
+    return changed, stale
+
+
+def extract(src_dir=SRC_DIR, catalog_path=DEFAULT_CATALOG, jobs=None):
+    paths = list(source_files(src_dir, catalog_path))
+    if jobs == 1 or len(paths) < 2:
+        return [extract_file(path) for path in paths]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(extract_file, paths, chunksize=4))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Find hard-coded UI strings and propose translation keys.')
+    parser.add_argument('--src', default=SRC_DIR, help='source tree to scan')
+    parser.add_argument('--catalog', default=DEFAULT_CATALOG, help='translations.ts used to reuse existing keys')
+    parser.add_argument('--locale', default='zh-CN', help='catalog locale the literals are written in')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('-o', '--output', default='i18n-extract.json', help='where to write the index')
+    parser.add_argument('--check', metavar='INDEX', help='verify that every edit of an existing index still matches')
+    parser.add_argument('--apply', metavar='INDEX', help='apply an existing index to the source tree')
+    args = parser.parse_args(argv)
+
+    if args.check or args.apply:
+        with open(args.check or args.apply, 'r', encoding='utf-8') as f:
+            replacements = json.load(f)['replacements']
+        changed, stale = apply_index(replacements, args.src, dry_run=bool(args.check))
+        for rel, bad in stale.items():
+            print(f"  {rel}: {len(bad)} edits no longer match (first at offset {bad[0][0]}: {bad[0][2]!r})")
+        verb = 'would be rewritten' if args.check else 'rewritten'
+        print(f"{len(changed)} files {verb}, {len(stale)} changed since extraction and skipped")
+        return 1 if stale else 0
+
+    results = extract(args.src, args.catalog, args.jobs)
+    keys, replacements = build_index(results, Catalog.load(args.catalog), args.locale, args.src)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({'keys': keys, 'replacements': replacements}, f, ensure_ascii=False, indent=2)
+
+    new = sum(1 for entry in keys.values() if entry['new'])
+    print(f"{len(keys)} distinct literals in {len(replacements)} files ({len(keys) - new} already in catalog, {new} new keys)")
+    print(f"Index written to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,162 @@
+import argparse
+import json
+import os
+import sys
+
+from .catalog import DEFAULT_CATALOG, Catalog, flatten
+
+
+class CatalogMerge:
+    """Batch of key inserts and updates applied to a parsed catalog in one pass.
+
+    Changes are queued per locale as flat dotted paths. apply() visits each
+    touched object once: existing keys keep their order, new keys go right
+    after their `after` sibling when it exists, otherwise at the end of the
+    object in the order they were queued.
+    """
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self.changes = {}
+        self.skipped = {}
+
+    def set(self, locale, path, value, after=None):
+        if locale not in self.catalog.locales:
+            self.skipped.setdefault(locale, []).append(path)
+            return
+        self.changes.setdefault(locale, {})[path] = (value, after)
+
+    def update(self, entries, after=None):
+        """Queue {path: {locale: value}}; after maps paths to the sibling they follow."""
+        for path, values in entries.items():
+            anchor = after.get(path) if isinstance(after, dict) else after
+            for locale, value in values.items():
+                self.set(locale, path, value, anchor)
+
+    def apply(self, overwrite=False):
+        """Apply the queued changes; returns {locale: {'added', 'updated', 'unchanged'}}."""
+        stats = {}
+        for locale, changes in self.changes.items():
+            counts = stats[locale] = {'added': 0, 'updated': 0, 'unchanged': 0}
+            by_parent = {}
+            for path, (value, after) in changes.items():
+                parent, _, key = path.rpartition('.')
+                by_parent.setdefault(parent, []).append((key, value, after))
+            for parent, entries in by_parent.items():
+                node = self._node(self.catalog.locales[locale], parent)
+                self._merge_object(node, entries, overwrite, counts)
+        self.changes = {}
+        return stats
+
+    @staticmethod
+    def _node(tree, parent):
+        node = tree
+        for part in parent.split('.') if parent else []:
+            child = node.get(part)
+            if not isinstance(child, dict):
+                if child is not None:
+                    raise ValueError(f"Cannot add keys under {parent}: {part} is a string")
+                child = node[part] = {}
+            node = child
+        return node
+
+    @staticmethod
+    def _merge_object(node, entries, overwrite, counts):
+        new_keys = {key for key, _, _ in entries if key not in node}
+        inserts = {}
+        for key, value, after in entries:
+            if key in node:
+                if node[key] == value or not overwrite:
+                    counts['unchanged'] += 1
+                else:
+                    node[key] = value
+                    counts['updated'] += 1
+            else:
+                # Anchors may be existing keys or keys added by the same batch
+                anchor = after.rpartition('.')[2] if after else None
+                valid = anchor in node or (anchor in new_keys and anchor != key)
+                inserts.setdefault(anchor if valid else None, []).append((key, value))
+                counts['added'] += 1
+        if not inserts:
+            return
+
+        # Rebuild the object once rather than once per inserted key
+        merged = {}
+
+        def emit(key, value):
+            if key in merged:
+                return
+            merged[key] = value
+            for new_key, new_value in inserts.get(key, []):
+                emit(new_key, new_value)
+
+        for key, value in node.items():
+            emit(key, value)
+        for new_key, new_value in inserts.get(None, []):
+            emit(new_key, new_value)
+        # Keys anchored on each other in a cycle
+        for pending in inserts.values():
+            for new_key, new_value in pending:
+                emit(new_key, new_value)
+        node.clear()
+        node.update(merged)
+
+
+def merge_text(content, entries, after=None, overwrite=False):
+    """Apply {path: {locale: value}} to translations.ts source.
+
+    The source is returned untouched when nothing changes, so a no-op merge
+    never reformats the file.
+    """
+    catalog = Catalog.parse(content)
+    batch = CatalogMerge(catalog)
+    batch.update(entries, after)
+    stats = batch.apply(overwrite)
+    if not any(counts['added'] or counts['updated'] for counts in stats.values()):
+        return content
+    return catalog.render()
+
+
+def load_drop(path):
+    """Read a localization drop: {locale: {nested or dotted keys: value}} as {path: {locale: value}}."""
+    with open(path, 'r', encoding='utf-8') as f:
+        drop = json.load(f)
+    entries = {}
+    for locale, tree in drop.items():
+        for key, value in flatten(tree).items():
+            entries.setdefault(key, {})[locale] = value
+    return entries
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Merge translation drops into translations.ts in one pass.')
+    parser.add_argument('drops', nargs='+', help='JSON files of {locale: {key: value}}')
+    parser.add_argument('--catalog', default=DEFAULT_CATALOG, help='translations.ts to update')
+    parser.add_argument('--overwrite', action='store_true', help='replace existing translations')
+    parser.add_argument('--dry-run', action='store_true', help='report the changes without writing')
+    args = parser.parse_args(argv)
+
+    catalog = Catalog.load(args.catalog)
+    batch = CatalogMerge(catalog)
+    for path in args.drops:
+        batch.update(load_drop(path))
+    for locale, paths in batch.skipped.items():
+        print(f"{locale}: not in the catalog, {len(paths)} keys skipped")
+    try:
+        stats = batch.apply(args.overwrite)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    for locale, counts in stats.items():
+        print(f"{locale}: {counts['added']} added, {counts['updated']} updated, {counts['unchanged']} unchanged")
+
+    if not any(counts['added'] or counts['updated'] for counts in stats.values()):
+        print("Catalog already up to date")
+    elif not args.dry_run:
+        catalog.save(args.catalog)
+        print(f"Wrote {os.path.relpath(args.catalog)}; run python -m i18n.bundles to refresh the bundles")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
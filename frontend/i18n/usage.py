@@ -0,0 +1,221 @@
+import argparse
+import json
+import os
+import re
+import sys
+
+from .catalog import DEFAULT_CATALOG, Catalog
+from .extract import SRC_DIR, source_files
+
+_PATH = r'[A-Za-z_$][\w$]*(?:\.[A-Za-z_$][\w$]*)*'
+# getTranslation(lang) or getTranslation(initialLanguage()): one level of nested calls
+_ARGS = r'\((?:[^()]|\([^()]*\))*\)'
+# const t = getTranslation(currentLang).menu;
+_OBJECT_BINDING = re.compile(rf'\b(?:const|let|var)\s+([A-Za-z_$][\w$]*)\s*=\s*getTranslation{_ARGS}((?:\.{_PATH})?)')
+# const {{ t }} = useLanguage();
+_HOOK_BINDING = re.compile(r'\{([^{}]*)\}\s*=\s*useLanguage\(\)')
+# function LoginModal({ isOpen, t }: Props) / ({ t: translate }) => ...
+_PROP_BINDING = re.compile(r'\(\s*\{([^{}]*)\}\s*(?::\s*[\w$.<>\[\]]+\s*)?\)')
+# function render(item, t: any) / (t) => ...
+_PARAM_BINDING = re.compile(r'\(\s*(?:[A-Za-z_$][\w$]*\s*(?::[^,()]*)?,\s*)*t\s*(?::[^,()]*)?[,)]')
+# A t that is something else: const t = type.toLowerCase(); items.map(t => t.name)
+_LOCAL_BINDING = re.compile(r'\b(?:const|let|var)\s+t\s*=|(?<![\w$.])t\s*=>')
+# Any t('a.b') call or t.a access
+_T_USE = re.compile(r'(?<![\w$.])t(?:\(\s*[\'"`]|\.[A-Za-z_$])')
+_INLINE = re.compile(rf'\bgetTranslation{_ARGS}\.({_PATH})(\s*\[)?')
+_TEMPLATE_PREFIX = re.compile(rf'`({_PATH})\.\$\{{')
+
+
+class Usage:
+    """Catalog paths referenced from source.
+
+    `used` holds static paths (leaves, or objects used whole), `dynamic` the
+    prefixes under which keys are picked at runtime, e.g. t.categories[key]
+    or t(`categories.${key}`). `unresolved` counts accesses whose path cannot
+    be known statically at all, and `unbound` the places that use a `t` the
+    scanner found no binding for, so whatever they reach is not recorded.
+    """
+
+    def __init__(self):
+        self.used = {}
+        self.dynamic = {}
+        self.unresolved = []
+        self.unbound = []
+
+    def add(self, kind, path, where):
+        target = self.dynamic if kind == 'dynamic' else self.used
+        target.setdefault(path, []).append(where)
+
+
+def _line(content, pos):
+    return content.count('\n', 0, pos) + 1
+
+
+def scan_file(path, usage, src_dir=SRC_DIR):
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    rel = os.path.relpath(path, src_dir)
+
+    def record(prefix, access, dynamic, pos):
+        full = '.'.join(part for part in (prefix, access) if part)
+        where = f"{rel}:{_line(content, pos)}"
+        if dynamic:
+            # A computed key on the catalog root could be anything
+            if full:
+                usage.add('dynamic', full, where)
+            else:
+                usage.unresolved.append(where)
+        elif full:
+            usage.add('used', full, where)
+
+    def accesses(name, prefix, start):
+        access = re.compile(rf'(?<![\w$.]){re.escape(name)}((?:\.{_PATH})?)(\s*\[)?')
+        found = False
+        for match in access.finditer(content, start):
+            if match.group(1) or match.group(2):
+                found = True
+                record(prefix, match.group(1).lstrip('.'), bool(match.group(2)), match.start())
+        return found
+
+    objects = set()
+    for binding in _OBJECT_BINDING.finditer(content):
+        name, prefix = binding.group(1), binding.group(2).lstrip('.')
+        objects.add(name)
+        if not accesses(name, prefix, binding.end()):
+            # The object is passed on as a whole
+            record(prefix, '', False, binding.start())
+
+    for match in _INLINE.finditer(content):
+        record('', match.group(1), bool(match.group(2)), match.start())
+
+    # t from useLanguage() is the lookup function; a t prop or parameter may be
+    # either that function or a getTranslation() object, so both forms are read
+    functions = {_field(binding.group(1), 't') for binding in _HOOK_BINDING.finditer(content)}
+    props = {_field(binding.group(1), 't') for binding in _PROP_BINDING.finditer(content)}
+    if _PARAM_BINDING.search(content):
+        props.add('t')
+    functions.discard(None)
+    props.discard(None)
+    for name in props - objects:
+        accesses(name, '', 0)
+    for name in functions | props:
+        call = re.compile(rf'(?<![\w$.]){re.escape(name)}\(\s*(?:([\'"])({_PATH})\1|([^)\s][^)]*))?\)')
+        for match in call.finditer(content):
+            if match.group(2):
+                record('', match.group(2), False, match.start())
+            else:
+                usage.unresolved.append(f"{rel}:{_line(content, match.start())}")
+    if functions or props:
+        for match in _TEMPLATE_PREFIX.finditer(content):
+            record('', match.group(1), True, match.start())
+
+    if 't' not in objects | functions | props and not _LOCAL_BINDING.search(content):
+        usage.unbound.extend(f"{rel}:{_line(content, match.start())}" for match in _T_USE.finditer(content))
+
+
+def _field(pattern, wanted):
+    """Local name a destructuring pattern such as `{ t, lang: l }` binds field `wanted` to, or None."""
+    for part in pattern.split(','):
+        field, _, alias = part.partition(':')
+        if field.strip() == wanted:
+            return (alias or field).strip()
+    return None
+
+
+def build_usage(src_dir=SRC_DIR, catalog_path=DEFAULT_CATALOG):
+    usage = Usage()
+    for path in source_files(src_dir, catalog_path):
+        scan_file(path, usage, src_dir)
+    return usage
+
+
+def _leaf(path, keys):
+    # t.common.foundResults.replace(...) uses the string at common.foundResults
+    parts = path.split('.')
+    for n in range(len(parts) - 1, 0, -1):
+        head = '.'.join(parts[:n])
+        if head in keys:
+            return head
+    return path
+
+
+def compare(catalog, usage):
+    """{locale: {'unused': [...], 'missing': [...]}} against the usage index."""
+    report = {}
+    for locale in catalog.locales:
+        keys = catalog.flat(locale)
+        used = {_leaf(path, keys): path for path in usage.used}
+        prefixes = tuple(path + '.' for path in list(used) + list(usage.dynamic))
+        unused = [key for key in keys if key not in used and not key.startswith(prefixes)]
+        missing = [path for leaf, path in used.items()
+                   if leaf not in keys and not any(key.startswith(leaf + '.') for key in keys)]
+        missing += [prefix for prefix in usage.dynamic
+                    if not any(key.startswith(prefix + '.') for key in keys)]
+        report[locale] = {'unused': unused, 'missing': sorted(missing)}
+    return report
+
+
+def prune(tree, unused, prefix=''):
+    """Copy of tree without the unused flat keys; objects left empty are dropped."""
+    pruned = {}
+    for key, value in tree.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            value = prune(value, unused, path + '.')
+            if value:
+                pruned[key] = value
+        elif path not in unused:
+            pruned[key] = value
+    return pruned
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Report translation keys that are unused or missing in the source.')
+    parser.add_argument('--src', default=SRC_DIR, help='source tree to scan')
+    parser.add_argument('--catalog', default=DEFAULT_CATALOG, help='translations.ts to check')
+    parser.add_argument('--json', metavar='PATH', help='also write the usage index and report as JSON')
+    parser.add_argument('--write', action='store_true', help='remove unused keys from the catalog')
+    parser.add_argument('--force', action='store_true',
+                        help='with --write, prune even when some lookups are unresolved or unbound')
+    parser.add_argument('-v', '--verbose', action='store_true', help='list every unused and missing key')
+    args = parser.parse_args(argv)
+
+    catalog = Catalog.load(args.catalog)
+    usage = build_usage(args.src, args.catalog)
+    report = compare(catalog, usage)
+
+    print(f"{len(usage.used)} static paths, {len(usage.dynamic)} dynamic prefixes, {len(usage.unresolved)} unresolved lookups")
+    for locale, entry in report.items():
+        print(f"{locale}: {len(entry['unused'])} unused, {len(entry['missing'])} missing")
+        if args.verbose:
+            for key in entry['unused']:
+                print(f"  unused   {key}")
+            for path in entry['missing']:
+                where = (usage.used.get(path) or usage.dynamic.get(path))[0]
+                print(f"  missing  {path}  ({where})")
+    if usage.unresolved:
+        print("Unresolved lookups (keys they reach may be reported unused): " + ', '.join(usage.unresolved))
+    if usage.unbound:
+        print("t used without a recognised binding (keys it reaches are reported unused): " + ', '.join(usage.unbound))
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'used': usage.used, 'dynamic': usage.dynamic, 'unresolved': usage.unresolved,
+                       'unbound': usage.unbound, 'report': report}, f, ensure_ascii=False, indent=2)
+
+    if args.write:
+        if (usage.unresolved or usage.unbound) and not args.force:
+            print("Error: not pruning while some uses of t are not understood; see the list above (--force to prune anyway)")
+            return 1
+        removed = 0
+        for locale, entry in report.items():
+            unused = set(entry['unused'])
+            removed += len(unused)
+            catalog.locales[locale] = prune(catalog.locales[locale], unused)
+        catalog.save(args.catalog)
+        print(f"Removed {removed} keys from {os.path.relpath(args.catalog)}; run python -m i18n.bundles to refresh the bundles")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,15 +1,16 @@
-﻿import os
+﻿import re
+
+from codemod import ReplacementTable, Step, report, run_script
 
 # --- Update MenuDrawer.tsx ---
 menu_path = 'src/components/MenuDrawer.tsx'
-with open(menu_path, 'r', encoding='utf-8') as f:
-    menu_content = f.read()
 
 # Add import
-menu_content = menu_content.replace(
-    "import React, { useState } from 'react';",
-    "import React, { useState } from 'react';\nimport { getTranslation } from '../utils/translations';"
-)
+def menu_add_import(menu_content):
+    return menu_content.replace(
+        "import React, { useState } from 'react';",
+        "import React, { useState } from 'react';\nimport { getTranslation } from '../utils/locales';"
+    )
 
 # Use translation inside component
 # We need to get currentLang again here or pass it as prop.
@@ -18,13 +19,15 @@ menu_content = menu_content.replace(
 
 # Helper to get current language inside component
 t_helper = """  const t = getTranslation(currentLang).menu;"""
-menu_content = menu_content.replace(
-    "const [currentLang, setCurrentLang] = useState(localStorage.getItem('travelmap_lang') || 'zh-CN');",
-    "const [currentLang, setCurrentLang] = useState(localStorage.getItem('travelmap_lang') || 'zh-CN');\n" + t_helper
-)
+
+def menu_add_t_helper(menu_content):
+    return menu_content.replace(
+        "const [currentLang, setCurrentLang] = useState(localStorage.getItem('travelmap_lang') || 'zh-CN');",
+        "const [currentLang, setCurrentLang] = useState(localStorage.getItem('travelmap_lang') || 'zh-CN');\n" + t_helper
+    )
 
 # Replace strings
-replacements = {
+menu_replacements = {
     '"您的足迹"': 't.footprint',
     'label="已保存"': 'label={t.saved}',
     'label="最近"': 'label={t.recent}',
@@ -48,54 +51,40 @@ replacements = {
     '选择语言 / Select Language': 't.language' 
 }
 
-for old, new in replacements.items():
-    menu_content = menu_content.replace(old, new)
-    
-# Fix specific case for Language label inside the button
-menu_content = menu_content.replace(
-    '<span className="text-sm font-medium">{t.language}</span>',
-    '<span className="text-sm font-medium">{t.language}</span>'
-)
-
-# Note: The "Language" text in the modal header might need manual adjustment if not caught by above
-menu_content = menu_content.replace(
-    '<h2 className="text-lg font-bold text-gray-800">t.language</h2>',
-    '<h2 className="text-lg font-bold text-gray-800">{t.language}</h2>'
-)
+menu_table = ReplacementTable(menu_replacements)
 
-with open(menu_path, 'w', encoding='utf-8') as f:
-    f.write(menu_content)
+def menu_replace_strings(menu_content):
+    menu_content, hits = menu_table.apply(menu_content)
+    report("MenuDrawer strings", hits)
 
-print("MenuDrawer.tsx updated")
+    # Note: The "Language" text in the modal header might need manual adjustment if not caught by above
+    return menu_content.replace(
+        '<h2 className="text-lg font-bold text-gray-800">t.language</h2>',
+        '<h2 className="text-lg font-bold text-gray-800">{t.language}</h2>'
+    )
 
 # --- Update Sidebar.tsx ---
 sidebar_path = 'src/components/Sidebar.tsx'
-with open(sidebar_path, 'r', encoding='utf-8') as f:
-    sidebar_content = f.read()
 
 # Add import
-sidebar_content = sidebar_content.replace(
-    "import { toggleFavorite",
-    "import { getTranslation } from '../utils/translations';\nimport { toggleFavorite"
-)
+def sidebar_add_import(sidebar_content):
+    return sidebar_content.replace(
+        "import { toggleFavorite",
+        "import { getTranslation } from '../utils/locales';\nimport { toggleFavorite"
+    )
 
 # Add t helper
-sidebar_content = sidebar_content.replace(
-    "const [rating, setRating] = useState(5);",
-    "const [rating, setRating] = useState(5);\n  const t = getTranslation(currentLang);"
-)
+def sidebar_add_t_helper(sidebar_content):
+    return sidebar_content.replace(
+        "const [rating, setRating] = useState(5);",
+        "const [rating, setRating] = useState(5);\n  const t = getTranslation(currentLang);"
+    )
 
 # Replace Categories
 # This is tricky because CATEGORIES is defined outside component.
 # We should move CATEGORIES inside component or make it a function.
 # Moving inside is easiest.
-if 'const CATEGORIES =' in sidebar_content:
-    # Remove the global const
-    import re
-    sidebar_content = re.sub(r'const CATEGORIES = \[.*?\];', '', sidebar_content, flags=re.DOTALL)
-    
-    # Add inside component
-    categories_def = """
+categories_def = """
   const CATEGORIES = [
     { icon: Utensils, label: t.categories.food, query: '美食' },
     { icon: Hotel, label: t.categories.hotel, query: '酒店' },
@@ -109,13 +98,21 @@ if 'const CATEGORIES =' in sidebar_content:
     { icon: User, label: t.categories.guide, query: '旅行社' },
   ];
     """
-    sidebar_content = sidebar_content.replace(
-        "const t = getTranslation(currentLang);",
-        "const t = getTranslation(currentLang);" + categories_def
-    )
+
+def sidebar_move_categories(sidebar_content):
+    if 'const CATEGORIES =' in sidebar_content:
+        # Remove the global const
+        sidebar_content = re.sub(r'const CATEGORIES = \[.*?\];', '', sidebar_content, flags=re.DOTALL)
+
+        # Add inside component
+        sidebar_content = sidebar_content.replace(
+            "const t = getTranslation(currentLang);",
+            "const t = getTranslation(currentLang);" + categories_def
+        )
+    return sidebar_content
 
 # Replace other strings in Sidebar
-replacements = {
+sidebar_replacements = {
     '"已保存"': 't.menu.saved', # Mini sidebar
     '"最近"': 't.menu.recent', # Mini sidebar
     '"下载<br/>应用"': 't.menu.download.replace(" ", "<br/>")', # Mini sidebar hack? simpler: t.menu.download
@@ -159,92 +156,90 @@ replacements = {
     '"您还没有发表过评价"': 't.modal.noContributions'
 }
 
-for old, new in replacements.items():
-    sidebar_content = sidebar_content.replace(old, new)
-
-# Fix complex replacements
-sidebar_content = sidebar_content.replace(
-    '<span>下载<br/>应用</span>',
-    '<span>{t.menu.download}</span>'
-)
-sidebar_content = sidebar_content.replace(
-    '<span className="text-[10px] font-medium text-center leading-tight">t.menu.download</span>',
-    '<span className="text-[10px] font-medium text-center leading-tight">{t.menu.download}</span>'
-)
-
-# Fix home subtitle
-sidebar_content = sidebar_content.replace(
-    '<p className="text-gray-500 text-sm max-w-xs mx-auto">\n                        搜索酒店、餐厅、景点等，开始您的旅程。支持全球20+语言。\n                    </p>',
-    '<p className="text-gray-500 text-sm max-w-xs mx-auto">{t.home.subtitle}</p>'
-)
-
-# Fix booking modal strings (BookingModal is inside Sidebar file but outside Sidebar component)
-# It needs access to t. But it's outside.
-# We should pass currentLang to BookingModal or move it inside Sidebar (it is separate function).
-# Simplest: pass currentLang to BookingModal.
-
-sidebar_content = sidebar_content.replace(
-    '<BookingModal isOpen={bookingModalOpen} onClose={() => setBookingModalOpen(false)} poi={selectedPoi} />',
-    '<BookingModal isOpen={bookingModalOpen} onClose={() => setBookingModalOpen(false)} poi={selectedPoi} currentLang={currentLang} />'
-)
-
-# Update BookingModal definition
-sidebar_content = sidebar_content.replace(
-    'function BookingModal({ isOpen, onClose, poi }: any) {',
-    'function BookingModal({ isOpen, onClose, poi, currentLang }: any) {\n    const t = getTranslation(currentLang).booking;'
-)
-
-# Replace strings in BookingModal
-sidebar_content = sidebar_content.replace('"预订酒店"', 't.title')
-sidebar_content = sidebar_content.replace('"入住日期"', 't.checkIn')
-sidebar_content = sidebar_content.replace('"入住人数"', 't.guests')
-sidebar_content = sidebar_content.replace('"正在提交..."', 't.submitting')
-sidebar_content = sidebar_content.replace('"确认预订"', 't.confirm')
-sidebar_content = sidebar_content.replace('"预订不收取任何费用，到店支付"', 't.note')
-sidebar_content = sidebar_content.replace("'预订成功！我们会尽快联系您确认。'", "'Booking successful!'")
-sidebar_content = sidebar_content.replace("'预订失败，请稍后重试'", "'Booking failed'")
-sidebar_content = sidebar_content.replace("'可预订'", 'getTranslation(currentLang).detail.bookable')
-
-# Fix ActionModal
-# Pass currentLang to ActionModal too
-sidebar_content = sidebar_content.replace(
-    '<ActionModal action={activeAction} onClose={() => setActiveAction(null)} savedPlaces={savedPlaces} onSearch={onSearch} />',
-    '<ActionModal action={activeAction} onClose={() => setActiveAction(null)} savedPlaces={savedPlaces} onSearch={onSearch} currentLang={currentLang} />'
-)
-
-# Update ActionModal definition
-sidebar_content = sidebar_content.replace(
-    'function ActionModal({ action, onClose, savedPlaces, onSearch }: { action: string | null, onClose: () => void, savedPlaces: any[], onSearch: (keyword: string, isNearby?: boolean) => void }) {',
-    'function ActionModal({ action, onClose, savedPlaces, onSearch, currentLang }: any) {\n    const t = getTranslation(currentLang);'
-)
-
-# Check ActionModal title replacement
-# Re-apply because t is now available
-# Need to make sure `t` is used correctly in the JSX
+sidebar_table = ReplacementTable(sidebar_replacements)
+
+def sidebar_replace_strings(sidebar_content):
+    sidebar_content, hits = sidebar_table.apply(sidebar_content)
+    report("Sidebar strings", hits)
+    return sidebar_content
+
+# Fix complex replacements. These only apply to the output of the first table,
+# so they run as a second single-pass table.
+# BookingModal is inside Sidebar file but outside Sidebar component, so it
+# needs currentLang passed in to get access to t. Same for ActionModal.
+followups = {
+    '<span>下载<br/>应用</span>': '<span>{t.menu.download}</span>',
+    '<span className="text-[10px] font-medium text-center leading-tight">t.menu.download</span>':
+        '<span className="text-[10px] font-medium text-center leading-tight">{t.menu.download}</span>',
+    # Home subtitle
+    '<p className="text-gray-500 text-sm max-w-xs mx-auto">\n                        搜索酒店、餐厅、景点等，开始您的旅程。支持全球20+语言。\n                    </p>':
+        '<p className="text-gray-500 text-sm max-w-xs mx-auto">{t.home.subtitle}</p>',
+    '<BookingModal isOpen={bookingModalOpen} onClose={() => setBookingModalOpen(false)} poi={selectedPoi} />':
+        '<BookingModal isOpen={bookingModalOpen} onClose={() => setBookingModalOpen(false)} poi={selectedPoi} currentLang={currentLang} />',
+    'function BookingModal({ isOpen, onClose, poi }: any) {':
+        'function BookingModal({ isOpen, onClose, poi, currentLang }: any) {\n    const t = getTranslation(currentLang).booking;',
+    # Strings in BookingModal
+    '"预订酒店"': 't.title',
+    '"入住日期"': 't.checkIn',
+    '"入住人数"': 't.guests',
+    '"正在提交..."': 't.submitting',
+    '"确认预订"': 't.confirm',
+    '"预订不收取任何费用，到店支付"': 't.note',
+    "'预订成功！我们会尽快联系您确认。'": "'Booking successful!'",
+    "'预订失败，请稍后重试'": "'Booking failed'",
+    "'可预订'": 'getTranslation(currentLang).detail.bookable',
+    '<ActionModal action={activeAction} onClose={() => setActiveAction(null)} savedPlaces={savedPlaces} onSearch={onSearch} />':
+        '<ActionModal action={activeAction} onClose={() => setActiveAction(null)} savedPlaces={savedPlaces} onSearch={onSearch} currentLang={currentLang} />',
+    'function ActionModal({ action, onClose, savedPlaces, onSearch }: { action: string | null, onClose: () => void, savedPlaces: any[], onSearch: (keyword: string, isNearby?: boolean) => void }) {':
+        'function ActionModal({ action, onClose, savedPlaces, onSearch, currentLang }: any) {\n    const t = getTranslation(currentLang);',
+}
+
+followup_table = ReplacementTable(followups)
+
+def sidebar_apply_followups(sidebar_content):
+    sidebar_content, hits = followup_table.apply(sidebar_content)
+    report("Sidebar follow-ups", hits)
+    return sidebar_content
+
 # Since we replaced literal strings with `t.something`, we need to ensure they are wrapped in `{}` if inside JSX.
-# My replacements above did strings like '"更多"' -> 't.categories.more'.
 # If it was `<button>更多</button>`, it became `<button>t.categories.more</button>` which is wrong.
 # It should be `<button>{t.categories.more}</button>`.
-
-# Let's run a second pass to fix JSX content
-import re
 def fix_jsx_braces(content):
     # Fix >t.something< to >{t.something}<
-    content = re.sub(r'>t\.([a-zA-Z0-9_\.]+)<', r'>{t.\1}<', content)
-    # Fix "t.something" in props to {t.something} if it's inside props (handled by manual replacements above usually)
-    return content
-
-sidebar_content = fix_jsx_braces(sidebar_content)
+    return re.sub(r'>t\.([a-zA-Z0-9_\.]+)<', r'>{t.\1}<', content)
 
 # Fix specific ones that might have been missed or malformed
-sidebar_content = sidebar_content.replace('label="t.menu.saved"', 'label={t.menu.saved}')
-sidebar_content = sidebar_content.replace('label="t.menu.recent"', 'label={t.menu.recent}')
-sidebar_content = sidebar_content.replace('label={t.saved}', 'label={t.detail.saved}') # Conflict fix
-sidebar_content = sidebar_content.replace('label="t.detail.save"', 'label={t.detail.save}')
-sidebar_content = sidebar_content.replace('label="t.detail.share"', 'label={t.detail.share}')
-sidebar_content = sidebar_content.replace('label="t.detail.sendToPhone"', 'label={t.detail.sendToPhone}')
-
-with open(sidebar_path, 'w', encoding='utf-8') as f:
-    f.write(sidebar_content)
+label_fixes = {
+    'label="t.menu.saved"': 'label={t.menu.saved}',
+    'label="t.menu.recent"': 'label={t.menu.recent}',
+    'label={t.saved}': 'label={t.detail.saved}',  # Conflict fix
+    'label="t.detail.save"': 'label={t.detail.save}',
+    'label="t.detail.share"': 'label={t.detail.share}',
+    'label="t.detail.sendToPhone"': 'label={t.detail.sendToPhone}',
+}
 
-print("Sidebar.tsx updated")
+label_fix_table = ReplacementTable(label_fixes)
+
+def sidebar_fix_labels(sidebar_content):
+    sidebar_content, hits = label_fix_table.apply(sidebar_content)
+    report("Sidebar label fixes", hits)
+    return sidebar_content
+
+AFTER = ['fix_ui']
+PROVIDES = {menu_path: ['getTranslation'], sidebar_path: ['getTranslation']}
+
+STEPS = [
+    Step('menu-add-import', menu_path, menu_add_import),
+    Step('menu-add-t-helper', menu_path, menu_add_t_helper),
+    Step('menu-replace-strings', menu_path, menu_replace_strings),
+    Step('sidebar-add-import', sidebar_path, sidebar_add_import),
+    Step('sidebar-add-t-helper', sidebar_path, sidebar_add_t_helper),
+    Step('sidebar-move-categories', sidebar_path, sidebar_move_categories),
+    Step('sidebar-replace-strings', sidebar_path, sidebar_replace_strings),
+    Step('sidebar-apply-followups', sidebar_path, sidebar_apply_followups),
+    Step('sidebar-fix-jsx-braces', sidebar_path, fix_jsx_braces),
+    Step('sidebar-fix-labels', sidebar_path, sidebar_fix_labels),
+]
+
+if __name__ == '__main__':
+    run_script(__file__, STEPS)
@@ -1,4 +1,4 @@
-﻿import os
+﻿from codemod import Step, run_script
 
 file_path = 'src/components/Sidebar.tsx'
 
@@ -673,7 +673,14 @@ function BookingModal({ isOpen, onClose, poi }: any) {
 }
 """
 
-with open(file_path, 'w', encoding='utf-8') as f:
-    f.write(content)
+# Full rewrite of the base that update_sidebar.py + update_sidebar_v2.py produce
+REPLACES = ['update_sidebar', 'update_sidebar_v2']
+PROVIDES = {file_path: ['loadFavorites', 'BookingModal', 'const loadReviews', 'setActiveTab']}
 
-print("Sidebar.tsx fully rewritten")
+STEPS = [
+    Step('rewrite', file_path, lambda _: content),
+]
+
+if __name__ == '__main__':
+    run_script(__file__, STEPS)
+    print("Sidebar.tsx fully rewritten")
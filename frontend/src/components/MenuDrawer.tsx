@@ -1,5 +1,5 @@
 import { useState } from 'react';
-import { getTranslation } from '../utils/translations';
+import { getTranslation } from '../utils/locales';
 import { 
   X, Bookmark, Clock, Users, Activity, Shield, Link, Printer, 
   Store, Edit, Lightbulb, HelpCircle, Info, Globe, Settings, History, ChevronRight,
@@ -11,7 +11,7 @@ import {
 import MenuDrawer from './MenuDrawer';
 import ActionModal from './ActionModal';
 import BookingModal from './BookingModal';
-import { getTranslation } from '../utils/translations';
+import { getTranslation } from '../utils/locales';
 import { toggleFavorite, getFavorites, createOrUpdatePoi, getReviews, createReview } from '../api';
 import { useAuth } from '../contexts/AuthContext';
 
@@ -1,16 +1,33 @@
-import React, { useState } from 'react';
+import React, { useEffect, useRef, useState } from 'react';
 import { Search, X } from 'lucide-react';
 import { useLanguage } from '../../contexts/LanguageContext';
+import { suggest, Suggestion } from '../../utils/suggest';
 
 interface FloatingSearchBarProps {
   onSearch: (keyword: string) => void;
   onCategorySelect: (category: string) => void;
   rightAction?: React.ReactNode;
+  city?: string;
+  onSuggestionSelect?: (suggestion: Suggestion) => void;
 }
 
-export default function FloatingSearchBar({ onSearch, onCategorySelect, rightAction }: FloatingSearchBarProps) {
+export default function FloatingSearchBar({ onSearch, onCategorySelect, rightAction, city = '', onSuggestionSelect }: FloatingSearchBarProps) {
   const { t } = useLanguage();
   const [value, setValue] = useState('');
+  const [suggestions, setSuggestions] = useState<Suggestion[]>([]);
+  // Set when a suggestion fills the input, so that value change does not reopen the list
+  const picked = useRef(false);
+
+  useEffect(() => {
+    if (picked.current) {
+      picked.current = false;
+      setSuggestions([]);
+      return;
+    }
+    let stale = false;
+    suggest(value, city).then(found => { if (!stale) setSuggestions(found); });
+    return () => { stale = true; };
+  }, [value, city]);
 
   const handleChange = (e: React.ChangeEvent<HTMLInputElement>) => {
     const kw = e.target.value;
@@ -27,6 +44,14 @@ export default function FloatingSearchBar({ onSearch, onCategorySelect, rightAct
     onSearch('');
   };
 
+  const handleSuggestion = (s: Suggestion) => {
+    picked.current = s.label !== value;
+    setValue(s.label);
+    setSuggestions([]);
+    if (onSuggestionSelect) onSuggestionSelect(s);
+    else onSearch(s.label);
+  };
+
   return (
     <div className="fixed top-0 left-0 right-0 z-[200] p-4 pt-12 pointer-events-none transition-colors duration-300">
       <div className="pointer-events-auto flex items-center justify-center max-w-7xl mx-auto w-full">
@@ -56,6 +81,21 @@ export default function FloatingSearchBar({ onSearch, onCategorySelect, rightAct
               <Search className="h-4 w-4" />
             </button>
           </div>
+          {suggestions.length > 0 && (
+            <ul className="absolute top-14 left-0 right-0 py-1 bg-white dark:bg-gray-800 rounded-2xl shadow-lg border border-slate-200 dark:border-slate-600 overflow-hidden">
+              {suggestions.map(s => (
+                <li key={`${s.type}-${s.id}`}>
+                  <button
+                    onClick={() => handleSuggestion(s)}
+                    className="w-full px-4 py-2 flex items-baseline gap-2 text-left hover:bg-gray-100 dark:hover:bg-gray-700"
+                  >
+                    <span className="text-sm text-gray-900 dark:text-white truncate">{s.label}</span>
+                    {s.sub && <span className="text-xs text-gray-400 truncate">{s.sub}</span>}
+                  </button>
+                </li>
+              ))}
+            </ul>
+          )}
         </div>
       </div>
     </div>
@@ -1,5 +1,5 @@
-import React, { createContext, useState, useContext, ReactNode } from 'react';
-import { getTranslation } from '../utils/translations';
+import React, { createContext, useState, useContext, useEffect, ReactNode } from 'react';
+import { getTranslation, isLoaded, loadLocale, resolveLocale, STORAGE_KEY } from '../utils/locales';
 
 type Language = 'zh-CN' | 'en-US' | 'ko-KR';
 
@@ -11,18 +11,26 @@ interface LanguageContextType {
 
 const LanguageContext = createContext<LanguageContextType | undefined>(undefined);
 
-const STORAGE_KEY = 'travelmap_lang';
+// Enforce Korean as default. main.tsx preloads this locale's bundle before the first render,
+// so change it here rather than in the provider.
+export const initialLanguage = () => resolveLocale('ko-KR');
 
 export function LanguageProvider({ children }: { children: ReactNode }) {
-  const [language, setLanguageState] = useState<string>(() => {
-    return 'ko-KR'; // Enforce Korean as default
-  });
+  const [language, setLanguageState] = useState<string>(initialLanguage);
+  const [, setBundleVersion] = useState(0);
+
+  // Only the active locale's bundle is fetched; re-render once it arrives
+  useEffect(() => {
+    if (!isLoaded(language)) {
+      loadLocale(language).then(() => setBundleVersion(v => v + 1));
+    }
+  }, [language]);
 
   const setLanguage = (lang: string) => {
     // Force ko-KR even if tried to set otherwise, unless admin override needed later
-    const targetLang = 'ko-KR'; 
+    const targetLang = initialLanguage();
     localStorage.setItem(STORAGE_KEY, targetLang);
-    setLanguageState(targetLang);
+    loadLocale(targetLang).then(() => setLanguageState(targetLang));
   };
 
   const t = (path: string) => {
@@ -33,8 +41,8 @@ export function LanguageProvider({ children }: { children: ReactNode }) {
       if (current && current[key] !== undefined) {
         current = current[key];
       } else {
-        // Fallback to zh-CN if key missing
-        let fallback = getTranslation('zh-CN');
+        // Fall back to the bundle main.tsx preloaded, e.g. while the active one is still loading
+        let fallback = getTranslation(initialLanguage());
         for (const k of keys) {
             if (fallback && fallback[k] !== undefined) {
                 fallback = fallback[k];
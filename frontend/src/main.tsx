@@ -1,6 +1,8 @@
 import React from 'react'
 import ReactDOM from 'react-dom/client'
 import App from './App.tsx'
+import { initialLanguage } from './contexts/LanguageContext'
+import { loadLocale } from './utils/locales'
 import './index.css'
 
 // Cache Buster: v1.0.1 - Force update for review fix
@@ -20,8 +22,11 @@ if (!Promise.allSettled) {
   };
 }
 
-ReactDOM.createRoot(document.getElementById('root')!).render(
-  <React.StrictMode>
-    <App />
-  </React.StrictMode>,
-)
+// Fetch only the bundle LanguageProvider starts with before the first render
+loadLocale(initialLanguage()).finally(() => {
+  ReactDOM.createRoot(document.getElementById('root')!).render(
+    <React.StrictMode>
+      <App />
+    </React.StrictMode>,
+  )
+})
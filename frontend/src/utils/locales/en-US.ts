@@ -0,0 +1,2 @@
+// Generated by i18n/bundles.py from utils/translations.ts; do not edit.
+export default {"searchPlaceholder":"Search in anjenMap...","common":{"searching":"Searching...","loading":"Loading...","foundResults":"Found {count} results","noResults":"No results found","collapse":"Collapse sidebar","unknownPlace":"Unknown place","noSaved":"No saved places","savedPlaces":"Saved Places","book":"Book","navigate":"Navigate","download":"Download App","back":"Back","close":"Close","noInfo":"暂无信息"},"categories":{"attraction":"Attraction","spot":"Spot","hotel":"Hotel","accommodation":"Accommodation","food":"Food","dining":"Dining","atm":"ATM","shopping":"Shopping","pharmacy":"Pharmacy","museum":"Museum","transport":"Transport","golf":"Golf","ticket":"Tickets","guide":"Guide","more":"More","airport":"Airport","high_speed_rail":"High Speed Rail","train":"Train","car":"Car Rental","agency":"Travel Agency","ad":"Ads"},"tabs":{"city":"City","strategy":"Trips","guide":"Guide","me":"Me"},"user":{"name":"User 8866","slogan":"Start your journey","favorites":"Favorites","wallet":"Wallet","notifications":"Notifications","settings":"Settings","language":"Language","noFavorites":"No favorites yet","exploreTip":"Go explore and save places you like","saved":"Saved","loginRegister":"Login / Register","loginDesc":"Login to post reviews and manage profile","contact":"Contact Us"},"notifications":{"title":"Notifications","empty":"No new notifications","desc":"Messages from guides, system updates, and offers will appear here."},"contact":{"title":"Contact Us","desc":"Our contact info, website and support details will be displayed here."},"settings":{"title":"Settings","language":"Language","currentLang":"English","appearance":"外观","darkMode":"深色模式","lightMode":"浅色模式"},"login":{"title":"Sign In","subtitle":"Sign in to access your saved places","email":"Email Address","code":"Verification Code","sendCode":"Send Code","verify":"Verify & Sign In","placeholderEmail":"Enter your email","placeholderCode":"Enter 6-digit code","sent":"Code sent to your email","success":"Successfully logged in","logout":"Sign Out","loginRegisterTitle":"Login / Register","quickLogin":"Quick Email Login","quickLoginDesc":"No password required, auto-register on first login","loggingIn":"Logging in...","loginNow":"Login Now"},"menu":{"saved":"Saved","recent":"Recent","download":"Download App","contributions":"Your Contributions","locationSharing":"Location Sharing","timeline":"Your Timeline","yourData":"Your Data in anjenMap","share":"Share or Embed Map","print":"Print","addBusiness":"Add Your Business","editMap":"Edit Map","tips":"Tips & Tricks","help":"Get Help","consumerInfo":"Consumer Info","language":"Language","searchSettings":"Search Settings","mapHistory":"Map History","privacy":"Privacy","terms":"Terms","footer":"2026 anjenMap Corporation","footprint":"Your Footprint"},"detail":{"overview":"Overview","reviews":"Reviews","photos":"Photos","save":"Save","saved":"Saved","share":"Share","sendToPhone":"Send to Phone","bookNow":"Book Now","route":"Directions","openTime":"Hours","contact":"Contact","ticketBooking":"Book Tickets","yourRating":"Your Rating","shareExperience":"Share your experience...","publishReview":"Post Review","noReviews":"No reviews yet. Be the first!","morePhotosComing":"More photos coming soon","pricePerPerson":"pp","moderatePrice":"Moderate","bookable":"Bookable","noContact":"No contact info","intro":"Introduction","visitorReviews":"Reviews","viewAll":"View All","operating":"Open","phone":"Phone","clickToCall":"Call","introDesc":"{name} is a very popular place locally, offering great environment and facilities.","visitor":"Visitor","reviewsCount":"reviews","loginToReview":"Login to leave a review"},"home":{"explore":"Explore the World","subtitle":"Search for hotels, restaurants, attractions and more. Supporting 20+ languages."},"modal":{"recentSearch":"Recent Searches","noHistory":"No search history","clear":"Clear History","yourContributions":"Your Contributions","noContributions":"You haven't posted any reviews yet","moreCategories":"More Categories","demo":"Feature Demo","demoText":"This feature is under development. Stay tuned!"},"city":{"select":"Select City","loading":"Loading cities..."},"usageGuide":{"title":"Usage Guide","empty":"No guides available","loading":"Loading..."},"guide":{"title":"Find a Guide","subtitle":"Customize your exclusive guide","filter":"Filters","intro":"Introduction","details":"Details","hasCar":"Has Car","currentCity":"Current City: ","noIntro":"No introduction"},"strategy":{"title":"Featured Trips","subtitle":"Discover the best routes for you","days":"Days","spots":"Spots","route":"Route Details","all":"All","oneDay":"1 Day Trip","twoDays":"2 Days Trip","family":"Family Trip","other":"Other","mustVisit":"Must Visit","local":"Local Choice","localExp":"Local Exp","practical":"Practical"},"cityDrawer":{"selectCity":"Select City","shoppingDeals":"Shopping Deals","dutyFree":"Duty Free Specials","discount":"Up to 70% Off Luxury Brands","ad":"Ad","viewNow":"View Now","noPlaces":"No places found","loadingError":"Data loading failed","retry":"Retry","loading":"Loading...","searchPlaceholder":{"attraction":"Search attractions...","hotel":"Search hotels...","shopping":"Search shopping...","food":"Search food...","default":"Search..."},"noAddress":"No address info","place":"Place","city":{"select":"选择城市"}},"booking":{"title":"Book Hotel","checkIn":"Check-in Date","guests":"Guests","confirm":"Confirm Booking","submitting":"Submitting...","note":"No payment required now. Pay at the property."},"locationPrompt":{"title":"Use Current Location","message":"Allow anjenMap to access your current location for better service?","allow":"Allow","deny":"Not Now","locating":"Locating...","success":"Location found","failed":"Location failed","failedMessage":"Please check your browser permissions and try again."},"mapToggle":{"all":"Show All","favorites":"Favorites Only","noFavorites":"You have no favorite places yet"},"clickToExpand":"Click to expand","clickToCollapse":"Click to collapse","toast":{"saved":"Place saved","removed":"Removed from saved list","failed":"Operation failed, please try again","reviewPublished":"Review posted","reviewFailed":"Failed to post review","sentToPhone":"Sent to your phone","linkCopied":"Link copied to clipboard","routeDev":"Directions feature under development","ticketDev":"Ticketing system coming soon","langSwitched":"Language switched"}};
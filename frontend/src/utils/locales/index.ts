@@ -0,0 +1,34 @@
+// Generated by i18n/bundles.py from utils/translations.ts; do not edit.
+
+export const LOCALES = ['zh-CN', 'en-US', 'ko-KR'];
+export const DEFAULT_LOCALE = 'zh-CN';
+export const STORAGE_KEY = 'travelmap_lang';
+
+const loaders: Record<string, () => Promise<{ default: any }>> = {
+  'zh-CN': () => import('./zh-CN'),
+  'en-US': () => import('./en-US'),
+  'ko-KR': () => import('./ko-KR')
+};
+
+const loaded: Record<string, any> = {};
+let lastLoaded: string | null = null;
+
+export const resolveLocale = (lang: string | null | undefined) =>
+  lang && loaders[lang] ? lang : DEFAULT_LOCALE;
+
+export const isLoaded = (lang: string) => resolveLocale(lang) in loaded;
+
+// Every bundle has been filled from the fallback locale, so any loaded bundle is complete
+export async function loadLocale(lang: string) {
+  const code = resolveLocale(lang);
+  if (!loaded[code]) {
+    loaded[code] = (await loaders[code]()).default;
+  }
+  lastLoaded = code;
+  return loaded[code];
+}
+
+export const getTranslation = (lang: string) => {
+  const code = resolveLocale(lang);
+  return loaded[code] || (lastLoaded ? loaded[lastLoaded] : {});
+};
@@ -0,0 +1,2 @@
+// Generated by i18n/bundles.py from utils/translations.ts; do not edit.
+export default {"searchPlaceholder":"anjenMap 에서 검색...","common":{"searching":"검색 중...","loading":"로딩 중...","foundResults":"{count}개 결과 찾음","noResults":"결과 없음","collapse":"사이드바 접기","unknownPlace":"알 수 없는 장소","noSaved":"저장된 장소 없음","savedPlaces":"저장된 장소","book":"예약","navigate":"길찾기","download":"앱 다운로드","back":"뒤로","close":"닫기","noInfo":"정보 없음"},"categories":{"attraction":"명소","spot":"명소","hotel":"호텔","accommodation":"숙박","food":"맛집","dining":"맛집","atm":"ATM","shopping":"쇼핑","pharmacy":"약국","museum":"박물관","transport":"교통","golf":"골프","ticket":"티켓","guide":"가이드","more":"더보기","airport":"공항","high_speed_rail":"고속철도","train":"기차","car":"렌터카","agency":"여행사","ad":"광고"},"tabs":{"city":"관광지","strategy":"가이드북","guide":"가이드","me":"내 정보"},"user":{"name":"사용자 8866","slogan":"탐험을 시작하세요","favorites":"즐겨찾기","wallet":"내 지갑","notifications":"알림","settings":"설정","language":"언어 설정","noFavorites":"즐겨찾기 없음","exploreTip":"좋아하는 장소를 찾아 저장해보세요","saved":"저장됨","loginRegister":"로그인 / 회원가입","loginDesc":"로그인하여 즐겨찾기를 관리하세요","contact":"입주신청"},"notifications":{"title":"알림","empty":"새로운 알림이 없습니다","desc":"가이드 메시지, 시스템 업데이트 및 혜택 정보가 여기에 표시됩니다."},"contact":{"title":"문의하기","desc":"연락처 정보, 웹사이트 및 고객 지원 정보가 여기에 표시됩니다."},"settings":{"title":"설정","language":"언어 설정","currentLang":"한국어","appearance":"화면 설정","darkMode":"다크 모드","lightMode":"라이트 모드"},"login":{"title":"로그인","subtitle":"저장된 장소에 액세스하려면 로그인하세요","email":"이메일 주소","code":"인증 코드","sendCode":"코드 전송","verify":"확인 및 로그인","placeholderEmail":"이메일 입력","placeholderCode":"6자리 코드 입력","sent":"이메일로 코드가 전송되었습니다","success":"로그인 성공","logout":"로그아웃","loginRegisterTitle":"로그인 / 회원가입","quickLogin":"이메일 간편 로그인","quickLoginDesc":"비밀번호 필요 없음, 첫 로그인 시 자동 가입","loggingIn":"로그인 중...","loginNow":"지금 로그인"},"menu":{"saved":"저장됨","recent":"최근","download":"앱 다운로드","contributions":"내 기여","locationSharing":"위치 공유","timeline":"내 타임라인","yourData":"anjenMap 데이터","share":"지도 공유 또는 퍼가기","print":"인쇄","addBusiness":"비즈니스 추가","editMap":"지도 수정","tips":"팁 및 요령","help":"도움말 보기","consumerInfo":"소비자 정보","language":"언어","searchSettings":"검색 설정","mapHistory":"지도 기록","privacy":"개인정보처리방침","terms":"약관","footer":"2026 anjenMap Corporation","footprint":"내 발자취"},"detail":{"overview":"개요","reviews":"리뷰","photos":"사진","save":"저장","saved":"저장됨","share":"공유","sendToPhone":"폰으로 전송","bookNow":"지금 예약","route":"경로","openTime":"영업 시간","contact":"연락처","ticketBooking":"티켓 예약","yourRating":"내 평점","shareExperience":"체험담을 공유해 주세요","publishReview":"등록","noReviews":"새로운 리뷰 없습니다","morePhotosComing":"더 많은 사진 준비 중","pricePerPerson":"인당","moderatePrice":"보통","bookable":"예약 가능","noContact":"연락처 정보 없음","intro":"소개","visitorReviews":"방문자 리뷰","viewAll":"전체 보기","operating":"영업 중","phone":"전화","clickToCall":"통화하기","introDesc":"{name}은(는) 현지에서 매우 인기 있는 장소입니다. 훌륭한 환경과 시설을 제공합니다.","visitor":"방문자","reviewsCount":"건","loginToReview":"로그인 후 리뷰를 작성할 수 있습니다"},"home":{"explore":"세계 탐험","subtitle":"호텔, 레스토랑, 명소 등을 검색하세요. 20개 이상의 언어 지원."},"modal":{"recentSearch":"최근 검색","noHistory":"검색 기록 없음","clear":"기록 지우기","yourContributions":"내 기여","noContributions":"아직 리뷰를 게시하지 않았습니다","moreCategories":"더 많은 카테고리","demo":"기능 데모","demoText":"이 기능은 개발 중입니다. 기대해 주세요!"},"city":{"select":"도시 선택","loading":"도시 목록 로딩 중..."},"usageGuide":{"title":"사용 가이드","empty":"가이드 없음","loading":"로딩 중..."},"guide":{"title":"가이드 찾기","subtitle":"나만의 전속 가이드","filter":"필터","intro":"소개","details":"상세 정보","hasCar":"차량 소유","currentCity":"현재 도시","noIntro":"소개 없음"},"strategy":{"title":"추천 여행코스","subtitle":"","days":"일정","spots":"명소","route":"경로 상세","all":"전체","oneDay":"당일 여행","twoDays":"1박 2일","family":"가족 여행","other":"기타","mustVisit":"필수 코스","local":"현지인 추천","localExp":"현지 체험","practical":"실용 정보"},"cityDrawer":{"selectCity":"도시 선택","shoppingDeals":"쇼핑 혜택","dutyFree":"면세점 한정 특가","discount":"해외 명품 최대 70% 할인","ad":"광고","viewNow":"지금 확인","noPlaces":"관련 장소 없음","loadingError":"데이터 로드 실패","retry":"재시도","loading":"로딩 중...","searchPlaceholder":{"attraction":"명소 검색...","hotel":"호텔 검색...","shopping":"쇼핑 장소 검색...","food":"맛집 검색...","default":"검색..."},"noAddress":"주소 정보 없음","place":"지명","address":"주소","copyName":"복사하기","copyAddress":"복사하기","city":{"select":"选择城市"}},"booking":{"title":"호텔 예약","checkIn":"체크인 날짜","guests":"인원","confirm":"예약 확인","submitting":"제출 중...","note":"지금 결제할 필요 없습니다. 숙소에서 결제하세요."},"locationPrompt":{"title":"현재 위치 사용","message":"anjenMap이 현재 위치에 액세스하도록 허용하시겠습니까?","allow":"허용","deny":"나중에","locating":"위치 확인 중...","success":"현재 위치를 찾았습니다","failed":"위치 확인 실패","failedMessage":"브라우저 권한을 확인하고 다시 시도하세요."},"mapToggle":{"all":"전체 보기","favorites":"즐겨찾기만","noFavorites":"즐겨찾기한 장소가 없습니다"},"clickToExpand":"크게","clickToCollapse":"작게","toast":{"saved":"장소가 저장되었습니다","removed":"저장 목록에서 제거되었습니다","failed":"작업 실패, 다시 시도하세요","reviewPublished":"리뷰가 게시되었습니다","reviewFailed":"리뷰 게시 실패","sentToPhone":"휴대전화로 전송되었습니다","linkCopied":"링크가 클립보드에 복사되었습니다","routeDev":"경로 기능 개발 중","ticketDev":"티켓 시스템 곧 출시 예정","langSwitched":"언어가 변경되었습니다"}};
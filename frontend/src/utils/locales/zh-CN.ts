@@ -0,0 +1,2 @@
+// Generated by i18n/bundles.py from utils/translations.ts; do not edit.
+export default {"searchPlaceholder":"在 anjenMap 中搜索...","common":{"searching":"正在搜索...","loading":"加载中...","foundResults":"找到 {count} 个结果","noResults":"未找到结果","collapse":"收起侧边栏","unknownPlace":"未知地点","noSaved":"暂无保存的地点","savedPlaces":"已保存的地点","book":"预订","navigate":"导航","download":"下载应用","back":"返回","close":"关闭","noInfo":"暂无信息"},"categories":{"attraction":"景点","spot":"景点","hotel":"酒店","accommodation":"住宿","food":"美食","dining":"美食","atm":"ATM","shopping":"购物","pharmacy":"药店","museum":"博物馆","transport":"交通","golf":"高尔夫","ticket":"票务","guide":"导游","more":"更多","airport":"机场","high_speed_rail":"高铁","train":"火车","car":"租车","agency":"旅行社","ad":"广告"},"tabs":{"city":"城市","strategy":"攻略","guide":"导游","me":"我的"},"user":{"name":"用户8866","slogan":"开启你的探索之旅","favorites":"我的收藏","wallet":"我的钱包","notifications":"消息通知","settings":"设置","language":"语言设置","noFavorites":"暂无收藏内容","exploreTip":"去探索并收藏你喜欢的地点吧","saved":"已收藏","loginRegister":"点击登录 / 注册","loginDesc":"登录后可发表评论和管理个人信息","contact":"联系方式"},"notifications":{"title":"消息通知","empty":"暂无新消息","desc":"此处将显示来自导游的消息、系统推送和相关优惠信息。"},"contact":{"title":"联系我们","desc":"此处将展示我们的联系方式、官方网站及客服信息。"},"settings":{"title":"设置","language":"多语言","currentLang":"简体中文","appearance":"外观","darkMode":"深色模式","lightMode":"浅色模式"},"login":{"title":"登录","subtitle":"登录以访问您收藏的地点","email":"电子邮箱","code":"验证码","sendCode":"发送验证码","verify":"验证并登录","placeholderEmail":"请输入您的邮箱","placeholderCode":"请输入6位验证码","sent":"验证码已发送至您的邮箱","success":"登录成功","logout":"退出登录"},"menu":{"saved":"已保存","recent":"最近","download":"下载应用","contributions":"您的贡献","locationSharing":"位置信息分享","timeline":"您的时间轴","yourData":"您在 안전넷 中的数据","share":"分享或嵌入地图","print":"打印","addBusiness":"添加您的商家","editMap":"修改地图","tips":"提示和技巧","help":"获取帮助","consumerInfo":"消费者信息","language":"语言","searchSettings":"搜索设置","mapHistory":"地图历史记录","privacy":"隐私权","terms":"条款","footer":"2026 안전넷 Corporation","footprint":"您的足迹"},"detail":{"overview":"概览","reviews":"评价","photos":"图片","save":"收藏","saved":"已收藏","share":"分享","sendToPhone":"发送到手机","bookNow":"立即预订","route":"路线","openTime":"营业时间","contact":"联系方式","ticketBooking":"门票预订","yourRating":"您的评分","shareExperience":"分享您的体验...","publishReview":"发布","noReviews":"快来抢沙发吧！","morePhotosComing":"更多图片敬请期待","pricePerPerson":"人均","moderatePrice":"适中","bookable":"可预订","noContact":"暂无联系方式","intro":"介绍","visitorReviews":"游客评价","viewAll":"查看全部","operating":"营业中","phone":"电话","clickToCall":"点击拨打","introDesc":"{name}是当地非常受欢迎的场所，环境优美，设施齐全。","visitor":"游客","reviewsCount":"条","loginToReview":"登录后即可发表评论"},"home":{"explore":"探索世界","subtitle":"搜索酒店、餐厅、景点等，开始您的旅程。支持全球20+语言。"},"modal":{"recentSearch":"最近搜索","noHistory":"暂无搜索记录","clear":"清除记录","yourContributions":"您的贡献","noContributions":"您还没有发表过评价","moreCategories":"更多分类","demo":"功能演示","demoText":"此功能正在开发中，敬请期待！"},"city":{"select":"选择城市","loading":"正在加载城市..."},"usageGuide":{"title":"使用介绍","empty":"暂无介绍","loading":"加载中..."},"guide":{"title":"找导游","subtitle":"定制您的专属向导","filter":"筛选条件","intro":"个人简介","details":"详细介绍","hasCar":"带车向导"},"strategy":{"title":"精选攻略","subtitle":"发现最适合你的路线","days":"游玩天数","spots":"打卡景点","route":"路线详情","all":"全部","oneDay":"一日游","twoDays":"2日游","family":"亲子游","other":"其他","mustVisit":"必玩路线","local":"当地人推荐","localExp":"当地体验","practical":"实用攻略"},"cityDrawer":{"selectCity":"选择城市","city":{"select":"选择城市"},"shoppingDeals":"购物优惠","dutyFree":"免税店限定特价","discount":"海外大牌低至3折","ad":"广告","viewNow":"立即查看","noPlaces":"暂无相关地点","loadingError":"数据加载失败","retry":"重试","loading":"加载中...","searchPlaceholder":{"attraction":"搜索当前城市的景点...","hotel":"搜索当前城市的酒店...","shopping":"搜索当前城市的购物场所...","food":"搜索当前城市的美食...","default":"搜索..."},"noAddress":"暂无地址信息","place":"地点"},"booking":{"title":"预订酒店","checkIn":"入住日期","guests":"入住人数","confirm":"确认预订","submitting":"正在提交...","note":"预订不收取任何费用，到店支付"},"locationPrompt":{"title":"使用当前位置","message":"是否允许 안전넷 定位到您当前所在的位置？","allow":"允许","deny":"暂不","locating":"正在定位...","success":"已定位到当前位置","failed":"定位失败","failedMessage":"请检查您的浏览器权限并重试。"},"mapToggle":{"all":"查看全部","favorites":"只看收藏","noFavorites":"您还没有收藏任何景点"},"clickToExpand":"点击展开","clickToCollapse":"点击收起","toast":{"saved":"已保存地点","removed":"已从保存列表中移除","failed":"操作失败，请重试","reviewPublished":"评价已发布","reviewFailed":"发布评价失败","sentToPhone":"已发送到您的手机","linkCopied":"链接已复制到剪贴板","routeDev":"路线规划功能正在开发中","ticketDev":"票务系统即将上线","langSwitched":"语言已切换"}};
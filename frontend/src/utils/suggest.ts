@@ -0,0 +1,122 @@
+// Search-as-you-type over the static shards built by backend/scripts/suggest_index.py.
+// Shards are fetched once per city and searched by binary search, no backend round trip.
+
+export interface Suggestion {
+  type: 'city' | 'spot' | 'guide' | 'strategy';
+  id: number | string;
+  label: string;
+  sub: string | null;
+}
+
+interface Shard {
+  items: [Suggestion['type'], number | string, string, string | null][];
+  keys: string[];
+  refs: number[];
+}
+
+interface ShardIndex {
+  all: string;
+  cities: Record<string, string>;
+}
+
+// Must match suggest_index.py
+const MAX_KEY = 32;
+const CHO = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ';
+const JUNG = ['ㅏ', 'ㅐ', 'ㅑ', 'ㅒ', 'ㅓ', 'ㅔ', 'ㅕ', 'ㅖ', 'ㅗ', 'ㅗㅏ', 'ㅗㅐ', 'ㅗㅣ', 'ㅛ', 'ㅜ', 'ㅜㅓ', 'ㅜㅔ',
+  'ㅜㅣ', 'ㅠ', 'ㅡ', 'ㅡㅣ', 'ㅣ'];
+const JONG = ['', 'ㄱ', 'ㄲ', 'ㄱㅅ', 'ㄴ', 'ㄴㅈ', 'ㄴㅎ', 'ㄷ', 'ㄹ', 'ㄹㄱ', 'ㄹㅁ', 'ㄹㅂ', 'ㄹㅅ', 'ㄹㅌ', 'ㄹㅍ', 'ㄹㅎ',
+  'ㅁ', 'ㅂ', 'ㅂㅅ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ'];
+const COMPOUND: Record<string, string> = {
+  'ㄳ': 'ㄱㅅ', 'ㄵ': 'ㄴㅈ', 'ㄶ': 'ㄴㅎ', 'ㄺ': 'ㄹㄱ', 'ㄻ': 'ㄹㅁ', 'ㄼ': 'ㄹㅂ', 'ㄽ': 'ㄹㅅ', 'ㄾ': 'ㄹㅌ',
+  'ㄿ': 'ㄹㅍ', 'ㅀ': 'ㄹㅎ', 'ㅄ': 'ㅂㅅ', 'ㅘ': 'ㅗㅏ', 'ㅙ': 'ㅗㅐ', 'ㅚ': 'ㅗㅣ', 'ㅝ': 'ㅜㅓ', 'ㅞ': 'ㅜㅔ',
+  'ㅟ': 'ㅜㅣ', 'ㅢ': 'ㅡㅣ',
+};
+
+// NFKC turns typed compatibility jamo into conjoining jamo; map them back
+function jamo(c: string): string {
+  const code = c.charCodeAt(0);
+  if (code >= 0x1100 && code < 0x1100 + CHO.length) return CHO[code - 0x1100];
+  if (code >= 0x1161 && code < 0x1161 + JUNG.length) return JUNG[code - 0x1161];
+  if (code >= 0x11a8 && code < 0x11a8 + JONG.length - 1) return JONG[code - 0x11a8 + 1];
+  return COMPOUND[c] || c;
+}
+
+export function normalizeKey(text: string): string {
+  let out = '';
+  for (const c of (text || '').normalize('NFKC').toLowerCase()) {
+    if (!/[\p{L}\p{N}]/u.test(c)) continue;
+    const code = c.charCodeAt(0);
+    if (code >= 0xac00 && code <= 0xd7a3) {
+      const s = code - 0xac00;
+      out += CHO[Math.floor(s / 588)] + JUNG[Math.floor((s % 588) / 28)] + JONG[s % 28];
+    } else {
+      out += jamo(c);
+    }
+  }
+  return out.slice(0, MAX_KEY);
+}
+
+export function searchShard(shard: Shard, query: string, limit = 8): Suggestion[] {
+  const q = normalizeKey(query);
+  if (!q) return [];
+  const { keys, refs } = shard;
+  let lo = 0;
+  let hi = keys.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >> 1;
+    if (keys[mid] < q) lo = mid + 1;
+    else hi = mid;
+  }
+  // Whole name first, then names starting with the query, then matches inside a name
+  const best = new Map<number, number>();
+  for (; lo < keys.length && keys[lo].startsWith(q); lo++) {
+    const ref = refs[lo];
+    const kind = ref & 1 ? 2 : keys[lo] === q ? 0 : 1;
+    const item = ref >> 1;
+    best.set(item, Math.min(kind, best.get(item) ?? 2));
+  }
+  return [...best.entries()]
+    .sort((a, b) => a[1] - b[1] || a[0] - b[0])
+    .slice(0, limit)
+    .map(([i]) => {
+      const [type, id, label, sub] = shard.items[i];
+      return { type, id, label, sub };
+    });
+}
+
+const BASE = `${import.meta.env.BASE_URL}suggest/`;
+let indexPromise: Promise<ShardIndex> | null = null;
+const shards = new Map<string, Promise<Shard>>();
+
+function fetchJson<T>(file: string): Promise<T> {
+  return fetch(BASE + file).then(res => {
+    if (!res.ok) throw new Error(`${file}: ${res.status}`);
+    return res.json();
+  });
+}
+
+function loadShard(file: string): Promise<Shard> {
+  let shard = shards.get(file);
+  if (!shard) {
+    shard = fetchJson<Shard>(file);
+    // Let a failed fetch be retried on the next keystroke
+    shard.catch(() => shards.delete(file));
+    shards.set(file, shard);
+  }
+  return shard;
+}
+
+/** Suggestions for the active city (or every city when empty); [] when the shards are not deployed. */
+export async function suggest(query: string, city = '', limit = 8): Promise<Suggestion[]> {
+  if (!normalizeKey(query)) return [];
+  try {
+    if (!indexPromise) {
+      indexPromise = fetchJson<ShardIndex>('index.json');
+      indexPromise.catch(() => { indexPromise = null; });
+    }
+    const index = await indexPromise;
+    return searchShard(await loadShard(index.cities[city] || index.all), query, limit);
+  } catch {
+    return [];
+  }
+}
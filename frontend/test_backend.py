@@ -1,18 +1,20 @@
-﻿import urllib.request
-import json
+﻿import asyncio
+import sys
 
-def get_favorites():
+from apibench.client import DEFAULT_URL, Client
+
+async def get_favorites(client):
     try:
         print('Testing Favorites...')
-        with urllib.request.urlopen('http://localhost:3000/favorites/1') as response:
-            if response.status == 200:
-                print('Favorites:', json.loads(response.read().decode()))
-            else:
-                print('Error fetching favorites:', response.status)
+        response = await client.get('/favorites?userId=1')
+        if response.status == 200:
+            print('Favorites:', response.json())
+        else:
+            print('Error fetching favorites:', response.status)
     except Exception as e:
         print('Exception Favorites:', e)
 
-def create_poi():
+async def create_poi(client):
     try:
         print('\nTesting Create POI...')
         data = {
@@ -21,16 +23,27 @@ def create_poi():
             'type': 'Hotel',
             'address': 'Test Address'
         }
-        req = urllib.request.Request('http://localhost:3000/pois', 
-                                     data=json.dumps(data).encode('utf-8'),
-                                     headers={'Content-Type': 'application/json'})
-        with urllib.request.urlopen(req) as response:
-            if response.status in [200, 201]:
-                print('POI Created:', json.loads(response.read().decode()))
-            else:
-                print('Error creating POI:', response.status)
+        response = await client.post('/pois', data)
+        if response.status in [200, 201]:
+            print('POI Created:', response.json())
+        else:
+            print('Error creating POI:', response.status)
     except Exception as e:
         print('Exception Create POI:', e)
 
-get_favorites()
-create_poi()
+async def smoke(url=DEFAULT_URL):
+    async with Client(url) as client:
+        await get_favorites(client)
+        await create_poi(client)
+
+if __name__ == '__main__':
+    # python test_backend.py [URL]                     smoke test
+    # python test_backend.py load [options]            load test, see apibench/load.py
+    # python test_backend.py record|proxy|replay ...   capture and replay, see apibench/replay.py
+    if sys.argv[1:2] == ['load']:
+        from apibench.load import main
+        sys.exit(main(sys.argv[2:]))
+    if sys.argv[1:2] in (['record'], ['proxy'], ['replay']):
+        from apibench.replay import main
+        sys.exit(main(sys.argv[1:]))
+    asyncio.run(smoke(*sys.argv[1:2]))
@@ -1,16 +1,17 @@
-﻿import os
-import re
+﻿import re
 
-file_path = 'src/components/Sidebar.tsx'
+from codemod import Step, run_script
 
-with open(file_path, 'r', encoding='utf-8') as f:
-    content = f.read()
+file_path = 'src/components/Sidebar.tsx'
 
 # 1. Add Imports
 imports_old = "import MenuDrawer from './MenuDrawer';"
 imports_new = "import MenuDrawer from './MenuDrawer';\nimport { toggleFavorite, getFavorites, createOrUpdatePoi, createBooking, Poi } from '../api';\n\nconst USER_ID = 1;"
-if 'import { toggleFavorite' not in content:
-    content = content.replace(imports_old, imports_new)
+
+def add_imports(content):
+    if 'import { toggleFavorite' not in content:
+        content = content.replace(imports_old, imports_new)
+    return content
 
 # 2. Add State and Load Logic
 state_old = "const [toastMessage, setToastMessage] = useState<string | null>(null);"
@@ -34,8 +35,11 @@ state_new = """const [toastMessage, setToastMessage] = useState<string | null>(n
       console.error('Failed to load favorites', error);
     }
   };"""
-if 'loadFavorites();' not in content:
-    content = content.replace(state_old, state_new)
+
+def add_state(content):
+    if 'loadFavorites();' not in content:
+        content = content.replace(state_old, state_new)
+    return content
 
 # 3. Update toggleSave
 toggle_save_regex = r"const toggleSave = \(poi: any\) => \{[\s\S]*?\};"
@@ -63,8 +67,10 @@ toggle_save_new = """const toggleSave = async (poi: any) => {
     }
   };"""
 
-if 'const toggleSave = async' not in content:
-    content = re.sub(toggle_save_regex, toggle_save_new, content)
+def update_toggle_save(content):
+    if 'const toggleSave = async' not in content:
+        content = re.sub(toggle_save_regex, toggle_save_new, content)
+    return content
 
 # 4. Update Buttons (Add Booking)
 nav_btn_regex = r'<ActionButton \s+icon=\{Navigation\} \s+label="路线" \s+primary \s+onClick=\{\(\) => showToast\(\'路线规划功能正在开发中\'\)\} \s+\/>'
@@ -82,14 +88,20 @@ nav_btn_new = """{selectedPoi.type?.includes('酒店') && (
                     primary={!selectedPoi.type?.includes('酒店')}
                     onClick={() => showToast('路线规划功能正在开发中')} 
                   />"""
-if 'label="预订"' not in content:
-    content = re.sub(nav_btn_regex, nav_btn_new, content)
+
+def add_booking_button(content):
+    if 'label="预订"' not in content:
+        content = re.sub(nav_btn_regex, nav_btn_new, content)
+    return content
 
 # 5. Add Modal to Render
 render_old = "{toastMessage && <Toast message={toastMessage} />}"
 render_new = "{toastMessage && <Toast message={toastMessage} />}\n      <BookingModal isOpen={bookingModalOpen} onClose={() => setBookingModalOpen(false)} poi={selectedPoi} />"
-if '<BookingModal' not in content:
-    content = content.replace(render_old, render_new)
+
+def render_booking_modal(content):
+    if '<BookingModal' not in content:
+        content = content.replace(render_old, render_new)
+    return content
 
 # 6. Add BookingModal Component
 modal_code = """
@@ -177,15 +189,30 @@ broken_str_1 = "location: poi.location ? (typeof poi.location === 'object' ? , :
 broken_str_2 = "location: poi.location ? (typeof poi.location === 'object' ? ${poi.location.lng}, : poi.location) : undefined,"
 fixed_str = "location: poi.location ? (typeof poi.location === 'object' ? `${poi.location.lng},${poi.location.lat}` : poi.location) : undefined,"
 
-if broken_str_1 in content:
-    content = content.replace(broken_str_1, fixed_str)
-if broken_str_2 in content:
-    content = content.replace(broken_str_2, fixed_str)
-
-if 'function BookingModal' not in content:
-    content += modal_code
-
-with open(file_path, 'w', encoding='utf-8') as f:
-    f.write(content)
-
-print("Sidebar.tsx updated successfully via Python")
+def fix_broken_location(content):
+    if broken_str_1 in content:
+        content = content.replace(broken_str_1, fixed_str)
+    if broken_str_2 in content:
+        content = content.replace(broken_str_2, fixed_str)
+    return content
+
+def add_booking_modal(content):
+    if 'function BookingModal' not in content:
+        content += modal_code
+    return content
+
+PROVIDES = {file_path: ['loadFavorites', 'BookingModal']}
+
+STEPS = [
+    Step('add-imports', file_path, add_imports),
+    Step('add-state', file_path, add_state),
+    Step('update-toggle-save', file_path, update_toggle_save),
+    Step('add-booking-button', file_path, add_booking_button),
+    Step('render-booking-modal', file_path, render_booking_modal),
+    Step('fix-broken-location', file_path, fix_broken_location),
+    Step('add-booking-modal', file_path, add_booking_modal),
+]
+
+if __name__ == '__main__':
+    run_script(__file__, STEPS)
+    print("Sidebar.tsx updated successfully via Python")
@@ -1,15 +1,15 @@
-﻿import os
-import re
+﻿import re
 
-file_path = 'src/components/Sidebar.tsx'
+from codemod import Step, run_script
 
-with open(file_path, 'r', encoding='utf-8') as f:
-    content = f.read()
+file_path = 'src/components/Sidebar.tsx'
 
 # 1. Update Imports
-if 'getReviews, createReview' not in content:
-    content = content.replace('import { toggleFavorite, getFavorites, createOrUpdatePoi, createBooking, Poi } from \'../api\';', 
-                              'import { toggleFavorite, getFavorites, createOrUpdatePoi, createBooking, getReviews, createReview, Poi } from \'../api\';')
+def update_imports(content):
+    if 'getReviews, createReview' not in content:
+        content = content.replace('import { toggleFavorite, getFavorites, createOrUpdatePoi, createBooking, Poi } from \'../api\';', 
+                                  'import { toggleFavorite, getFavorites, createOrUpdatePoi, createBooking, getReviews, createReview, Poi } from \'../api\';')
+    return content
 
 # 2. Update State
 state_marker = "const [bookingModalOpen, setBookingModalOpen] = useState(false);"
@@ -19,8 +19,10 @@ new_state = """const [bookingModalOpen, setBookingModalOpen] = useState(false);
   const [reviewContent, setReviewContent] = useState('');
   const [rating, setRating] = useState(5);"""
 
-if 'const [reviews, setReviews]' not in content:
-    content = content.replace(state_marker, new_state)
+def add_review_state(content):
+    if 'const [reviews, setReviews]' not in content:
+        content = content.replace(state_marker, new_state)
+    return content
 
 # 3. Add loadReviews
 load_fav_marker = "const loadFavorites = async () => {"
@@ -52,8 +54,10 @@ new_logic = """const loadReviews = async (poiId: number) => {
 
   const loadFavorites = async () => {"""
 
-if 'const loadReviews' not in content:
-    content = content.replace(load_fav_marker, new_logic)
+def add_load_reviews(content):
+    if 'const loadReviews' not in content:
+        content = content.replace(load_fav_marker, new_logic)
+    return content
 
 # 4. Handle 'saved' action
 handle_action_regex = r"if \(action === 'saved'\) \{[\s\S]*?\}"
@@ -61,7 +65,9 @@ handle_action_new = """if (action === 'saved') {
       // Sidebar will render saved places
       onClear(); // Clear current selection
     }"""
-content = re.sub(handle_action_regex, handle_action_new, content)
+
+def handle_saved_action(content):
+    return re.sub(handle_action_regex, handle_action_new, content)
 
 # 5. Render Saved Places (Insert before main render or inside render)
 # We need to conditionally render the Saved list if activeAction === 'saved' and !selectedPoi
@@ -97,8 +103,10 @@ render_logic = """
 
   return ("""
 
-if 'if (activeAction === \'saved\' && !selectedPoi)' not in content:
-    content = content.replace(main_render_start, render_logic)
+def render_saved_places(content):
+    if 'if (activeAction === \'saved\' && !selectedPoi)' not in content:
+        content = content.replace(main_render_start, render_logic)
+    return content
 
 
 # 6. Add Tabs and Reviews to Detail View
@@ -115,8 +123,10 @@ tabs_logic = """
             {activeTab === 'overview' ? (
                 <div className="p-4 space-y-4">"""
 
-if 'setActiveTab' not in content:
-    content = content.replace('<div className="p-4 space-y-4">', tabs_logic)
+def add_detail_tabs(content):
+    if 'setActiveTab' not in content:
+        content = content.replace('<div className="p-4 space-y-4">', tabs_logic)
+    return content
 
 # Close the overview div and add other tabs before the ActionButtons
 # Find the Action Buttons section
@@ -166,10 +176,25 @@ tabs_content_end = """
             
             <div className="flex justify-around border-t border-gray-100 p-4">"""
 
-if ') : activeTab === \'reviews\'' not in content:
-    content = content.replace('<div className="flex justify-around border-t border-gray-100 p-4">', tabs_content_end)
-
-with open(file_path, 'w', encoding='utf-8') as f:
-    f.write(content)
-
-print("Sidebar v2 updated")
+def add_tab_contents(content):
+    if ') : activeTab === \'reviews\'' not in content:
+        content = content.replace('<div className="flex justify-around border-t border-gray-100 p-4">', tabs_content_end)
+    return content
+
+AFTER = ['update_sidebar']
+REQUIRES = {file_path: ['setBookingModalOpen']}
+PROVIDES = {file_path: ['const loadReviews', 'setActiveTab']}
+
+STEPS = [
+    Step('update-imports', file_path, update_imports),
+    Step('add-review-state', file_path, add_review_state),
+    Step('add-load-reviews', file_path, add_load_reviews),
+    Step('handle-saved-action', file_path, handle_saved_action),
+    Step('render-saved-places', file_path, render_saved_places),
+    Step('add-detail-tabs', file_path, add_detail_tabs),
+    Step('add-tab-contents', file_path, add_tab_contents),
+]
+
+if __name__ == '__main__':
+    run_script(__file__, STEPS)
+    print("Sidebar v2 updated")